@@ -0,0 +1,90 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.ports.result_cache_port import ResultCachePort
+
+
+class LruResultCache(ResultCachePort):
+    """
+    In-memory result cache: LRU with a cap on entries and on bytes, plus a
+    TTL. Values are kept JSON-encoded (callers always get a fresh dict and the
+    size cap counts real bytes). With `disk` (e.g. SqliteResultCache) misses
+    are looked up there and promoted, and every put is written through, so
+    entries survive restarts.
+    """
+    def __init__(self, max_entries: int, max_bytes: int, ttl_s: float, disk: Optional[ResultCachePort] = None):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.disk = disk
+        self._items: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl_s > 0 and now - stored_at > self.ttl_s
+
+    def _drop(self, key: str):
+        _, raw = self._items.pop(key)
+        self._bytes -= len(raw)
+
+    def _store(self, key: str, raw: str, stored_at: float):
+        with self._lock:
+            if key in self._items:
+                self._drop(key)
+            if len(raw) > self.max_bytes:
+                return
+            self._items[key] = (stored_at, raw)
+            self._bytes += len(raw)
+            while len(self._items) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._items)))
+                self.evictions += 1
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                if self._expired(item[0], now):
+                    self._drop(key)
+                else:
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(item[1])
+        value = self.disk.get(key) if self.disk is not None else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        # Promoción a memoria (el TTL vuelve a contar desde aquí; el disco conserva el suyo)
+        self._store(key, json.dumps(value), now)
+        return value
+
+    def put(self, key: str, value: dict):
+        self._store(key, json.dumps(value), time.time())
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                "entries": len(self._items),
+                "bytes": self._bytes,
+                "maxEntries": self.max_entries,
+                "maxBytes": self.max_bytes,
+                "ttlSeconds": self.ttl_s,
+                "hits": self.hits,
+                "diskHits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
@@ -0,0 +1,69 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+from app.ports.result_cache_port import ResultCachePort
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    stored_at REAL NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_results_stored ON results (stored_at);
+"""
+
+
+class SqliteResultCache(ResultCachePort):
+    """
+    Disk tier of the result cache (survives restarts). Expired entries are
+    ignored on read and purged, together with the oldest beyond
+    `max_entries`, every `prune_every` writes.
+    """
+    def __init__(self, path: str, max_entries: int, ttl_s: float, prune_every: int = 256):
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.ttl_s = ttl_s
+        self.prune_every = max(1, prune_every)
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT stored_at, value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None or (self.ttl_s > 0 and time.time() - row[0] > self.ttl_s):
+            return None
+        return json.loads(row[1])
+
+    def put(self, key: str, value: dict):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, stored_at, value) VALUES (?, ?, ?)",
+                (key, time.time(), json.dumps(value)),
+            )
+            self._writes += 1
+            if self._writes % self.prune_every == 0:
+                self._prune()
+
+    def _prune(self):
+        if self.ttl_s > 0:
+            self._conn.execute("DELETE FROM results WHERE stored_at < ?", (time.time() - self.ttl_s,))
+        self._conn.execute(
+            "DELETE FROM results WHERE key IN "
+            "(SELECT key FROM results ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {"path": self.path, "entries": entries, "maxEntries": self.max_entries}
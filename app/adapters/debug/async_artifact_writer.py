@@ -0,0 +1,175 @@
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+import cv2
+import numpy as np
+from app.ports.debug_artifact_port import DebugArtifactPort
+from app.adapters.debug.sqlite_artifact_index import SqliteArtifactIndex
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_MODES = ("all", "failures", "off")
+
+
+class AsyncArtifactWriter(DebugArtifactPort):
+    """
+    Guarda imágenes de diagnóstico en segundo plano.
+
+    - `mode`: "all" (muestreado con `sample_rate`), "failures" (solo fallos) u "off".
+    - Cola acotada: si está llena el artefacto se descarta, nunca bloquea el request.
+    - Retención: máximo de archivos y de bytes en disco, expulsando los más antiguos.
+    - `index` (opcional): registra cada artefacto para consultas paginadas en /debug.
+    """
+    def __init__(
+        self,
+        directory: str,
+        mode: str = "failures",
+        sample_rate: float = 1.0,
+        queue_size: int = 64,
+        max_files: int = 2000,
+        max_bytes: int = 200 * 1024 * 1024,
+        index: Optional[SqliteArtifactIndex] = None,
+    ):
+        if mode not in CAPTURE_MODES:
+            raise ValueError(f"Unknown debug capture mode: {mode!r}")
+        self.directory = directory
+        self.mode = mode
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+        self.max_files = max(1, int(max_files))
+        self.max_bytes = max(1, int(max_bytes))
+        self.index = index
+
+        self._queue: "queue.Queue[Tuple[str, Dict[str, np.ndarray], dict]]" = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._files: Deque[Tuple[str, int]] = deque()  # (path, bytes), más antiguo primero
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            "captured": 0, "sampledOut": 0, "skippedSuccess": 0, "disabled": 0,
+            "dropped": 0, "written": 0, "evicted": 0, "errors": 0,
+        }
+
+        self._worker = None
+        if self.mode != "off":
+            self._worker = threading.Thread(target=self._run, name="debug-artifacts", daemon=True)
+            self._worker.start()
+
+    def _skip_reason(self, failed: bool) -> Optional[str]:
+        """Counter for a capture that is not taken, or None to capture it."""
+        if self.mode == "off":
+            return "disabled"
+        if self.mode == "failures" and not failed:
+            return "skippedSuccess"
+        # Los fallos siempre se capturan; los éxitos se muestrean
+        if not failed and random.random() >= self.sample_rate:
+            return "sampledOut"
+        return None
+
+    def capture(self, uid: str, images: Dict[str, np.ndarray], meta: dict, failed: bool = False) -> bool:
+        reason = self._skip_reason(failed)
+        if reason is not None:
+            self._count(reason)
+            return False
+        try:
+            self._queue.put_nowait((uid, images, dict(meta, failed=failed, createdAt=time.time())))
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("captured")
+        return True
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self._counters[key] += n
+
+    def _load_existing(self):
+        """Inventario inicial del directorio (una sola vez, en el hilo de escritura)."""
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".jpg"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, entry.path, st.st_size))
+        entries.sort()
+        with self._lock:
+            for _, path, size in entries:
+                self._files.append((path, size))
+                self._total_bytes += size
+
+    def _run(self):
+        try:
+            self._load_existing()
+        except OSError:
+            self._count("errors")
+        while True:
+            uid, images, meta = self._queue.get()
+            try:
+                self._write(uid, images, meta)
+            except Exception:
+                self._count("errors")
+                logger.exception("could not write debug artifact %s", uid)
+
+    def _write(self, uid: str, images: Dict[str, np.ndarray], meta: dict):
+        if any(os.path.exists(os.path.join(self.directory, f"{uid}_{stage}.jpg")) for stage in images):
+            # Nunca se pisa otra captura (sus archivos quedarían huérfanos en el índice)
+            raise ValueError(f"Duplicate debug artifact uid: {uid!r}")
+        written = {}
+        for stage, img in images.items():
+            if img is None or img.size == 0:
+                continue
+            filename = f"{uid}_{stage}.jpg"
+            path = os.path.join(self.directory, filename)
+            if not cv2.imwrite(path, img):
+                self._count("errors")
+                continue
+            written[stage] = filename
+            size = os.path.getsize(path)
+            with self._lock:
+                self._files.append((path, size))
+                self._total_bytes += size
+                self._counters["written"] += 1
+        if self.index is not None and written:
+            self.index.add(
+                uid,
+                created_at=meta["createdAt"],
+                outcome="failure" if meta.get("failed") else "success",
+                stages=written,
+                file_name=meta.get("fileName") or "",
+                raw_text=meta.get("rawText") or "",
+                plate_text=meta.get("plateText") or "",
+            )
+        self._evict()
+
+    def _evict(self):
+        while True:
+            with self._lock:
+                if len(self._files) <= self.max_files and self._total_bytes <= self.max_bytes:
+                    return
+                path, size = self._files.popleft()
+                self._total_bytes -= size
+                self._counters["evicted"] += 1
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            if self.index is not None:
+                self.index.remove_file(os.path.basename(path))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "sampleRate": self.sample_rate,
+                "directory": self.directory,
+                "queued": self._queue.qsize(),
+                "files": len(self._files),
+                "bytes": self._total_bytes,
+                "maxFiles": self.max_files,
+                "maxBytes": self.max_bytes,
+                **self._counters,
+            }
@@ -0,0 +1,139 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    uid TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    file_name TEXT,
+    raw_text TEXT,
+    plate_text TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_artifacts_created ON artifacts (created_at DESC, uid DESC);
+CREATE INDEX IF NOT EXISTS ix_artifacts_outcome ON artifacts (outcome, created_at DESC, uid DESC);
+CREATE TABLE IF NOT EXISTS artifact_files (
+    filename TEXT PRIMARY KEY,
+    uid TEXT NOT NULL,
+    stage TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_artifact_files_uid ON artifact_files (uid);
+"""
+
+
+def encode_cursor(created_at: float, uid: str) -> str:
+    return f"{created_at!r}:{uid}"
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        ts, uid = cursor.split(":", 1)
+        return float(ts), uid
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+
+
+class SqliteArtifactIndex:
+    """
+    Índice SQLite de artefactos de diagnóstico: uid, fecha, resultado, textos
+    OCR y archivos por etapa. Permite paginar y filtrar sin listar el directorio.
+    """
+    def __init__(self, path: str):
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def add(self, uid: str, created_at: float, outcome: str, stages: Dict[str, str],
+            file_name: str = "", raw_text: str = "", plate_text: str = ""):
+        """Registers a new artifact; a uid already indexed raises ValueError (nothing is overwritten)."""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO artifacts (uid, created_at, outcome, file_name, raw_text, plate_text) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (uid, created_at, outcome, file_name, raw_text, plate_text),
+                )
+                self._conn.executemany(
+                    "INSERT INTO artifact_files (filename, uid, stage) VALUES (?, ?, ?)",
+                    [(filename, uid, stage) for stage, filename in stages.items()],
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Duplicate debug artifact uid: {uid!r}") from None
+
+    def remove_file(self, filename: str):
+        """Called on eviction; drops the artifact once none of its stage images remain."""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT uid FROM artifact_files WHERE filename = ?", (filename,)).fetchone()
+            if row is None:
+                return
+            self._conn.execute("DELETE FROM artifact_files WHERE filename = ?", (filename,))
+            left = self._conn.execute("SELECT 1 FROM artifact_files WHERE uid = ? LIMIT 1", (row[0],)).fetchone()
+            if left is None:
+                self._conn.execute("DELETE FROM artifacts WHERE uid = ?", (row[0],))
+
+    def list(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        outcome: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Most recent first, keyset-paginated on (created_at, uid).
+        Returns the page and the cursor for the next one (None at the end).
+        """
+        where, params = [], []
+        if cursor:
+            ts, uid = decode_cursor(cursor)
+            where.append("(created_at < ? OR (created_at = ? AND uid < ?))")
+            params += [ts, ts, uid]
+        if outcome:
+            where.append("outcome = ?")
+            params.append(outcome)
+        if since is not None:
+            where.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("created_at < ?")
+            params.append(until)
+        sql = "SELECT uid, created_at, outcome, file_name, raw_text, plate_text FROM artifacts"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at DESC, uid DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            page = rows[:limit]
+            uids = [r[0] for r in page]
+            files: Dict[str, Dict[str, str]] = {}
+            if uids:
+                marks = ",".join("?" * len(uids))
+                for filename, uid, stage in self._conn.execute(
+                    f"SELECT filename, uid, stage FROM artifact_files WHERE uid IN ({marks})", uids
+                ):
+                    files.setdefault(uid, {})[stage] = filename
+
+        items = [
+            {
+                "uid": uid,
+                "createdAt": created_at,
+                "outcome": outcome_,
+                "fileName": file_name,
+                "rawText": raw_text,
+                "plateText": plate_text,
+                "files": files.get(uid, {}),
+            }
+            for uid, created_at, outcome_, file_name, raw_text, plate_text in page
+        ]
+        next_cursor = encode_cursor(page[-1][1], page[-1][0]) if len(rows) > limit else None
+        return items, next_cursor
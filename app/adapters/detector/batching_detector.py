@@ -0,0 +1,128 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+import numpy as np
+from app.ports.detector_port import PlateDetectorPort
+from app.domain.models import DetectionResult
+from app.core.metrics import DETECT_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingDetector(PlateDetectorPort):
+    """
+    Micro-batching sobre otro detector: agrupa llamadas concurrentes a
+    `detect_plate` hasta `max_batch_size` imágenes o `max_wait_ms` milisegundos,
+    ejecuta un único `detect_plate_batch` y devuelve a cada llamador su resultado.
+
+    Las llamadas llegan desde los hilos del executor "detect", por lo que el
+    tamaño de lote efectivo está acotado por el número de workers de esa etapa.
+    """
+    def __init__(self, inner: PlateDetectorPort, max_batch_size: int = 8, max_wait_ms: float = 5.0):
+        self.inner = inner
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = max(0.0, float(max_wait_ms))
+
+        self._queue: "queue.Queue[Tuple[np.ndarray, Future, float]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._batch_hist = [0] * (self.max_batch_size + 1)  # index = batch size
+        self._batches = 0
+        self._items = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._predict_total = 0.0
+
+        self._worker = threading.Thread(target=self._run, name="detect-batcher", daemon=True)
+        self._worker.start()
+
+    def detect_plate(self, img_bgr: np.ndarray) -> Optional[DetectionResult]:
+        fut: Future = Future()
+        self._queue.put((img_bgr, fut, time.perf_counter()))
+        return fut.result()
+
+    def detect_plate_batch(self, imgs_bgr: List[np.ndarray]) -> List[Optional[DetectionResult]]:
+        return self.inner.detect_plate_batch(imgs_bgr)
+
+    def detect_plates(self, img_bgr: np.ndarray, min_conf: Optional[float] = None) -> List[DetectionResult]:
+        # Sin micro-batching: la ruta multi-placa es menos frecuente
+        return self.inner.detect_plates(img_bgr, min_conf)
+
+    def _collect(self) -> List[Tuple[np.ndarray, Future, float]]:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            try:
+                results = self.inner.detect_plate_batch([img for img, _, _ in batch])
+            except Exception as exc:  # propaga el error a cada llamador
+                self._fail(batch, exc)
+                continue
+            finished = time.perf_counter()
+
+            if len(results) != len(batch):
+                # Sin correspondencia fiable imagen-resultado: falla todo el lote (nadie queda esperando)
+                self._fail(batch, RuntimeError(
+                    f"detect_plate_batch returned {len(results)} results for {len(batch)} images"))
+                continue
+            for (_, fut, _), res in zip(batch, results):
+                self._settle(fut, res)
+            self._record(batch, started, finished)
+
+    @staticmethod
+    def _settle(fut: Future, result: Optional[DetectionResult] = None, exc: Optional[BaseException] = None):
+        # Un future ya resuelto no debe tumbar el hilo del lote
+        try:
+            if exc is not None:
+                fut.set_exception(exc)
+            else:
+                fut.set_result(result)
+        except Exception:
+            logger.exception("could not deliver a batched detection result")
+
+    def _fail(self, batch, exc: BaseException):
+        for _, fut, _ in batch:
+            self._settle(fut, exc=exc)
+
+    def _record(self, batch, started: float, finished: float):
+        waits = [started - enqueued for _, _, enqueued in batch]
+        DETECT_BATCH_SIZE.observe(value=len(batch))
+        with self._lock:
+            self._batch_hist[len(batch)] += 1
+            self._batches += 1
+            self._items += len(batch)
+            self._queue_wait_total += sum(waits)
+            self._queue_wait_max = max(self._queue_wait_max, max(waits))
+            self._predict_total += finished - started
+
+    def stats(self) -> dict:
+        with self._lock:
+            batches = self._batches
+            items = self._items
+            return {
+                "enabled": True,
+                "maxBatchSize": self.max_batch_size,
+                "maxWaitMs": self.max_wait_ms,
+                "batches": batches,
+                "items": items,
+                "avgBatchSize": (items / batches) if batches else 0.0,
+                "batchSizeHistogram": {str(size): n for size, n in enumerate(self._batch_hist) if size and n},
+                "avgQueueWaitMs": (self._queue_wait_total / items * 1000.0) if items else 0.0,
+                "maxQueueWaitMs": self._queue_wait_max * 1000.0,
+                "avgPredictMs": (self._predict_total / batches * 1000.0) if batches else 0.0,
+                "pending": self._queue.qsize(),
+            }
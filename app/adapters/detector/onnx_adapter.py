@@ -0,0 +1,114 @@
+from typing import List, Optional, Tuple
+import cv2
+import numpy as np
+import onnxruntime as ort
+from app.ports.detector_port import PlateDetectorPort
+from app.domain.models import DetectionResult
+from app.domain.box_utils import xywh_to_xyxy, clamp_boxes, nms, to_detections
+from app.core.config import settings
+
+
+def letterbox(img_bgr: np.ndarray, size: int, pad_value: int = 114) -> Tuple[np.ndarray, float, Tuple[float, float]]:
+    """
+    Resize keeping aspect ratio and pad to `size` x `size` (centered), as
+    ultralytics does for fixed-shape exports. Returns the padded image, the
+    scale ratio and the (pad_x, pad_y) offsets.
+    """
+    h, w = img_bgr.shape[:2]
+    r = min(size / h, size / w)
+    new_w, new_h = int(round(w * r)), int(round(h * r))
+    resized = img_bgr if (new_w, new_h) == (w, h) else cv2.resize(img_bgr, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    pad_x = (size - new_w) / 2
+    pad_y = (size - new_h) / 2
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    padded = cv2.copyMakeBorder(resized, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(pad_value,) * 3)
+    return padded, r, (left, top)
+
+
+class OnnxAdapter(PlateDetectorPort):
+    """
+    Detector de placas con ONNX Runtime (CPU) sobre el export ONNX del modelo YOLO:
+        yolo export model=models/plate-detector.pt format=onnx imgsz=640
+    Letterbox, filtro de confianza y NMS en numpy; mismo contrato que YoloAdapter.
+    """
+    def __init__(self, model_path: Optional[str] = None):
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.onnx_threads > 0:
+            opts.intra_op_num_threads = settings.onnx_threads
+        self.session = ort.InferenceSession(
+            model_path or settings.onnx_model_path,
+            sess_options=opts,
+            providers=["CPUExecutionProvider"],
+        )
+        inp = self.session.get_inputs()[0]
+        self.input_name = inp.name
+        # Export estático: (1, 3, H, W); dinámico: dimensiones como str
+        self.fixed_batch = isinstance(inp.shape[0], int)
+        self.img_size = inp.shape[2] if isinstance(inp.shape[2], int) else settings.img_size
+
+    def detect_plate(self, img_bgr: np.ndarray) -> Optional[DetectionResult]:
+        return self.detect_plate_batch([img_bgr])[0]
+
+    def detect_plate_batch(self, imgs_bgr: List[np.ndarray]) -> List[Optional[DetectionResult]]:
+        if not imgs_bgr:
+            return []
+
+        prepared = [self._prepare(img) for img in imgs_bgr]
+        if self.fixed_batch:
+            outputs = [self.session.run(None, {self.input_name: tensor})[0] for tensor, _, _ in prepared]
+            preds = np.concatenate(outputs, axis=0)
+        else:
+            batch = np.concatenate([tensor for tensor, _, _ in prepared], axis=0)
+            preds = self.session.run(None, {self.input_name: batch})[0]
+
+        return [
+            self._best_detection(pred, ratio, pad, img.shape[:2])
+            for pred, (_, ratio, pad), img in zip(preds, prepared, imgs_bgr)
+        ]
+
+    def detect_plates(self, img_bgr: np.ndarray, min_conf: Optional[float] = None) -> List[DetectionResult]:
+        tensor, ratio, pad = self._prepare(img_bgr)
+        pred = self.session.run(None, {self.input_name: tensor})[0][0]
+        boxes, scores = self._candidates(pred, ratio, pad, img_bgr.shape[:2], min_conf)
+        return to_detections(boxes, scores)
+
+    def _prepare(self, img_bgr: np.ndarray) -> Tuple[np.ndarray, float, Tuple[float, float]]:
+        padded, ratio, pad = letterbox(img_bgr, self.img_size)
+        blob = cv2.dnn.blobFromImage(padded, scalefactor=1.0 / 255.0, swapRB=True)  # NCHW float32 RGB
+        return blob, ratio, pad
+
+    def _candidates(self, pred: np.ndarray, ratio: float, pad: Tuple[float, float],
+                    shape: Tuple[int, int], min_conf: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Decodes one YOLOv8 head output (4 + nc, N) into clamped xyxy boxes in
+        original image coordinates and their scores, after confidence filter
+        (`min_conf`, default settings.conf) and NMS.
+        """
+        pred = pred.T  # (N, 4 + nc)
+        scores = pred[:, 4:].max(axis=1)
+        mask = scores >= (settings.conf if min_conf is None else min_conf)
+        if not mask.any():
+            return np.empty((0, 4), dtype=np.int64), np.empty((0,), dtype=np.float32)
+
+        boxes = xywh_to_xyxy(pred[mask, :4])
+        scores = scores[mask]
+        keep = nms(boxes, scores, settings.iou)
+        boxes, scores = boxes[keep], scores[keep]
+
+        boxes[:, [0, 2]] -= pad[0]
+        boxes[:, [1, 3]] -= pad[1]
+        boxes /= ratio
+        img_h, img_w = shape
+        return clamp_boxes(boxes, img_w, img_h), scores
+
+    def _best_detection(self, pred: np.ndarray, ratio: float, pad: Tuple[float, float],
+                        shape: Tuple[int, int]) -> Optional[DetectionResult]:
+        boxes, scores = self._candidates(pred, ratio, pad, shape)
+        if len(scores) == 0:
+            return None
+
+        # nms() devuelve los índices ordenados por score: el primero es el mejor
+        return to_detections(boxes[:1], scores[:1])[0]
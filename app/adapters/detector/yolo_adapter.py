@@ -1,8 +1,9 @@
-from typing import Optional
+from typing import List, Optional, Tuple
 import numpy as np
 from ultralytics import YOLO
 from app.ports.detector_port import PlateDetectorPort
-from app.domain.models import DetectionResult, BoundingBox
+from app.domain.models import DetectionResult
+from app.domain.box_utils import clamp_boxes, nms, to_detections
 from app.core.config import settings
 
 
@@ -11,35 +12,53 @@ class YoloAdapter(PlateDetectorPort):
         self.model = YOLO(settings.model_path)
 
     def detect_plate(self, img_bgr: np.ndarray) -> Optional[DetectionResult]:
-        results = self.model.predict(
-            img_bgr,
+        return self.detect_plate_batch([img_bgr])[0]
+
+    def detect_plate_batch(self, imgs_bgr: List[np.ndarray]) -> List[Optional[DetectionResult]]:
+        if not imgs_bgr:
+            return []
+
+        # Una sola llamada a predict para todo el lote
+        results = self._predict(imgs_bgr, settings.conf)
+        return [self._best_detection(res, img) for res, img in zip(results, imgs_bgr)]
+
+    def detect_plates(self, img_bgr: np.ndarray, min_conf: Optional[float] = None) -> List[DetectionResult]:
+        min_conf = settings.conf if min_conf is None else min_conf
+        results = self._predict([img_bgr], min_conf)[0]
+        boxes, scores = self._candidates(results, img_bgr.shape[:2], min_conf)
+        return to_detections(boxes, scores)
+
+    def _predict(self, imgs_bgr: List[np.ndarray], conf: float):
+        return self.model.predict(
+            list(imgs_bgr),
             imgsz=settings.img_size,
-            conf=settings.conf,
+            conf=conf,
+            iou=settings.iou,
             verbose=False
-        )[0]
+        )
 
+    @staticmethod
+    def _candidates(results, shape: Tuple[int, int], min_conf: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        All boxes of one result as clamped xyxy ints + scores, filtered by
+        `min_conf` and NMS'd again after clamping, ordered by descending score.
+        """
         if results.boxes is None or len(results.boxes) == 0:
-            return None
+            return np.empty((0, 4), dtype=np.int64), np.empty((0,), dtype=np.float32)
 
-        boxes = results.boxes
-        conf_arr = boxes.conf.cpu().numpy().reshape(-1)
-        best_idx = int(conf_arr.argmax())
-        best = boxes[best_idx]
-        x1, y1, x2, y2 = map(float, best.xyxy[0])
-        conf = float(best.conf[0])
-
-        img_h, img_w = img_bgr.shape[:2]
-        x1 = max(0, min(int(x1), img_w - 1))
-        y1 = max(0, min(int(y1), img_h - 1))
-        x2 = max(x1 + 1, min(int(x2), img_w))
-        y2 = max(y1 + 1, min(int(y2), img_h))
-
-        width = x2 - x1
-        height = y2 - y1
-        if width <= 0 or height <= 0:
-            return None
+        scores = results.boxes.conf.cpu().numpy().reshape(-1)
+        xyxy = results.boxes.xyxy.cpu().numpy().reshape(-1, 4)
+        mask = scores >= min_conf
+        img_h, img_w = shape
+        boxes = clamp_boxes(xyxy[mask], img_w, img_h)
+        scores = scores[mask]
+        keep = nms(boxes.astype(np.float32), scores, settings.iou)
+        return boxes[keep], scores[keep]
 
-        return DetectionResult(
-            box=BoundingBox(x=x1, y=y1, w=width, h=height),
-            confidence=conf
-        )
+    @classmethod
+    def _best_detection(cls, results, img_bgr: np.ndarray) -> Optional[DetectionResult]:
+        boxes, scores = cls._candidates(results, img_bgr.shape[:2], settings.conf)
+        if len(scores) == 0:
+            return None
+        # nms() devuelve los índices ordenados por score: el primero es el mejor
+        return to_detections(boxes[:1], scores[:1])[0]
@@ -1,95 +1,153 @@
 import re
+from typing import List, NamedTuple, Optional, Tuple
 from app.ports.info_extractor_port import InfoExtractorPort
 
+NAME_CHARS = "A-Za-zÁÉÍÓÚÜÑáéíóúüñ"
+
+# Normaliza dígitos con correcciones típicas de OCR
+DIGIT_FIX = str.maketrans({
+    "O": "0", "o": "0", "Q": "0",
+    "I": "1", "l": "1", "|": "1",
+    "S": "5", "s": "5",
+    "B": "8",
+    "G": "6", "g": "6",
+})
+
+_LINE_NOISE_RE = re.compile(r"[|_;]+")
+_LEADING_NON_NAME_RE = re.compile(rf"^[^{NAME_CHARS}]+")
+_NON_NAME_RE = re.compile(rf"[^{NAME_CHARS} ]")
+_MULTI_SPACE_RE = re.compile(r"\s{2,}")
+_NON_DIGIT_RE = re.compile(r"\D")
+
+
+class DocumentProfile(NamedTuple):
+    """Rules of one identity document type; all of them are evaluated in the same pass over the lines."""
+    name: str
+    first_name_labels: Tuple[str, ...]
+    last_name_labels: Tuple[str, ...]
+    blacklist: Tuple[str, ...]  # líneas que nunca son nombre en el fallback
+    identity_pattern: str = r"(\d{4})\D{0,2}(\d{4})\D{0,2}(\d{5})"  # 4-4-5 con separadores laxos
+    identity_digits: int = 13
+    min_identity_digits: int = 11
+
+
+DNI_PROFILE = DocumentProfile(
+    name="dni",
+    first_name_labels=("nombre", "forename"),
+    last_name_labels=("apellido", "surname"),
+    blacklist=("nacionalidad", "fecha", "expir", "identific", "numero", "documento", "registro",
+               "place", "birth", "nation", "hnd"),
+)
+
+# La licencia trae además encabezados y campos propios que no deben tomarse como nombre
+LICENSE_PROFILE = DNI_PROFILE._replace(
+    name="license",
+    blacklist=DNI_PROFILE.blacklist + ("licencia", "conducir", "categor", "vence", "vigencia", "sangre",
+                                       "republica"),
+)
+
+PROFILES = {p.name: p for p in (DNI_PROFILE, LICENSE_PROFILE)}
+
+
+_ASCII_LETTERS = bytes(range(ord("A"), ord("Z") + 1)) + bytes(range(ord("a"), ord("z") + 1))
+_ASCII_DIGITS = b"0123456789"
+
+
+def _keywords_re(words: Tuple[str, ...]) -> re.Pattern:
+    # Alternación compilada: equivale a `any(k in low for k in words)`; sin palabras nunca coincide
+    return re.compile("|".join(map(re.escape, words)) if words else r"(?!)")
+
+
+def line_score(ln: str) -> int:
+    """Letters minus 3x digits (lines that look like a name score high)."""
+    if ln.isascii():
+        # str.isalpha/isdigit en ASCII son [A-Za-z]/[0-9]: se cuentan con bytes.translate
+        b = ln.encode("ascii")
+        return (len(b) - len(b.translate(None, _ASCII_LETTERS))) - (len(b) - len(b.translate(None, _ASCII_DIGITS))) * 3
+    return sum(map(str.isalpha, ln)) - sum(map(str.isdigit, ln)) * 3
+
+
+def strip_val(val: str) -> str:
+    return _LEADING_NON_NAME_RE.sub("", val.strip(" -:_,.;"))
+
 
 class RegexIdAdapter(InfoExtractorPort):
     """
     Extrae identidad (13 dígitos) y nombre completo de texto OCR.
-    Pensado para DNI/Licencia de Honduras.
+    Las reglas del perfil (DNI, licencia) se compilan una vez; cada extract
+    hace una sola pasada por las líneas que resuelve identidad, etiquetas de
+    nombre y puntaje de líneas para el fallback.
     """
-    def extract(self, ocr_text: str) -> dict:
-        raw_lines = (ocr_text or "").splitlines()
-        lines = [re.sub(r"[|_;]+", " ", ln).strip() for ln in raw_lines if ln.strip()]
-        text = "\n".join(lines)
-
-        # Normaliza dígitos con correcciones típicas de OCR
-        digit_fix = str.maketrans({
-            "O": "0", "o": "0", "Q": "0",
-            "I": "1", "l": "1", "|": "1",
-            "S": "5", "s": "5",
-            "B": "8",
-            "G": "6", "g": "6",
-        })
-        fixed_text = text.translate(digit_fix)
-
-        # Busca patrón 4-4-5 con separadores laxos (prioriza líneas que lo contengan)
-        identity = ""
-        pattern = re.compile(r"(\d{4})\D{0,2}(\d{4})\D{0,2}(\d{5})")
-        for ln in lines:
-            m = pattern.search(ln)
-            if m:
-                identity = "".join(m.groups())
-                break
-        if not identity:
-            m = pattern.search(fixed_text)
-            if m:
-                identity = "".join(m.groups())
-        if not identity:
-            digits = re.sub(r"\D", "", fixed_text)
-            if len(digits) >= 13:
-                identity = digits[:13]
-            elif len(digits) >= 11:
-                identity = digits
+    def __init__(self, profile: DocumentProfile = DNI_PROFILE):
+        self.profile = profile
+        self._identity_re = re.compile(profile.identity_pattern)
+        self._first_re = _keywords_re(profile.first_name_labels)
+        self._last_re = _keywords_re(profile.last_name_labels)
+        self._skip_re = _keywords_re(profile.blacklist)
+
+    def _identity(self, lines: List[str], line_match: Optional[re.Match]) -> Tuple[str, str]:
+        if line_match:
+            identity = "".join(line_match.groups())
+        else:
+            fixed_text = "\n".join(lines).translate(DIGIT_FIX)
+            m = self._identity_re.search(fixed_text)
+            identity = "".join(m.groups()) if m else ""
+            if not identity:
+                digits = _NON_DIGIT_RE.sub("", fixed_text)
+                if len(digits) >= self.profile.identity_digits:
+                    identity = digits[:self.profile.identity_digits]
+                elif len(digits) >= self.profile.min_identity_digits:
+                    identity = digits
 
         identity_fmt = identity
-        if len(identity) == 13:
+        if len(identity) == self.profile.identity_digits:
             year = identity[4:8]
             if year.startswith("4"):
                 identity = identity[:4] + ("1" + year[1:]) + identity[8:]
+        return identity, identity_fmt
 
-        def strip_val(val: str) -> str:
-            return re.sub(r"^[^A-Za-zÁÉÍÓÚÜÑáéíóúüñ]+", "", val.strip(" -:_,.;"))
+    def extract(self, ocr_text: str) -> dict:
+        lines = [_LINE_NOISE_RE.sub(" ", ln).strip() for ln in (ocr_text or "").splitlines() if ln.strip()]
 
-        # Heurísticas de nombre: usa etiquetas y el siguiente renglón
+        # Una pasada: identidad (primera línea con 4-4-5), etiquetas de nombre
+        # (valor en el renglón siguiente) y puntaje letras - 3*dígitos
+        identity_match = None
         first_name = ""
         last_name = ""
+        scored = []
         for idx, ln in enumerate(lines):
+            if identity_match is None:
+                identity_match = self._identity_re.search(ln)
             low = ln.lower()
-            if any(k in low for k in ["nombre", "forename"]) and idx + 1 < len(lines):
-                candidate = strip_val(lines[idx + 1])
-                if candidate and len(candidate) > 3:
-                    first_name = candidate
-            if any(k in low for k in ["apellido", "surname"]) and idx + 1 < len(lines):
-                candidate = strip_val(lines[idx + 1])
-                if candidate and len(candidate) > 3:
-                    last_name = candidate
-            if first_name and last_name:
-                break
-
-        # Fallback: tomar líneas con muchas letras y pocas cifras, evitando etiquetas comunes
+            if not (first_name and last_name) and idx + 1 < len(lines):
+                if self._first_re.search(low):
+                    candidate = strip_val(lines[idx + 1])
+                    if candidate and len(candidate) > 3:
+                        first_name = candidate
+                if self._last_re.search(low):
+                    candidate = strip_val(lines[idx + 1])
+                    if candidate and len(candidate) > 3:
+                        last_name = candidate
+            if not self._skip_re.search(low):
+                score = line_score(ln)
+                if score > 0:
+                    scored.append((score, idx))
+
+        identity, identity_fmt = self._identity(lines, identity_match)
+
+        # Fallback: líneas con muchas letras y pocas cifras, evitando etiquetas comunes
         if not first_name or not last_name:
-            blacklist = ("nacionalidad", "fecha", "expir", "identific", "numero", "documento", "registro", "place", "birth", "nation", "hnd")
-            scored = []
-            for ln in lines:
-                low = ln.lower()
-                if any(b in low for b in blacklist):
-                    continue
-                letters = sum(ch.isalpha() for ch in ln)
-                digits_ln = sum(ch.isdigit() for ch in ln)
-                score = letters - digits_ln * 3
-                scored.append((score, strip_val(ln)))
             scored.sort(reverse=True, key=lambda t: t[0])
-            top = [t for t in scored if t[0] > 0][:3]
+            top = [strip_val(lines[idx]) for _, idx in scored[:2]]
             if not first_name and top:
-                first_name = top[0][1]
+                first_name = top[0]
             if not last_name and len(top) > 1:
-                last_name = top[1][1]
+                last_name = top[1]
 
         full_name = " ".join(p for p in [first_name, last_name] if p).strip()
         # Limpia ruido y normaliza espacios/símbolos
-        full_name = re.sub(r"[^A-Za-zÁÉÍÓÚÜÑáéíóúüñ ]", " ", full_name)
-        full_name = re.sub(r"\s{2,}", " ", full_name).strip()
-
+        full_name = _NON_NAME_RE.sub(" ", full_name)
+        full_name = _MULTI_SPACE_RE.sub(" ", full_name).strip()
 
         return {
             "identity": identity,
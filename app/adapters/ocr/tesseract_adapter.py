@@ -1,19 +1,67 @@
-from typing import Optional
+from typing import List, Optional, Tuple
 import pytesseract
 import numpy as np
+from app.domain.models import BoundingBox, OcrWord
 from app.ports.ocr_port import OcrPort
 
+# Línea única (PSM 7) y bloque (PSM 6) para placas
+PLATE_CONFIG = r"--oem 3 --psm 7 --dpi 300 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789- "
+PLATE_BLOCK_CONFIG = r"--oem 3 --psm 6 --dpi 300 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789- "
+
+
+def data_to_text_and_confidence(data: dict) -> Tuple[str, float]:
+    """
+    Rebuilds text (one line per Tesseract line) and mean word confidence
+    from `pytesseract.image_to_data(..., output_type=Output.DICT)`.
+    """
+    lines = {}
+    confs = []
+    for i, word in enumerate(data.get("text", [])):
+        conf = float(data["conf"][i])
+        if conf < 0 or not word.strip():
+            continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(key, []).append(word)
+        confs.append(conf)
+    text = "\n".join(" ".join(words) for _, words in sorted(lines.items()))
+    return text, (sum(confs) / len(confs) if confs else -1.0)
+
+
+def data_to_words(data: dict) -> List[OcrWord]:
+    """Word boxes from `pytesseract.image_to_data(..., output_type=Output.DICT)`."""
+    words = []
+    for i, word in enumerate(data.get("text", [])):
+        conf = float(data["conf"][i])
+        if conf < 0 or not word.strip():
+            continue
+        words.append(OcrWord(
+            text=word.strip(),
+            confidence=conf,
+            box=BoundingBox(x=int(data["left"][i]), y=int(data["top"][i]),
+                            w=int(data["width"][i]), h=int(data["height"][i])),
+            line=(int(data["block_num"][i]), int(data["par_num"][i]), int(data["line_num"][i])),
+        ))
+    return words
+
 
 class TesseractPlateAdapter(OcrPort):
     """
     OCR especializado para placas (texto corto, mayúsculas, dígitos y guiones).
     """
     def __init__(self, config: Optional[str] = None):
-        self.config = config or r"--oem 3 --psm 7 --dpi 300 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789- "
+        self.config = config or PLATE_CONFIG
 
     def extract_text(self, img: np.ndarray) -> str:
         return pytesseract.image_to_string(img, config=self.config)
 
+    def extract_text_with_confidence(self, img: np.ndarray) -> Tuple[str, float]:
+        data = pytesseract.image_to_data(img, config=self.config, output_type=pytesseract.Output.DICT)
+        return data_to_text_and_confidence(data)
+
+    def extract_words(self, img: np.ndarray) -> List[OcrWord]:
+        data = pytesseract.image_to_data(img, config=self.config, output_type=pytesseract.Output.DICT)
+        return data_to_words(data)
+
 
 # Alias de compatibilidad si hubiera usos previos
 TesseractAdapter = TesseractPlateAdapter
@@ -1,7 +1,19 @@
 import pytesseract
 import numpy as np
-from typing import Optional
+from typing import List, Optional, Tuple
+from app.domain.models import OcrWord
 from app.ports.ocr_port import OcrPort
+from app.adapters.ocr.tesseract_adapter import data_to_text_and_confidence, data_to_words
+
+# preserve_interword_spaces mantiene separación de palabras útil para regex
+DOCUMENT_CONFIG = r"--oem 3 --psm 6 -l spa+eng -c preserve_interword_spaces=1"
+# Modo por regiones: pasada de layout (texto disperso) y OCR de una línea por región
+DOCUMENT_LAYOUT_CONFIG = r"--oem 3 --psm 11 -l spa+eng"
+ID_DIGITS_CONFIG = r"--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789-"
+ID_NAME_CONFIG = (
+    r"--oem 3 --psm 7 -l spa -c tessedit_char_whitelist="
+    r"ABCDEFGHIJKLMNOPQRSTUVWXYZÁÉÍÓÚÜÑabcdefghijklmnopqrstuvwxyzáéíóúüñ"
+)
 
 
 class TesseractDocumentAdapter(OcrPort):
@@ -9,8 +21,15 @@ class TesseractDocumentAdapter(OcrPort):
     OCR para documentos (DNI/Licencia) usando layout de párrafos.
     """
     def __init__(self, config: Optional[str] = None):
-        # preserve_interword_spaces mantiene separación de palabras útil para regex
-        self.config = config or r"--oem 3 --psm 6 -l spa+eng -c preserve_interword_spaces=1"
+        self.config = config or DOCUMENT_CONFIG
 
     def extract_text(self, img: np.ndarray) -> str:
         return pytesseract.image_to_string(img, config=self.config)
+
+    def extract_text_with_confidence(self, img: np.ndarray) -> Tuple[str, float]:
+        data = pytesseract.image_to_data(img, config=self.config, output_type=pytesseract.Output.DICT)
+        return data_to_text_and_confidence(data)
+
+    def extract_words(self, img: np.ndarray) -> List[OcrWord]:
+        data = pytesseract.image_to_data(img, config=self.config, output_type=pytesseract.Output.DICT)
+        return data_to_words(data)
@@ -0,0 +1,185 @@
+import queue
+import shlex
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from app.domain.models import BoundingBox, OcrWord
+from app.ports.ocr_port import OcrPort
+
+try:  # dependencia opcional: bindings in-process de libtesseract
+    import tesserocr
+except ImportError:  # pragma: no cover - depende del entorno
+    tesserocr = None
+
+
+def tesserocr_available() -> bool:
+    return tesserocr is not None
+
+
+class TesseractConfig:
+    """
+    Parsed form of a pytesseract-style config string
+    (`--oem 3 --psm 7 --dpi 300 -l spa+eng -c key=value`).
+    """
+    def __init__(self, config: str, default_lang: str = "eng"):
+        self.lang = default_lang
+        self.psm = 3
+        self.oem = 3
+        self.dpi: Optional[int] = None
+        self.variables: Dict[str, str] = {}
+
+        tokens = shlex.split(config or "")
+        i = 0
+        while i < len(tokens):
+            tok = tokens[i]
+            nxt = tokens[i + 1] if i + 1 < len(tokens) else ""
+            if tok == "--psm":
+                self.psm = int(nxt)
+            elif tok == "--oem":
+                self.oem = int(nxt)
+            elif tok == "--dpi":
+                self.dpi = int(nxt)
+            elif tok == "-l":
+                self.lang = nxt
+            elif tok == "-c" and "=" in nxt:
+                key, value = nxt.split("=", 1)
+                self.variables[key] = value
+            else:
+                i += 1
+                continue
+            i += 2
+
+    def key(self) -> Tuple:
+        return (self.lang, self.psm, self.oem, self.dpi, tuple(sorted(self.variables.items())))
+
+
+class TesseractEnginePool:
+    """
+    Pool of long-lived `PyTessBaseAPI` engines sharing one language/PSM
+    configuration. Traineddata is loaded once per engine; engines are created
+    lazily up to `size` and reused across calls.
+    """
+    def __init__(self, cfg: TesseractConfig, size: int, tessdata_path: str = ""):
+        if tesserocr is None:
+            raise RuntimeError("tesserocr is not installed; use the pytesseract adapters instead")
+        self.cfg = cfg
+        self.size = max(1, int(size))
+        self.tessdata_path = tessdata_path
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _new_engine(self):
+        kwargs = {"lang": self.cfg.lang, "psm": self.cfg.psm, "oem": self.cfg.oem}
+        if self.tessdata_path:
+            kwargs["path"] = self.tessdata_path
+        api = tesserocr.PyTessBaseAPI(**kwargs)
+        for key, value in self.cfg.variables.items():
+            api.SetVariable(key, value)
+        return api
+
+    @contextmanager
+    def acquire(self) -> Iterator:
+        try:
+            api = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    api = self._new_engine()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                api = self._idle.get()
+        try:
+            yield api
+        finally:
+            api.Clear()
+            self._idle.put(api)
+
+
+_POOLS: Dict[Tuple, TesseractEnginePool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_engine_pool(cfg: TesseractConfig, size: int, tessdata_path: str = "") -> TesseractEnginePool:
+    """Engine pools are shared per configuration across adapter instances."""
+    key = cfg.key()
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = TesseractEnginePool(cfg, size, tessdata_path)
+            _POOLS[key] = pool
+        return pool
+
+
+class TesserocrPoolAdapter(OcrPort):
+    """
+    OCR in-process con motores Tesseract persistentes (tesserocr).
+    Recibe el buffer numpy directamente: sin archivo temporal ni subproceso.
+    """
+    def __init__(self, config: str, pool_size: int = 4, tessdata_path: str = "", default_lang: str = "eng"):
+        self.config = config
+        self.cfg = TesseractConfig(config, default_lang=default_lang)
+        self.pool = get_engine_pool(self.cfg, pool_size, tessdata_path)
+
+    def _set_image(self, api, img: np.ndarray) -> bytes:
+        img = np.ascontiguousarray(img, dtype=np.uint8)
+        h, w = img.shape[:2]
+        bpp = 1 if img.ndim == 2 else img.shape[2]
+        # Tesseract no copia el buffer: el llamador debe mantenerlo vivo hasta reconocer
+        buf = img.tobytes()
+        api.SetImageBytes(buf, w, h, bpp, w * bpp)
+        if self.cfg.dpi:
+            api.SetSourceResolution(self.cfg.dpi)
+        return buf
+
+    def extract_text(self, img: np.ndarray) -> str:
+        with self.pool.acquire() as api:
+            buf = self._set_image(api, img)
+            text = api.GetUTF8Text()
+            del buf
+            return text
+
+    def extract_text_with_confidence(self, img: np.ndarray) -> Tuple[str, float]:
+        with self.pool.acquire() as api:
+            buf = self._set_image(api, img)
+            text = api.GetUTF8Text()
+            conf = float(api.MeanTextConf()) if text.strip() else -1.0
+            del buf
+            return text, conf
+
+    def extract_words(self, img: np.ndarray) -> List[OcrWord]:
+        words = []
+        with self.pool.acquire() as api:
+            buf = self._set_image(api, img)
+            api.Recognize()
+            it = api.GetIterator()
+            block = par = line = 0
+            for w in tesserocr.iterate_level(it, tesserocr.RIL.WORD):
+                # tesserocr no expone los números de Tesseract: se cuentan los inicios
+                if w.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+                    block, par, line = block + 1, 0, 0
+                if w.IsAtBeginningOf(tesserocr.RIL.PARA):
+                    par, line = par + 1, 0
+                if w.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                    line += 1
+                text = (w.GetUTF8Text(tesserocr.RIL.WORD) or "").strip()
+                box = w.BoundingBox(tesserocr.RIL.WORD)
+                if not text or box is None:
+                    continue
+                x1, y1, x2, y2 = box
+                words.append(OcrWord(
+                    text=text,
+                    confidence=float(w.Confidence(tesserocr.RIL.WORD)),
+                    box=BoundingBox(x=x1, y=y1, w=x2 - x1, h=y2 - y1),
+                    line=(block, par, line),
+                ))
+            del buf
+        return words
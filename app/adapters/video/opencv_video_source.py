@@ -0,0 +1,43 @@
+from typing import Optional, Tuple
+import cv2
+import numpy as np
+from app.ports.video_source_port import VideoSourcePort
+
+# Algunos contenedores no informan FPS
+DEFAULT_FPS = 25.0
+
+
+class OpenCvVideoSource(VideoSourcePort):
+    """
+    Lectura secuencial de un archivo de video local con cv2.VideoCapture.
+    `skip` usa grab() (demux sin conversión a BGR), así que los frames no
+    muestreados salen mucho más baratos que un read().
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._cap = cv2.VideoCapture(path)
+        if not self._cap.isOpened():
+            raise ValueError(f"Could not open video: {path!r}")
+        fps = self._cap.get(cv2.CAP_PROP_FPS) or 0.0
+        self.fps = fps if 0 < fps < 1000 else DEFAULT_FPS
+        self.frame_count = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        self._index = 0  # índice del próximo frame
+
+    def skip(self, n: int) -> int:
+        skipped = 0
+        while skipped < n and self._cap.grab():
+            skipped += 1
+        self._index += skipped
+        return skipped
+
+    def read(self) -> Optional[Tuple[int, float, np.ndarray]]:
+        ok, frame = self._cap.read()
+        if not ok or frame is None:
+            return None
+        index = self._index
+        self._index += 1
+        # Timestamp derivado del índice: CAP_PROP_POS_MSEC no es fiable en todos los backends
+        return index, index * 1000.0 / self.fps, frame
+
+    def close(self) -> None:
+        self._cap.release()
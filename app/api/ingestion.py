@@ -0,0 +1,197 @@
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Tuple
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.domain.image_header import read_image_size
+
+IMAGE_CONTENT_TYPES = ("image/jpeg", "image/png", "image/webp")
+
+_CHUNK = 256 * 1024
+
+
+class BufferPool:
+    """
+    Pool of reusable bytearrays for uploads: the body is read straight into a
+    pooled buffer and decoded in place (np.frombuffer over a memoryview), so a
+    request does not allocate a new `bytes` of the full upload. Buffers larger
+    than `max_buffer_bytes` are not kept.
+
+    A released buffer that is still exported (a memoryview or array over it
+    kept alive, e.g. by executor work that outlived its request) is parked as
+    busy and only handed out again once every export is gone, so a late
+    reader never sees another upload's bytes.
+    """
+    def __init__(self, max_buffers: int, max_buffer_bytes: int):
+        self.max_buffers = max(0, max_buffers)
+        self.max_buffer_bytes = max_buffer_bytes
+        self._free: List[bytearray] = []
+        self._busy: List[bytearray] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _in_use(buf: bytearray) -> bool:
+        # Un bytearray exportado no se puede redimensionar
+        try:
+            buf.append(0)
+        except BufferError:
+            return True
+        buf.pop()
+        return False
+
+    def _sweep(self):
+        still = []
+        for buf in self._busy:
+            if self._in_use(buf):
+                still.append(buf)
+            elif len(self._free) < self.max_buffers:
+                self._free.append(buf)
+        self._busy = still
+
+    def acquire(self, size: int) -> bytearray:
+        with self._lock:
+            if self._busy:
+                self._sweep()
+            fits = [b for b in self._free if len(b) >= size]
+            if fits:
+                buf = min(fits, key=len)
+                self._free.remove(buf)
+                self.hits += 1
+                return buf
+            self.misses += 1
+        # Redondeo a múltiplos de _CHUNK para que el buffer sirva a más uploads
+        return bytearray(max(_CHUNK, -(-size // _CHUNK) * _CHUNK))
+
+    def release(self, buf: bytearray):
+        if len(buf) > self.max_buffer_bytes:
+            return
+        with self._lock:
+            if self._in_use(buf):
+                # Si hay demasiados ocupados se sueltan: los libera el GC con su último export
+                if len(self._busy) < self.max_buffers:
+                    self._busy.append(buf)
+            elif len(self._free) < self.max_buffers:
+                self._free.append(buf)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._sweep()
+            return {
+                "free": len(self._free),
+                "freeBytes": sum(len(b) for b in self._free),
+                "busy": len(self._busy),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+buffer_pool = BufferPool(settings.upload_pool_buffers, settings.upload_pool_max_bytes)
+
+
+class ImageUpload:
+    """Validated image upload; `data` is a view over a pooled buffer, released (unusable) when ingestion exits."""
+    def __init__(self, name: Optional[str], data: memoryview, width: int, height: int):
+        self.name = name
+        self.data = data
+        self.width = width
+        self.height = height
+
+
+def check_content_type(file: UploadFile, allowed: Tuple[str, ...] = IMAGE_CONTENT_TYPES):
+    if file.content_type not in allowed:
+        raise HTTPException(status_code=415, detail="Only JPG/PNG/WEBP supported")
+
+
+def check_image_header(data, max_pixels: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Rejects empty, malformed (unknown header) or oversized images before
+    decoding (decompression bombs). Returns (width, height) from the header.
+    """
+    if not len(data):
+        raise HTTPException(status_code=400, detail="Empty file")
+    size = read_image_size(data)
+    if size is None or not size[0] or not size[1]:
+        raise HTTPException(status_code=400, detail="Malformed or unsupported image")
+    max_pixels = settings.max_image_pixels if max_pixels is None else max_pixels
+    if size[0] * size[1] > max_pixels:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Image too large: {size[0]}x{size[1]} (max {max_pixels} pixels)",
+        )
+    return size
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Upload too large (max {max_bytes} bytes)")
+
+
+def _read_into_pool(src, size_hint: Optional[int], max_bytes: int, pool: BufferPool) -> Tuple[bytearray, int]:
+    """Reads `src` into a pooled buffer, failing as soon as it exceeds `max_bytes`."""
+    # +1: llegar a EOF sin tener que crecer el buffer
+    buf = pool.acquire(min(size_hint + 1 if size_hint else _CHUNK, max_bytes + 1))
+    n = 0
+    try:
+        while True:
+            if n == len(buf):
+                if n > max_bytes:
+                    raise _too_large(max_bytes)
+                bigger = pool.acquire(min(len(buf) * 2, max_bytes + 1))
+                bigger[:n] = buf[:n]
+                pool.release(buf)
+                buf = bigger
+            read = src.readinto(memoryview(buf)[n:])
+            if not read:
+                break
+            n += read
+            if n > max_bytes:
+                raise _too_large(max_bytes)
+    except BaseException:
+        pool.release(buf)
+        raise
+    return buf, n
+
+
+@asynccontextmanager
+async def ingest_image(
+    file: UploadFile,
+    max_bytes: Optional[int] = None,
+    pool: BufferPool = buffer_pool,
+) -> AsyncIterator[ImageUpload]:
+    """
+    Shared upload ingestion for every image endpoint: content-type check,
+    byte cap (before and while reading), header-based pixel cap and malformed
+    header rejection, all before any decode. When the block exits the view
+    is released and the buffer goes back to the pool; work that still holds
+    an export of it (np.frombuffer, a slice) keeps it out of reuse until done.
+    """
+    check_content_type(file)
+    max_bytes = settings.max_upload_bytes if max_bytes is None else max_bytes
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    await file.seek(0)
+    buf, n = await run_in_threadpool(_read_into_pool, file.file, file.size, max_bytes, pool)
+    view = memoryview(buf)[:n]
+    try:
+        width, height = check_image_header(view)
+        yield ImageUpload(file.filename, view, width, height)
+    finally:
+        try:
+            view.release()
+        except BufferError:
+            # Hay arrays sobre la vista todavía vivos: el pool no reutiliza el buffer hasta que mueran
+            pass
+        pool.release(buf)
+
+
+async def read_upload_bytes(file: UploadFile, max_bytes: int) -> bytes:
+    """Whole upload as bytes (for payloads that outlive the request, e.g. streamed batches), capped at `max_bytes`."""
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large(max_bytes)
+    data = await file.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise _too_large(max_bytes)
+    return data
@@ -0,0 +1,89 @@
+import hashlib
+import json
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from app.core.config import settings
+from app.core.metrics import RESULT_CACHE_LOOKUPS
+from app.ports.result_cache_port import ResultCachePort
+
+# Settings que no cambian el resultado (el namespace sí entra: sirve para invalidar a mano)
+_UNKEYED_PREFIXES = ("result_cache_", "debug_")
+
+
+@lru_cache(maxsize=64)
+def fingerprint(*parts: str) -> str:
+    """Hash of the result-affecting settings plus the endpoint parts (adapter configs, options)."""
+    fields = {k: v for k, v in vars(settings).items() if not k.startswith(_UNKEYED_PREFIXES)}
+    fields["result_cache_namespace"] = settings.result_cache_namespace
+    blob = json.dumps([fields, parts], sort_keys=True, default=str)
+    return hashlib.blake2b(blob.encode(), digest_size=16).hexdigest()
+
+
+def content_key(data, fp: str) -> str:
+    # blake2b de hashlib suelta el GIL con buffers grandes: se llama desde el threadpool
+    h = hashlib.blake2b(fp.encode(), digest_size=20)
+    h.update(data)
+    return h.hexdigest()
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags or "W/" + etag in tags
+
+
+class CacheLookup(NamedTuple):
+    endpoint: str
+    key: str
+    etag: str
+    file_name: Optional[str]
+    response: Optional[Response]  # 304 o HIT listo para devolver; None = hay que procesar
+
+
+def _per_request(value, file_name: Optional[str]):
+    """Replaces every fileName (top level and nested, e.g. plates[]) with `file_name`."""
+    if isinstance(value, dict):
+        return {k: file_name if k == "fileName" else _per_request(v, file_name) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_per_request(v, file_name) for v in value]
+    return value
+
+
+async def lookup_result(request: Request, cache: Optional[ResultCachePort], endpoint: str,
+                        data, file_name: Optional[str], *parts: str) -> CacheLookup:
+    """
+    Content-addressed lookup: the key is blake2b(upload bytes) salted with the
+    fingerprint of settings and `parts`, and doubles as the ETag. The key does
+    not cover everything that can change a reading (Tesseract binary and
+    traineddata, time budgets), so a matching If-None-Match only answers 304
+    while the entry is still cached; otherwise a cached result is served with
+    `X-Cache: HIT`. Without a cache nothing is revalidated.
+    """
+    key = await run_in_threadpool(content_key, data, fingerprint(endpoint, *parts))
+    etag = f'"{key}"'
+    cached = await run_in_threadpool(cache.get, key) if cache is not None else None
+    if cached is None:
+        RESULT_CACHE_LOOKUPS.inc(endpoint, "miss")
+        return CacheLookup(endpoint, key, etag, file_name, None)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        RESULT_CACHE_LOOKUPS.inc(endpoint, "not_modified")
+        return CacheLookup(endpoint, key, etag, file_name, Response(status_code=304, headers={"ETag": etag}))
+    RESULT_CACHE_LOOKUPS.inc(endpoint, "hit")
+    return CacheLookup(endpoint, key, etag, file_name, JSONResponse(
+        _per_request(cached, file_name), headers={"ETag": etag, "X-Cache": "HIT"}))
+
+
+async def store_result(lookup: CacheLookup, cache: Optional[ResultCachePort], result: dict) -> JSONResponse:
+    """
+    Stores a fresh result with every fileName (per request, also nested)
+    blanked, re-added on each HIT, and returns it with its ETag.
+    """
+    content = jsonable_encoder(result)
+    if cache is not None:
+        await run_in_threadpool(cache.put, lookup.key, _per_request(content, None))
+    return JSONResponse(content, headers={"ETag": lookup.etag, "X-Cache": "MISS"})
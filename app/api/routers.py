@@ -1,66 +1,216 @@
-from functools import lru_cache
+from contextlib import AsyncExitStack
+from datetime import datetime
+from functools import lru_cache, wraps
+from html import escape
+from typing import List, Optional, Tuple
+from urllib.parse import urlencode
+import asyncio
 import io
+import json
+import logging
 import os
+import tempfile
 import uuid
+import zipfile
 import cv2
 import numpy as np
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from fastapi.responses import StreamingResponse, FileResponse, HTMLResponse
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse, FileResponse, HTMLResponse, JSONResponse, PlainTextResponse
 from app.ports.detector_port import PlateDetectorPort
+from app.domain.models import DetectionResult
 from app.ports.ocr_port import OcrPort
 from app.ports.info_extractor_port import InfoExtractorPort
 from app.adapters.detector.yolo_adapter import YoloAdapter
-from app.adapters.ocr.tesseract_adapter import TesseractPlateAdapter
-from app.adapters.ocr.tesseract_document_adapter import TesseractDocumentAdapter
-from app.adapters.extraction.regex_id_adapter import RegexIdAdapter
+from app.adapters.detector.onnx_adapter import OnnxAdapter
+from app.adapters.detector.batching_detector import BatchingDetector
+from app.adapters.ocr.tesseract_adapter import TesseractPlateAdapter, PLATE_CONFIG, PLATE_BLOCK_CONFIG
+from app.adapters.ocr.tesseract_document_adapter import (
+    TesseractDocumentAdapter, DOCUMENT_CONFIG, DOCUMENT_LAYOUT_CONFIG, ID_DIGITS_CONFIG, ID_NAME_CONFIG,
+)
+from app.adapters.ocr.tesserocr_pool_adapter import TesserocrPoolAdapter, tesserocr_available
+from app.adapters.extraction.regex_id_adapter import DNI_PROFILE, LICENSE_PROFILE, DocumentProfile, RegexIdAdapter
+from app.adapters.cache.lru_result_cache import LruResultCache
+from app.adapters.cache.sqlite_result_cache import SqliteResultCache
+from app.adapters.debug.async_artifact_writer import AsyncArtifactWriter
+from app.adapters.debug.sqlite_artifact_index import SqliteArtifactIndex
+from app.adapters.video.opencv_video_source import OpenCvVideoSource
+from app.api.ingestion import (
+    IMAGE_CONTENT_TYPES,
+    buffer_pool,
+    check_image_header,
+    ingest_image,
+    read_upload_bytes,
+)
+from app.api.result_cache import lookup_result, store_result
+from app.ports.debug_artifact_port import DebugArtifactPort
+from app.ports.result_cache_port import ResultCachePort
+from app.core.config import settings
+from app.core.executors import InferenceExecutors
+from app.core.readiness import readiness
+from app.core.metrics import instrument, registry as metrics_registry, PIPELINE_OUTCOMES, PLATE_READ_OUTCOMES
 from app.domain import image_utils, services
+from app.domain.document_layout import IdentityLayoutReader
+from app.domain.document_normalize import default_document_normalizer
+from app.domain.ocr_cascade import CascadeOutcome, OcrCascade
+from app.domain.plate_consensus import PlateVoter
+from app.domain.video_scanner import VideoPlateScanner
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 # Dependency Injection (Cached)
 @lru_cache()
 def get_detector() -> PlateDetectorPort:
-    return YoloAdapter()
+    if settings.detector_backend == "onnx":
+        detector = instrument(OnnxAdapter(), "detector")
+    elif settings.detector_backend == "yolo":
+        detector = instrument(YoloAdapter(), "detector")
+    else:
+        raise ValueError(f"Unknown DETECTOR_BACKEND: {settings.detector_backend!r}")
+    if settings.detect_batch_size > 1:
+        return BatchingDetector(
+            detector,
+            max_batch_size=settings.detect_batch_size,
+            max_wait_ms=settings.detect_batch_wait_ms,
+        )
+    return detector
+
+def _build_ocr(config: str, fallback_cls) -> OcrPort:
+    if settings.ocr_engine == "tesserocr":
+        if tesserocr_available():
+            return instrument(
+                TesserocrPoolAdapter(config, pool_size=settings.ocr_pool_size, tessdata_path=settings.tessdata_prefix),
+                "ocr",
+            )
+        logger.warning("OCR_ENGINE=tesserocr but tesserocr is not installed; falling back to pytesseract")
+    return instrument(fallback_cls(config=config), "ocr")
 
 @lru_cache()
 def get_plate_ocr() -> OcrPort:
-    return TesseractPlateAdapter()
+    return _build_ocr(PLATE_CONFIG, TesseractPlateAdapter)
+
+@lru_cache()
+def get_plate_ocr_block() -> OcrPort:
+    return _build_ocr(PLATE_BLOCK_CONFIG, TesseractPlateAdapter)
 
 @lru_cache()
 def get_doc_ocr() -> OcrPort:
-    return TesseractDocumentAdapter()
+    return _build_ocr(DOCUMENT_CONFIG, TesseractDocumentAdapter)
+
+@lru_cache()
+def get_doc_layout_ocr() -> OcrPort:
+    return _build_ocr(DOCUMENT_LAYOUT_CONFIG, TesseractDocumentAdapter)
+
+@lru_cache()
+def get_id_digits_ocr() -> OcrPort:
+    return _build_ocr(ID_DIGITS_CONFIG, TesseractDocumentAdapter)
+
+@lru_cache()
+def get_id_name_ocr() -> OcrPort:
+    return _build_ocr(ID_NAME_CONFIG, TesseractDocumentAdapter)
+
+def get_plate_cascade(
+    primary: OcrPort = Depends(get_plate_ocr),
+    block: OcrPort = Depends(get_plate_ocr_block),
+) -> OcrCascade:
+    return OcrCascade.from_spec(
+        settings.ocr_cascade_variants,
+        {"psm7": primary, "psm6": block},
+        budget_ms=settings.ocr_cascade_budget_ms,
+        min_confidence=settings.ocr_cascade_min_conf,
+        parallel=settings.ocr_cascade_parallel,
+    )
 
 @lru_cache()
 def get_id_extractor() -> InfoExtractorPort:
     return RegexIdAdapter()
 
+@lru_cache()
+def get_license_extractor() -> InfoExtractorPort:
+    return RegexIdAdapter(LICENSE_PROFILE)
+
+@lru_cache()
+def get_executors() -> InferenceExecutors:
+    return InferenceExecutors.from_settings(settings)
+
+@lru_cache()
+def get_result_cache() -> Optional[ResultCachePort]:
+    if settings.result_cache_entries <= 0:
+        return None
+    disk = None
+    if settings.result_cache_path:
+        disk = SqliteResultCache(settings.result_cache_path, settings.result_cache_disk_entries, settings.result_cache_ttl_s)
+    return LruResultCache(settings.result_cache_entries, settings.result_cache_max_bytes, settings.result_cache_ttl_s, disk)
+
+@lru_cache()
+def _model_stamp() -> str:
+    """Ruta, tamaño y mtime del modelo del detector: un modelo nuevo en la misma ruta invalida la caché."""
+    path = settings.onnx_model_path if settings.detector_backend == "onnx" else settings.model_path
+    try:
+        st = os.stat(path)
+    except OSError:
+        return path
+    return f"{path}:{st.st_size}:{int(st.st_mtime)}"
+
+@lru_cache()
+def get_debug_index() -> SqliteArtifactIndex:
+    return SqliteArtifactIndex(settings.debug_index_path)
+
+@lru_cache()
+def get_debug_artifacts() -> DebugArtifactPort:
+    return AsyncArtifactWriter(
+        settings.debug_dir,
+        mode=settings.debug_capture,
+        sample_rate=settings.debug_sample_rate,
+        queue_size=settings.debug_queue_size,
+        max_files=settings.debug_max_files,
+        max_bytes=settings.debug_max_bytes,
+        index=get_debug_index(),
+    )
+
+
+@router.get("/health")
+def health():
+    """Liveness: the event loop is responsive"""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def ready():
+    """Readiness: adapters loaded and warmed up, with per-component load times"""
+    state = readiness.snapshot()
+    return JSONResponse(status_code=200 if state["ready"] else 503, content=state)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text exposition of stage latencies, OCR fallback counters and outcomes"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @router.post("/detect")
 async def detect(
     file: UploadFile = File(...),
-    detector: PlateDetectorPort = Depends(get_detector)
+    detector: PlateDetectorPort = Depends(get_detector),
+    executors: InferenceExecutors = Depends(get_executors),
 ):
-    if file.content_type not in ("image/jpeg", "image/png", "image/webp"):
-        raise HTTPException(status_code=415, detail="Only JPG/PNG/WEBP supported")
-
-    data = await file.read()
-    if not data:
-        raise HTTPException(status_code=400, detail="Empty file")
-
-    img_array = np.frombuffer(data, np.uint8)
-    img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-    if img is None:
-        raise HTTPException(status_code=400, detail="Could not decode image")
+    async with ingest_image(file) as upload:
+        decoded = await executors.run("decode", image_utils.decode_for_detection, upload.data, _detect_target())
+        if decoded is None:
+            raise HTTPException(status_code=400, detail="Could not decode image")
 
-    result = detector.detect_plate(img)
-    if not result:
-        raise HTTPException(status_code=404, detail="No plate detected")
+        result = await executors.run("detect", detector.detect_plate, decoded.image)
+        if not result:
+            raise HTTPException(status_code=404, detail="No plate detected")
 
-    # Crop logic for display check
-    x1, y1, w, h = result.box.x, result.box.y, result.box.w, result.box.h
-    x2, y2 = x1 + w, y1 + h
-    plate = img[y1:y2, x1:x2]
+        # Crop logic for display check (full resolution)
+        result = image_utils.map_detection(result, decoded)
+        crops = await executors.run("decode", image_utils.detection_crops, upload.data, decoded, [result.box], 0)
+        plate = crops[0] if crops else None
 
-    if plate.size == 0:
+    if plate is None or plate.size == 0:
         raise HTTPException(status_code=500, detail="Detector returned invalid crop")
 
     success, buffer = cv2.imencode(".jpg", plate)
@@ -73,181 +223,645 @@ async def detect(
         headers={"Content-Disposition": "attachment; filename=plate.jpg"}
     )
 
-@router.post("/ocr", response_model=dict)
-async def ocr(
-    file: UploadFile = File(...),
-    detector: PlateDetectorPort = Depends(get_detector),
-    ocr_service: OcrPort = Depends(get_plate_ocr)
-):
-    if file.content_type not in ("image/jpeg", "image/png", "image/webp"):
-        raise HTTPException(status_code=415, detail="Only JPG/PNG/WEBP supported")
-
-    data = await file.read()
+def _detect_target() -> int:
+    """Long side the detector needs: uploads are decoded reduced down to it (0 = full decode)."""
+    return settings.img_size if settings.detect_reduced_decode else 0
+
+
+def _counts_outcome(pipeline):
+    """Counts each call of a plate pipeline by outcome (200/404/422/...) in plate_pipeline_outcomes_total."""
+    @wraps(pipeline)
+    async def counted(*args, **kwargs) -> dict:
+        try:
+            result = await pipeline(*args, **kwargs)
+        except HTTPException as exc:
+            PIPELINE_OUTCOMES.inc(str(exc.status_code))
+            raise
+        except Exception:
+            PIPELINE_OUTCOMES.inc("500")
+            raise
+        PIPELINE_OUTCOMES.inc("200")
+        return result
+    return counted
+
+
+async def _detect_and_crop(
+    data: bytes,
+    detector: PlateDetectorPort,
+    executors: InferenceExecutors,
+) -> Tuple[Optional[np.ndarray], DetectionResult]:
+    """
+    reduced decode -> detect -> map to full-resolution coordinates -> padded
+    crop (see detection_crops). Raises 400 (empty/undecodable) and 404 (no plate).
+    """
     if not data:
         raise HTTPException(status_code=400, detail="Empty file")
 
-    img_array = np.frombuffer(data, np.uint8)
-    img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-    if img is None:
+    decoded = await executors.run("decode", image_utils.decode_for_detection, data, _detect_target())
+    if decoded is None:
         raise HTTPException(status_code=400, detail="Could not decode image")
 
-    # 1) Detect
-    result = detector.detect_plate(img)
+    result = await executors.run("detect", detector.detect_plate, decoded.image)
     if not result:
-        # Replicating original behavior: maybe 404? 
-        # The original code threw 404 inside detect_plate helper.
         raise HTTPException(status_code=404, detail="No plate detected")
 
-    x1, y1, w, h = result.box.x, result.box.y, result.box.w, result.box.h
-    x2, y2 = x1 + w, y1 + h
+    result = image_utils.map_detection(result, decoded)
+    crops = await executors.run("decode", image_utils.detection_crops, data, decoded, [result.box], 10, settings.crop_min_plate_height)
+    return (crops[0] if crops else None), result
 
-    # 2) Crop with padding
-    plate = image_utils.crop_with_padding(img, x1, y1, x2, y2, pad=10)
+
+async def _read_crop(
+    plate: Optional[np.ndarray],
+    cascade: OcrCascade,
+    executors: InferenceExecutors,
+) -> Tuple[np.ndarray, CascadeOutcome]:
+    """preprocess_for_ocr -> OCR cascade for one plate crop. Raises 500 on an invalid crop."""
     if plate is None or plate.size == 0:
         raise HTTPException(status_code=500, detail="Detector returned invalid crop for OCR")
 
-    # 3) Preprocess
     try:
-        thr = image_utils.preprocess_for_ocr(plate)
+        thr = await executors.run("preprocess", image_utils.preprocess_for_ocr, plate)
     except ValueError as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
-    # Debug save always enabled for diagnosis
-    debug_dir = "/tmp/debug_plates"
-    os.makedirs(debug_dir, exist_ok=True)
-    uid = uuid.uuid4().hex[:8]
-    cv2.imwrite(f"{debug_dir}/{uid}_01_crop.jpg", plate)
-    cv2.imwrite(f"{debug_dir}/{uid}_02_processed.jpg", thr)
+    # Variantes en orden de prioridad (hasta OCR_CASCADE_PARALLEL a la vez), gana la primera que cumple el formato
+    return thr, await cascade.run(plate, thr, executors)
 
-    # 4) OCR con fallback si sale vacío
-    raw_text = ocr_service.extract_text(thr).strip()
-    print(f"DEBUG: Initial OCR raw_text: {raw_text!r}")
-    
-    if not raw_text:
-        fallback_ocr = TesseractPlateAdapter(config="--oem 3 --psm 6 --dpi 300 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789- ")
-        raw_text = fallback_ocr.extract_text(thr).strip()
-        print(f"DEBUG: Fallback 1 raw_text: {raw_text!r}")
-        
-    if not raw_text:
-        gray = cv2.cvtColor(plate, cv2.COLOR_BGR2GRAY)
-        raw_text = ocr_service.extract_text(gray).strip()
-        print(f"DEBUG: Fallback 2 (gray) raw_text: {raw_text!r}")
-        
-    if not raw_text:
-        raw_text = fallback_ocr.extract_text(cv2.cvtColor(plate, cv2.COLOR_BGR2GRAY)).strip()
-        print(f"DEBUG: Fallback 3 (gray+config) raw_text: {raw_text!r}")
 
-    # 5) Normalize
-    plate_text = services.normalize_hn_plate(raw_text)
-    print(f"DEBUG: Normalized text: {plate_text!r}")
+@_counts_outcome
+async def _plate_pipeline(
+    data: bytes,
+    file_name: str,
+    detector: PlateDetectorPort,
+    cascade: OcrCascade,
+    executors: InferenceExecutors,
+    artifacts: DebugArtifactPort,
+) -> dict:
+    """
+    reduced decode -> detect -> crop -> preprocess_for_ocr -> OCR cascade -> normalize_hn_plate.
+    Raises HTTPException with the same status codes as /ocr.
+    """
+    plate, result = await _detect_and_crop(data, detector, executors)
+    return await _ocr_plate_region(plate, result, file_name, cascade, executors, artifacts)
+
+
+async def _ocr_plate_region(
+    plate: Optional[np.ndarray],
+    result: DetectionResult,
+    file_name: str,
+    cascade: OcrCascade,
+    executors: InferenceExecutors,
+    artifacts: DebugArtifactPort,
+) -> dict:
+    """preprocess_for_ocr -> OCR cascade -> normalize_hn_plate for one padded plate crop."""
+    x1, y1, w, h = result.box.x, result.box.y, result.box.w, result.box.h
+
+    thr, outcome = await _read_crop(plate, cascade, executors)
+    raw_text = outcome.raw_text
+    plate_text = outcome.plate_text
+    logger.debug("OCR variant=%s early_exit=%s raw_text=%r plate_text=%r",
+                 outcome.variant, outcome.early_exit, raw_text, plate_text)
+
+    # Debug capture en segundo plano (muestreado / solo fallos, no bloquea)
+    uid = uuid.uuid4().hex
+    artifacts.capture(
+        uid,
+        {"01_crop": plate, "02_processed": thr},
+        {"fileName": file_name, "rawText": raw_text, "plateText": plate_text},
+        failed=not plate_text,
+    )
 
     if not plate_text:
-        # Error handling from original code
-        print(f"ERROR: OCR failed to match pattern. Raw: {raw_text!r}")
+        # Resultado esperado (422 al cliente, contado en plate_pipeline_outcomes_total): no es un error del servicio
+        logger.info("OCR did not match the plate pattern. raw=%r", raw_text)
         raise HTTPException(status_code=422, detail=f"OCR did not match Honduras format (AAA####). raw={raw_text!r}")
 
     return {
-        "fileName": file.filename,
+        "fileName": file_name,
         "plateText": plate_text,
         "rawText": raw_text,
         "detConf": result.confidence,
+        "ocrConf": outcome.confidence,
+        "ocrVariant": outcome.variant,
         "bbox": {"x": x1, "y": y1, "w": w, "h": h}
     }
 
 
+@_counts_outcome
+async def _multi_plate_pipeline(
+    data: bytes,
+    file_name: str,
+    detector: PlateDetectorPort,
+    cascade: OcrCascade,
+    executors: InferenceExecutors,
+    artifacts: DebugArtifactPort,
+) -> dict:
+    """
+    decode -> detect_plates -> (crop -> preprocess -> OCR cascade) for every
+    plate concurrently. Per-plate failures are reported inline with their status
+    and counted in plate_multi_plate_outcomes_total; the request itself counts once.
+    """
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty file")
+
+    decoded = await executors.run("decode", image_utils.decode_for_detection, data, _detect_target())
+    if decoded is None:
+        raise HTTPException(status_code=400, detail="Could not decode image")
+
+    detections = await executors.run("detect", detector.detect_plates, decoded.image)
+    if not detections:
+        raise HTTPException(status_code=404, detail="No plate detected")
+    detections = [image_utils.map_detection(d, decoded) for d in detections[:settings.ocr_multi_max_plates]]
+    crops = await executors.run("decode", image_utils.detection_crops, data, decoded, [d.box for d in detections], 10, settings.crop_min_plate_height)
+    if len(crops) != len(detections):
+        raise HTTPException(status_code=400, detail="Could not decode image")
+
+    async def read(index: int, det: DetectionResult) -> dict:
+        try:
+            result = await _ocr_plate_region(crops[index], det, file_name, cascade, executors, artifacts)
+        except HTTPException as exc:
+            PLATE_READ_OUTCOMES.inc(str(exc.status_code))
+            b = det.box
+            return {
+                "index": index,
+                "status": exc.status_code,
+                "detail": exc.detail,
+                "detConf": det.confidence,
+                "bbox": {"x": b.x, "y": b.y, "w": b.w, "h": b.h},
+            }
+        PLATE_READ_OUTCOMES.inc("200")
+        return {"index": index, "status": 200, **result}
+
+    plates = await asyncio.gather(*(read(i, det) for i, det in enumerate(detections)))
+    return {"fileName": file_name, "count": len(plates), "plates": list(plates)}
+
+
+@router.post("/ocr", response_model=dict)
+async def ocr(
+    request: Request,
+    file: UploadFile = File(...),
+    multi: bool = Query(False, description="OCR every detected plate and return a list"),
+    detector: PlateDetectorPort = Depends(get_detector),
+    cascade: OcrCascade = Depends(get_plate_cascade),
+    executors: InferenceExecutors = Depends(get_executors),
+    artifacts: DebugArtifactPort = Depends(get_debug_artifacts),
+    cache: Optional[ResultCachePort] = Depends(get_result_cache),
+):
+    async with ingest_image(file) as upload:
+        cached = await lookup_result(request, cache, "/ocr", upload.data, upload.name,
+                                     str(multi), PLATE_CONFIG, PLATE_BLOCK_CONFIG, _model_stamp())
+        if cached.response is not None:
+            return cached.response
+        if multi:
+            result = await _multi_plate_pipeline(upload.data, upload.name, detector, cascade, executors, artifacts)
+        else:
+            result = await _plate_pipeline(upload.data, upload.name, detector, cascade, executors, artifacts)
+    return await store_result(cached, cache, result)
+
+
+_ZIP_CONTENT_TYPES = ("application/zip", "application/x-zip-compressed")
+_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+def _too_many_items() -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Too many images (max {settings.ocr_batch_max_items})")
+
+
+def _unpack_zip(data: bytes, max_items: int, max_bytes: int) -> List[Tuple[str, bytes]]:
+    """
+    Image members of a zip. Count and declared sizes (per member and total
+    uncompressed) are checked before reading any member; zipfile never
+    inflates a member past its declared size (CRC/size mismatch -> BadZipFile).
+    """
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            members = [
+                info for info in zf.infolist()
+                if not info.is_dir() and info.filename.lower().endswith(_IMAGE_EXTENSIONS)
+            ]
+            if len(members) > max_items:
+                raise _too_many_items()
+            # Tamaños declarados en el zip: se rechaza antes de descomprimir
+            for info in members:
+                if info.file_size > settings.max_upload_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Zip member too large: {info.filename!r} (max {settings.max_upload_bytes} bytes)",
+                    )
+            if sum(info.file_size for info in members) > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Batch too large once uncompressed (max {settings.max_batch_upload_bytes} bytes)",
+                )
+            return [(info.filename, zf.read(info)) for info in members]
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Invalid zip archive")
+
+
+async def _collect_batch_items(files: List[UploadFile]) -> List[Tuple[str, bytes]]:
+    """
+    Reads every image of the request (zips unpacked), enforcing
+    OCR_BATCH_MAX_ITEMS and MAX_BATCH_UPLOAD_BYTES over the whole request
+    (uncompressed) before reading past them.
+    """
+    items: List[Tuple[str, bytes]] = []
+    left_bytes = settings.max_batch_upload_bytes
+    for file in files:
+        left_items = settings.ocr_batch_max_items - len(items)
+        if left_items <= 0:
+            raise _too_many_items()
+        name = file.filename or ""
+        if file.content_type in _ZIP_CONTENT_TYPES or name.lower().endswith(".zip"):
+            data = await read_upload_bytes(file, settings.max_batch_upload_bytes)
+            unpacked = await run_in_threadpool(_unpack_zip, data, left_items, left_bytes)
+            del data
+            items.extend(unpacked)
+            left_bytes -= sum(len(d) for _, d in unpacked)
+        elif file.content_type in IMAGE_CONTENT_TYPES:
+            data = await read_upload_bytes(file, min(settings.max_upload_bytes, max(0, left_bytes)))
+            items.append((name, data))
+            left_bytes -= len(data)
+        else:
+            raise HTTPException(status_code=415, detail=f"Only JPG/PNG/WEBP or ZIP supported: {name!r}")
+
+    if not items:
+        raise HTTPException(status_code=400, detail="No images in request")
+    return items
+
+
+@router.post("/ocr/batch")
+async def ocr_batch(
+    files: List[UploadFile] = File(...),
+    detector: PlateDetectorPort = Depends(get_detector),
+    cascade: OcrCascade = Depends(get_plate_cascade),
+    executors: InferenceExecutors = Depends(get_executors),
+    artifacts: DebugArtifactPort = Depends(get_debug_artifacts),
+):
+    """
+    Runs the /ocr pipeline over many images (or a zip) concurrently and streams
+    one NDJSON line per image in completion order.
+    """
+    # Se leen todos los bytes antes de responder: los UploadFile se cierran al terminar el request
+    items = await _collect_batch_items(files)
+    semaphore = asyncio.Semaphore(max(1, settings.ocr_batch_concurrency))
+
+    async def process(index: int, name: str, data: bytes) -> dict:
+        async with semaphore:
+            try:
+                check_image_header(data)
+                result = await _plate_pipeline(data, name, detector, cascade, executors, artifacts)
+                return {"index": index, "status": 200, **result}
+            except HTTPException as exc:
+                return {"index": index, "fileName": name, "status": exc.status_code, "detail": exc.detail}
+            except Exception as exc:
+                # Un error inesperado en una imagen no corta el stream del resto
+                return {"index": index, "fileName": name, "status": 500, "detail": str(exc)}
+
+    async def stream():
+        tasks = [asyncio.create_task(process(i, name, data)) for i, (name, data) in enumerate(items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                line = await next_done
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+        finally:
+            # Cliente desconectado: no seguir gastando OCR
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+async def _read_plate_raw(
+    data: bytes,
+    detector: Optional[PlateDetectorPort],
+    cascade: OcrCascade,
+    executors: InferenceExecutors,
+) -> dict:
+    """
+    (decode -> detect -> crop) -> preprocess_for_ocr -> OCR cascade, returning
+    the raw reading. Without `detector` the image is already a plate crop.
+    """
+    det_conf = None
+    if detector is not None:
+        plate, result = await _detect_and_crop(data, detector, executors)
+        det_conf = result.confidence
+    else:
+        if not data:
+            raise HTTPException(status_code=400, detail="Empty file")
+        plate = await executors.run("decode", image_utils.decode_image, data)
+        if plate is None:
+            raise HTTPException(status_code=400, detail="Could not decode image")
+
+    _, outcome = await _read_crop(plate, cascade, executors)
+    return {"rawText": outcome.raw_text, "ocrConf": outcome.confidence, "ocrVariant": outcome.variant, "detConf": det_conf}
+
+
+@router.post("/ocr/consensus", response_model=dict)
+async def ocr_consensus(
+    files: List[UploadFile] = File(...),
+    crops: bool = Query(False, description="images are already plate crops (skip detection)"),
+    detector: PlateDetectorPort = Depends(get_detector),
+    cascade: OcrCascade = Depends(get_plate_cascade),
+    executors: InferenceExecutors = Depends(get_executors),
+):
+    """
+    Reads N images (or crops) of the same plate in parallel and combines the raw
+    OCR outputs with per-position character voting. Stops issuing reads once
+    the remaining images can no longer change any position.
+    """
+    if len(files) > settings.consensus_max_images:
+        raise HTTPException(status_code=413, detail=f"Too many images (max {settings.consensus_max_images})")
+    async with AsyncExitStack() as stack:
+        items = [(u.name, u.data) for u in [await stack.enter_async_context(ingest_image(f)) for f in files]]
+        return await _vote_plate(items, crops, detector, cascade, executors)
+
+
+async def _vote_plate(
+    items: List[Tuple[str, memoryview]],
+    crops: bool,
+    detector: PlateDetectorPort,
+    cascade: OcrCascade,
+    executors: InferenceExecutors,
+) -> dict:
+    voter = PlateVoter()
+    semaphore = asyncio.Semaphore(max(1, settings.consensus_concurrency))
+    reads: List[dict] = []
+
+    async def read(index: int, name: str, data: memoryview) -> dict:
+        async with semaphore:
+            try:
+                result = await _read_plate_raw(data, None if crops else detector, cascade, executors)
+                return {"index": index, "fileName": name, "status": 200, **result}
+            except HTTPException as exc:
+                return {"index": index, "fileName": name, "status": exc.status_code, "detail": exc.detail}
+
+    tasks = [asyncio.create_task(read(i, name, data)) for i, (name, data) in enumerate(items)]
+    remaining = len(tasks)
+    early_stop = False
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            line = await next_done
+            remaining -= 1
+            if line["status"] == 200:
+                line["aligned"] = voter.add(line["rawText"], line["ocrConf"])
+            reads.append(line)
+            if remaining and voter.decided(remaining):
+                early_stop = True
+                break
+    finally:
+        # Las lecturas que aún esperan el semáforo no llegan a gastar OCR; se esperan
+        # antes de salir para que ninguna siga usando los buffers de ingesta
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    consensus = voter.result()
+    if consensus is None:
+        raise HTTPException(
+            status_code=422,
+            detail={"message": "No reading could be aligned to the AAA#### format", "reads": reads},
+        )
+    return {
+        **consensus,
+        "imagesReceived": len(items),
+        "readsUsed": len(reads),
+        "votingReads": voter.readings,
+        "earlyStop": early_stop,
+        "reads": sorted(reads, key=lambda r: r["index"]),
+    }
+
+
+_VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+
+
+def _spool_upload(src, suffix: str, max_bytes: int) -> str:
+    """Copies the upload to a temp file (VideoCapture needs a path) enforcing `max_bytes`."""
+    fd, path = tempfile.mkstemp(prefix="video-", suffix=suffix)
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as dst:
+            while True:
+                chunk = src.read(1 << 20)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"Video too large (max {max_bytes} bytes)")
+                dst.write(chunk)
+        if not written:
+            raise HTTPException(status_code=400, detail="Empty file")
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+@router.post("/video/scan", response_model=dict)
+async def scan_video(
+    file: UploadFile = File(...),
+    detector: PlateDetectorPort = Depends(get_detector),
+    cascade: OcrCascade = Depends(get_plate_cascade),
+    executors: InferenceExecutors = Depends(get_executors),
+):
+    """
+    Scans a recorded video (MP4/AVI/MOV/MKV/WEBM) with adaptive frame sampling
+    and returns one deduplicated plate event per vehicle with timestamps.
+    """
+    ext = os.path.splitext(file.filename or "")[1].lower()
+    if not ((file.content_type or "").startswith("video/") or ext in _VIDEO_EXTENSIONS):
+        raise HTTPException(status_code=415, detail="Only MP4/AVI/MOV/MKV/WEBM video supported")
+
+    path = await run_in_threadpool(_spool_upload, file.file, ext or ".mp4", settings.video_max_bytes)
+    try:
+        try:
+            source = await run_in_threadpool(OpenCvVideoSource, path)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Could not open video")
+        try:
+            result = await VideoPlateScanner(detector, cascade, executors, settings).scan(source)
+        finally:
+            source.close()
+    finally:
+        os.remove(path)
+
+    return {"fileName": file.filename, **result}
+
+
 @router.post("/extract-info", response_model=dict)
 async def extract_info(
+    request: Request,
     file: UploadFile = File(...),
     ocr_service: OcrPort = Depends(get_doc_ocr),
+    executors: InferenceExecutors = Depends(get_executors),
+    cache: Optional[ResultCachePort] = Depends(get_result_cache),
 ):
-    if file.content_type not in ("image/jpeg", "image/png", "image/webp"):
-        raise HTTPException(status_code=415, detail="Only JPG/PNG/WEBP supported")
-
-    data = await file.read()
-    if not data:
-        raise HTTPException(status_code=400, detail="Empty file")
-
-    img_array = np.frombuffer(data, np.uint8)
-    img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+    async with ingest_image(file) as upload:
+        cached = await lookup_result(request, cache, "/extract-info", upload.data, upload.name, DOCUMENT_CONFIG)
+        if cached.response is not None:
+            return cached.response
+        img = await executors.run("decode", image_utils.decode_image, upload.data)
     if img is None:
         raise HTTPException(status_code=400, detail="Could not decode image")
 
-    # OCR on RGB image
-    rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    raw_text = ocr_service.extract_text(rgb).strip()
+    # OCR sobre el gris normalizado (sin umbral): escala por alto de texto y tope de megapíxeles
+    doc = await executors.run("preprocess", default_document_normalizer(binarize=False), img)
+    del img
+    raw_text = (await executors.run("ocr", ocr_service.extract_text, doc.image)).strip()
     if not raw_text:
         raise HTTPException(status_code=422, detail="OCR returned empty text")
 
     payload = services.parse_dispatch_info(raw_text)
 
-    return {
+    return await store_result(cached, cache, {
         "fileName": file.filename,
         "rawText": raw_text,
         "payload": payload,
-    }
+        "normalize": doc.info(),
+    })
+
+
+def _layout_reader(profile: DocumentProfile, executors: InferenceExecutors) -> IdentityLayoutReader:
+    return IdentityLayoutReader(
+        get_doc_layout_ocr(),
+        get_id_digits_ocr(),
+        get_id_name_ocr(),
+        executors,
+        profile.first_name_labels,
+        profile.last_name_labels,
+        identity_digits=profile.identity_digits,
+        max_side=settings.id_layout_max_side,
+        text_height=settings.id_roi_text_height,
+    )
 
 
-def _validate_image_upload(file: UploadFile):
-    if file.content_type not in ("image/jpeg", "image/png", "image/webp"):
-        raise HTTPException(status_code=415, detail="Only JPG/PNG/WEBP supported")
+async def _layout_identity(img: np.ndarray, extractor: InfoExtractorPort,
+                           reader: IdentityLayoutReader) -> Optional[Tuple[str, dict]]:
+    """OCR por regiones; None si no ubicó regiones o no salió la identidad (se usa el OCR completo)."""
+    result = await reader.read(img)
+    if result is None:
+        return None
+    payload = extractor.extract(result["text"])
+    if not payload.get("identity"):
+        return None
+    h, w = img.shape[:2]
+    payload["layout"] = {
+        "regions": result["regions"],
+        "ocrPixels": result["ocrPixels"],
+        # Cota del modo completo: escala máxima del normalizador (sin estimar el alto de texto)
+        "fullOcrPixels": int(h * w * default_document_normalizer().scale_for(h, w) ** 2),
+    }
+    return result["layoutText"], payload
 
 
 async def _process_identity_document(
+    request: Request,
+    endpoint: str,
     file: UploadFile,
     ocr_service: OcrPort,
     extractor: InfoExtractorPort,
+    executors: InferenceExecutors,
+    cache: Optional[ResultCachePort],
+    profile: DocumentProfile,
+    layout: Optional[bool] = None,
 ):
-    _validate_image_upload(file)
-    data = await file.read()
-    if not data:
-        raise HTTPException(status_code=400, detail="Empty file")
-
-    img_array = np.frombuffer(data, np.uint8)
-    img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+    use_layout = settings.id_layout_ocr if layout is None else layout
+    async with ingest_image(file) as upload:
+        cached = await lookup_result(request, cache, endpoint, upload.data, upload.name, repr(profile), str(use_layout),
+                                     DOCUMENT_CONFIG, DOCUMENT_LAYOUT_CONFIG, ID_DIGITS_CONFIG, ID_NAME_CONFIG)
+        if cached.response is not None:
+            return cached.response
+        img = await executors.run("decode", image_utils.decode_image, upload.data)
     if img is None:
         raise HTTPException(status_code=400, detail="Could not decode image")
 
-    try:
-        doc = image_utils.preprocess_document_for_ocr(img)
-    except ValueError as exc:
-        raise HTTPException(status_code=500, detail=str(exc))
+    layout_result = None
+    if use_layout:
+        layout_result = await _layout_identity(img, extractor, _layout_reader(profile, executors))
 
-    ocr_text = ocr_service.extract_text(doc).strip()
-    if not ocr_text:
-        # Fallback: intenta sin preprocesado
-        ocr_text = ocr_service.extract_text(cv2.cvtColor(img, cv2.COLOR_BGR2RGB)).strip()
+    normalize = None
+    if layout_result is not None:
+        ocr_text, payload = layout_result
+    else:
+        try:
+            doc = await executors.run("preprocess", default_document_normalizer(), img)
+        except ValueError as exc:
+            raise HTTPException(status_code=500, detail=str(exc))
+        del img
+        normalize = doc.info()
+
+        ocr_text = (await executors.run("ocr", ocr_service.extract_text, doc.image)).strip()
         if not ocr_text:
-            raise HTTPException(status_code=422, detail="OCR returned empty text")
+            # Fallback: intenta sin umbral (gris escalado, ya acotado en megapíxeles)
+            ocr_text = (await executors.run("ocr", ocr_service.extract_text, doc.gray)).strip()
+            if not ocr_text:
+                raise HTTPException(status_code=422, detail="OCR returned empty text")
 
-    payload = extractor.extract(ocr_text)
-    return {
+        payload = extractor.extract(ocr_text)
+    return await store_result(cached, cache, {
         "fileName": file.filename,
         "ocr_text": ocr_text,
         "identity": payload.get("identity"),
         "identityFormatted": payload.get("identityFormatted"),
         "full_name": payload.get("full_name"),
         "payload": payload,
-    }
+        "normalize": normalize,
+    })
 
 
 @router.post("/dni/extract", response_model=dict)
 async def extract_dni(
+    request: Request,
     file: UploadFile = File(...),
+    layout: Optional[bool] = Query(None, description="OCR por regiones (identidad y nombres); por defecto ID_LAYOUT_OCR"),
     ocr_service: OcrPort = Depends(get_doc_ocr),
     extractor: InfoExtractorPort = Depends(get_id_extractor),
+    executors: InferenceExecutors = Depends(get_executors),
+    cache: Optional[ResultCachePort] = Depends(get_result_cache),
 ):
-    return await _process_identity_document(file, ocr_service, extractor)
+    return await _process_identity_document(request, "/dni/extract", file, ocr_service, extractor, executors, cache,
+                                            DNI_PROFILE, layout)
 
 
 @router.post("/license/extract", response_model=dict)
 async def extract_license(
+    request: Request,
     file: UploadFile = File(...),
+    layout: Optional[bool] = Query(None, description="OCR por regiones (identidad y nombres); por defecto ID_LAYOUT_OCR"),
     ocr_service: OcrPort = Depends(get_doc_ocr),
-    extractor: InfoExtractorPort = Depends(get_id_extractor),
+    extractor: InfoExtractorPort = Depends(get_license_extractor),
+    executors: InferenceExecutors = Depends(get_executors),
+    cache: Optional[ResultCachePort] = Depends(get_result_cache),
 ):
-    return await _process_identity_document(file, ocr_service, extractor)
+    return await _process_identity_document(request, "/license/extract", file, ocr_service, extractor, executors, cache,
+                                            LICENSE_PROFILE, layout)
+
 
 
+@router.get("/debug/batching")
+def batching_stats(detector: PlateDetectorPort = Depends(get_detector)):
+    """Micro-batching configuration and batch-size histogram of the detector"""
+    if isinstance(detector, BatchingDetector):
+        return detector.stats()
+    return {"enabled": False, "maxBatchSize": 1, "maxWaitMs": 0.0}
+
+
+@router.get("/debug/ingestion")
+def ingestion_stats():
+    """Upload limits and pooled buffer usage"""
+    return {
+        "maxUploadBytes": settings.max_upload_bytes,
+        "maxImagePixels": settings.max_image_pixels,
+        "pool": buffer_pool.stats(),
+    }
+
+
+@router.get("/debug/cache")
+def result_cache_stats(cache: Optional[ResultCachePort] = Depends(get_result_cache)):
+    """Result cache occupancy and hit/miss counters"""
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
 
 @router.get("/debug/test")
 def test_debug():
@@ -255,17 +869,35 @@ def test_debug():
     return {"status": "ok", "message": "Debug endpoints are working"}
 
 
-@router.get("/debug/images")
-def list_debug_images():
-    """List all debug images saved in /tmp/debug_plates/"""
-    debug_dir = "/tmp/debug_plates"
+@router.get("/debug/stats")
+def debug_stats(artifacts: DebugArtifactPort = Depends(get_debug_artifacts)):
+    """Debug capture counters (captured, dropped, evicted) and retention limits"""
+    return artifacts.stats()
+
+
+def _epoch(dt: Optional[datetime]) -> Optional[float]:
+    return dt.timestamp() if dt is not None else None
+
+
+def _query_debug_index(index, limit, cursor, outcome, since, until):
     try:
-        if not os.path.exists(debug_dir):
-            return {"files": [], "message": "Debug directory does not exist yet"}
-        files = sorted(os.listdir(debug_dir))
-        return {"files": files, "count": len(files), "directory": debug_dir}
-    except Exception as e:
-        return {"error": str(e), "files": []}
+        return index.list(limit=limit, cursor=cursor, outcome=outcome, since=_epoch(since), until=_epoch(until))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/debug/images")
+def list_debug_images(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    outcome: Optional[str] = Query(None, pattern="^(success|failure)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    index: SqliteArtifactIndex = Depends(get_debug_index),
+):
+    """List indexed debug artifacts, most recent first (cursor pagination)"""
+    items, next_cursor = _query_debug_index(index, limit, cursor, outcome, since, until)
+    return {"items": items, "count": len(items), "nextCursor": next_cursor, "directory": settings.debug_dir}
 
 
 @router.get("/debug/images/{filename}")
@@ -273,7 +905,7 @@ def get_debug_image(filename: str):
     """Download a specific debug image"""
     # Sanitize filename to prevent directory traversal
     filename = os.path.basename(filename)
-    file_path = f"/tmp/debug_plates/{filename}"
+    file_path = os.path.join(settings.debug_dir, filename)
     
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail=f"File not found: {filename}")
@@ -283,26 +915,16 @@ def get_debug_image(filename: str):
 
 
 @router.get("/debug/viewer", response_class=HTMLResponse)
-def debug_viewer():
-    """HTML page to view all debug images"""
-    debug_dir = "/tmp/debug_plates"
-    
-    if not os.path.exists(debug_dir):
-        files = []
-    else:
-        files = sorted(os.listdir(debug_dir), reverse=True)  # Most recent first
-    
-    # Group files by UID (first 8 chars before _)
-    groups = {}
-    for f in files:
-        if '_' in f:
-            uid = f.split('_')[0]
-            if uid not in groups:
-                groups[uid] = {}
-            if '_01_crop' in f:
-                groups[uid]['crop'] = f
-            elif '_02_processed' in f:
-                groups[uid]['processed'] = f
+def debug_viewer(
+    limit: int = Query(20, ge=1, le=200),
+    cursor: Optional[str] = None,
+    outcome: Optional[str] = Query(None, pattern="^(success|failure)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    index: SqliteArtifactIndex = Depends(get_debug_index),
+):
+    """HTML page to view debug images, one page at a time"""
+    items, next_cursor = _query_debug_index(index, limit, cursor, outcome, since, until)
     
     html = """
     <!DOCTYPE html>
@@ -320,6 +942,8 @@ def debug_viewer():
                 box-shadow: 0 2px 4px rgba(0,0,0,0.1);
             }
             .image-group h3 { margin-top: 0; color: #666; }
+            .meta { color: #555; margin-bottom: 10px; }
+            .failure { color: #b00; }
             .images { display: flex; gap: 20px; flex-wrap: wrap; }
             .image-container { flex: 1; min-width: 300px; }
             .image-container h4 { margin: 10px 0; color: #444; }
@@ -330,36 +954,55 @@ def debug_viewer():
                 background: #000;
             }
             .no-images { color: #999; font-style: italic; }
+            .pager a { font-size: 1.1em; }
         </style>
     </head>
     <body>
         <h1>🔍 Debug Images Viewer</h1>
-        <p>Showing processed images from most recent to oldest</p>
+        <p>Showing processed images from most recent to oldest
+        (<a href="/debug/viewer">all</a> · <a href="/debug/viewer?outcome=failure">failures</a> · <a href="/debug/viewer?outcome=success">successes</a>)</p>
     """
     
-    if not groups:
+    if not items:
         html += '<p class="no-images">No debug images found. Process an image first.</p>'
     else:
-        for uid, imgs in groups.items():
-            html += f'<div class="image-group"><h3>Image ID: {uid}</h3><div class="images">'
+        for item in items:
+            created = datetime.fromtimestamp(item["createdAt"]).isoformat(timespec="seconds")
+            html += f'<div class="image-group"><h3>Image ID: {escape(item["uid"])}</h3>'
+            html += (
+                f'<div class="meta {escape(item["outcome"])}">{created} · {escape(item["outcome"])} · '
+                f'file={escape(item["fileName"])} · raw={escape(repr(item["rawText"]))} · '
+                f'plate={escape(repr(item["plateText"]))}</div><div class="images">'
+            )
             
-            if 'crop' in imgs:
+            files = item["files"]
+            if '01_crop' in files:
                 html += f'''
                 <div class="image-container">
                     <h4>1. Cropped Plate (after deskew)</h4>
-                    <img src="/debug/images/{imgs['crop']}" alt="Crop">
+                    <img src="/debug/images/{escape(files['01_crop'])}" alt="Crop" loading="lazy">
                 </div>
                 '''
             
-            if 'processed' in imgs:
+            if '02_processed' in files:
                 html += f'''
                 <div class="image-container">
                     <h4>2. Processed (sent to Tesseract)</h4>
-                    <img src="/debug/images/{imgs['processed']}" alt="Processed">
+                    <img src="/debug/images/{escape(files['02_processed'])}" alt="Processed" loading="lazy">
                 </div>
                 '''
             
             html += '</div></div>'
+
+    if next_cursor:
+        params = {"limit": limit, "cursor": next_cursor}
+        if outcome:
+            params["outcome"] = outcome
+        if since:
+            params["since"] = since.isoformat()
+        if until:
+            params["until"] = until.isoformat()
+        html += f'<p class="pager"><a href="/debug/viewer?{escape(urlencode(params))}">Older →</a></p>'
     
     html += """
     </body>
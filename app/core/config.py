@@ -5,5 +5,113 @@ class Settings(BaseModel):
     model_path: str = os.getenv("MODEL_PATH", "models/plate-detector.pt")
     conf: float = float(os.getenv("CONF", "0.25"))
     img_size: int = int(os.getenv("IMG_SIZE", "640"))
+    iou: float = float(os.getenv("IOU", "0.7"))
+
+    # Ingesta de uploads: tope de bytes, de píxeles (leídos del header, antes de decodificar) y pool de buffers
+    max_upload_bytes: int = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+    max_image_pixels: int = int(os.getenv("MAX_IMAGE_PIXELS", str(50_000_000)))
+    upload_pool_buffers: int = int(os.getenv("UPLOAD_POOL_BUFFERS", "16"))
+    upload_pool_max_bytes: int = int(os.getenv("UPLOAD_POOL_MAX_BYTES", str(8 * 1024 * 1024)))
+    max_batch_upload_bytes: int = int(os.getenv("MAX_BATCH_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+
+    # Decodificación reducida (IMREAD_REDUCED_COLOR_2/4/8) para detectar
+    detect_reduced_decode: bool = os.getenv("DETECT_REDUCED_DECODE", "1") not in ("0", "false", "False")
+    # Alto mínimo (px) de la placa para recortarla de la imagen reducida sin volver a decodificar; 0 = siempre resolución completa
+    crop_min_plate_height: int = int(os.getenv("CROP_MIN_PLATE_HEIGHT", "96"))
+
+    # Backend del detector: "yolo" (ultralytics/PyTorch) | "onnx" (ONNX Runtime CPU)
+    detector_backend: str = os.getenv("DETECTOR_BACKEND", "yolo")
+    onnx_model_path: str = os.getenv("ONNX_MODEL_PATH", "models/plate-detector.onnx")
+    onnx_threads: int = int(os.getenv("ONNX_THREADS", "0"))  # 0 = default de ONNX Runtime
+
+    # Warmup de modelos al arrancar (/ready en 503 hasta terminar)
+    warmup: bool = os.getenv("WARMUP", "1") not in ("0", "false", "False")
+
+    # Inference executors per pipeline stage ("thread" | "process")
+    decode_executor: str = os.getenv("DECODE_EXECUTOR", "thread")
+    decode_workers: int = int(os.getenv("DECODE_WORKERS", "4"))
+    detect_executor: str = os.getenv("DETECT_EXECUTOR", "thread")
+    detect_workers: int = int(os.getenv("DETECT_WORKERS", "2"))
+    preprocess_executor: str = os.getenv("PREPROCESS_EXECUTOR", "thread")
+    preprocess_workers: int = int(os.getenv("PREPROCESS_WORKERS", "4"))
+    ocr_executor: str = os.getenv("OCR_EXECUTOR", "thread")
+    ocr_workers: int = int(os.getenv("OCR_WORKERS", "4"))
+
+    # Micro-batching del detector (1 = desactivado)
+    detect_batch_size: int = int(os.getenv("DETECT_BATCH_SIZE", "1"))
+    detect_batch_wait_ms: float = float(os.getenv("DETECT_BATCH_WAIT_MS", "5"))
+
+    # Motor OCR: "pytesseract" (subproceso por llamada) | "tesserocr" (motores persistentes in-process)
+    ocr_engine: str = os.getenv("OCR_ENGINE", "pytesseract")
+    ocr_pool_size: int = int(os.getenv("OCR_POOL_SIZE", "4"))
+    tessdata_prefix: str = os.getenv("TESSDATA_PREFIX", "")
+
+    # Cascada OCR de placas: variantes "fuente:motor" en orden de prioridad, presupuesto en ms (0 = sin límite)
+    ocr_cascade_variants: str = os.getenv("OCR_CASCADE_VARIANTS", "binary:psm7,binary:psm6,gray:psm7,gray:psm6")
+    ocr_cascade_budget_ms: float = float(os.getenv("OCR_CASCADE_BUDGET_MS", "3000"))
+    ocr_cascade_min_conf: float = float(os.getenv("OCR_CASCADE_MIN_CONF", "0"))
+    # Variantes en vuelo a la vez (1 = en orden, una sola corrida de Tesseract si la primera ya cumple)
+    ocr_cascade_parallel: int = int(os.getenv("OCR_CASCADE_PARALLEL", "1"))
+
+    # Artefactos de diagnóstico: "all" (muestreado) | "failures" | "off"
+    debug_dir: str = os.getenv("DEBUG_DIR", "/tmp/debug_plates")
+    debug_capture: str = os.getenv("DEBUG_CAPTURE", "failures")
+    debug_sample_rate: float = float(os.getenv("DEBUG_SAMPLE_RATE", "0.05"))
+    debug_queue_size: int = int(os.getenv("DEBUG_QUEUE_SIZE", "64"))
+    debug_max_files: int = int(os.getenv("DEBUG_MAX_FILES", "2000"))
+    debug_max_bytes: int = int(os.getenv("DEBUG_MAX_BYTES", str(200 * 1024 * 1024)))
+    debug_index_path: str = os.getenv("DEBUG_INDEX_PATH", "/tmp/debug_plates.sqlite3")
+
+    # Preprocesado de placas: altura de carácter objetivo tras reescalar (0 = 5x fijo) y tope de upscale
+    preprocess_target_char_height: int = int(os.getenv("PREPROCESS_TARGET_CHAR_HEIGHT", "64"))
+    preprocess_max_upscale: float = float(os.getenv("PREPROCESS_MAX_UPSCALE", "5"))
+    # Deskew: el ángulo se estima sobre una miniatura de esta altura (0 = resolución completa)
+    deskew_thumb_height: int = int(os.getenv("DESKEW_THUMB_HEIGHT", "64"))
+
+    # Documentos (DNI/licencia/hojas de despacho): alto de carácter objetivo (0 = 2x fijo), upscale máximo,
+    # tope de megapíxeles de la salida y hasta cuántos MP se usa filtro bilateral (encima, mediana 3x3)
+    doc_target_text_height: float = float(os.getenv("DOC_TARGET_TEXT_HEIGHT", "32"))
+    doc_max_upscale: float = float(os.getenv("DOC_MAX_UPSCALE", "2"))
+    doc_max_megapixels: float = float(os.getenv("DOC_MAX_MEGAPIXELS", "8"))
+    doc_bilateral_max_megapixels: float = float(os.getenv("DOC_BILATERAL_MAX_MEGAPIXELS", "4"))
+
+    # DNI/licencia: OCR por regiones (pase de layout + identidad/nombres), lado máximo del pase y alto de línea de las regiones
+    id_layout_ocr: bool = os.getenv("ID_LAYOUT_OCR", "0") not in ("0", "false", "False")
+    id_layout_max_side: int = int(os.getenv("ID_LAYOUT_MAX_SIDE", "1200"))
+    id_roi_text_height: int = int(os.getenv("ID_ROI_TEXT_HEIGHT", "40"))
+
+    # Caché de resultados por contenido (/ocr, /extract-info, /dni/extract, /license/extract): 0 entradas = desactivada.
+    # RESULT_CACHE_PATH activa el nivel en disco (SQLite); cambiar el namespace invalida todo lo guardado
+    result_cache_entries: int = int(os.getenv("RESULT_CACHE_ENTRIES", "1024"))
+    result_cache_max_bytes: int = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    result_cache_ttl_s: float = float(os.getenv("RESULT_CACHE_TTL_S", "3600"))
+    result_cache_path: str = os.getenv("RESULT_CACHE_PATH", "")
+    result_cache_disk_entries: int = int(os.getenv("RESULT_CACHE_DISK_ENTRIES", "100000"))
+    result_cache_namespace: str = os.getenv("RESULT_CACHE_NAMESPACE", "")
+
+    # POST /ocr/batch
+    ocr_batch_concurrency: int = int(os.getenv("OCR_BATCH_CONCURRENCY", "8"))
+    ocr_batch_max_items: int = int(os.getenv("OCR_BATCH_MAX_ITEMS", "500"))
+
+    # POST /ocr?multi=true: máximo de placas por frame
+    ocr_multi_max_plates: int = int(os.getenv("OCR_MULTI_MAX_PLATES", "8"))
+
+    # POST /ocr/consensus: lecturas en paralelo y tope de imágenes por request
+    consensus_concurrency: int = int(os.getenv("CONSENSUS_CONCURRENCY", "3"))
+    consensus_max_images: int = int(os.getenv("CONSENSUS_MAX_IMAGES", "16"))
+
+    # Video (POST /video/scan y app.video_cli): muestreo adaptativo y deduplicación por vehículo
+    video_idle_sample_ms: float = float(os.getenv("VIDEO_IDLE_SAMPLE_MS", "500"))
+    video_active_sample_ms: float = float(os.getenv("VIDEO_ACTIVE_SAMPLE_MS", "100"))
+    video_active_hold_ms: float = float(os.getenv("VIDEO_ACTIVE_HOLD_MS", "1500"))
+    video_motion_threshold: float = float(os.getenv("VIDEO_MOTION_THRESHOLD", "1"))  # % de píxeles; 0 = detectar siempre
+    video_max_skip_ms: float = float(os.getenv("VIDEO_MAX_SKIP_MS", "2000"))
+    video_track_gap_ms: float = float(os.getenv("VIDEO_TRACK_GAP_MS", "1500"))
+    video_track_iou: float = float(os.getenv("VIDEO_TRACK_IOU", "0.1"))
+    video_ocr_improve_margin: float = float(os.getenv("VIDEO_OCR_IMPROVE_MARGIN", "0.05"))
+    video_max_ocr_per_track: int = int(os.getenv("VIDEO_MAX_OCR_PER_TRACK", "4"))
+    video_min_track_frames: int = int(os.getenv("VIDEO_MIN_TRACK_FRAMES", "2"))
+    video_ocr_concurrency: int = int(os.getenv("VIDEO_OCR_CONCURRENCY", "4"))
+    video_max_bytes: int = int(os.getenv("VIDEO_MAX_BYTES", str(500 * 1024 * 1024)))
 
 settings = Settings()
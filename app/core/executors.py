@@ -0,0 +1,91 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Tuple, TypeVar
+
+from app.core.config import Settings
+from app.core.metrics import STAGE_SECONDS, EXECUTOR_QUEUE_SECONDS, STAGE_INFLIGHT
+
+T = TypeVar("T")
+
+# Pipeline stages that may block the event loop
+STAGES = ("decode", "detect", "preprocess", "ocr")
+
+
+def _timed_call(stage: str, submitted: float, fn: Callable[..., T], *args) -> T:
+    started = time.perf_counter()
+    EXECUTOR_QUEUE_SECONDS.observe(stage, value=started - submitted)
+    try:
+        return fn(*args)
+    finally:
+        STAGE_SECONDS.observe(stage, value=time.perf_counter() - started)
+
+
+class InferenceExecutors:
+    """
+    Bounded executors (one per pipeline stage) used to run CPU/blocking work
+    off the event loop.
+
+    Each stage can be backed by a thread pool or a process pool. Process pools
+    only make sense for picklable, module-level callables (decode, preprocess);
+    adapter methods (detect, ocr) should stay on threads since the adapter
+    would be pickled on every call.
+    """
+    def __init__(self, stage_specs: Dict[str, Tuple[str, int]]):
+        self._specs = dict(stage_specs)
+        self._pools: Dict[str, Executor] = {}
+        for stage, (kind, workers) in self._specs.items():
+            self._pools[stage] = self._build_pool(stage, kind, workers)
+
+    @classmethod
+    def from_settings(cls, cfg: Settings) -> "InferenceExecutors":
+        return cls({
+            "decode": (cfg.decode_executor, cfg.decode_workers),
+            # With micro-batching each pending image holds a detect worker
+            "detect": (cfg.detect_executor, max(cfg.detect_workers, cfg.detect_batch_size)),
+            "preprocess": (cfg.preprocess_executor, cfg.preprocess_workers),
+            "ocr": (cfg.ocr_executor, cfg.ocr_workers),
+        })
+
+    @staticmethod
+    def _build_pool(stage: str, kind: str, workers: int) -> Executor:
+        workers = max(1, int(workers))
+        if kind == "process":
+            return ProcessPoolExecutor(max_workers=workers)
+        if kind == "thread":
+            return ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{stage}-")
+        raise ValueError(f"Unknown executor kind for stage {stage!r}: {kind!r}")
+
+    def pool(self, stage: str) -> Executor:
+        try:
+            return self._pools[stage]
+        except KeyError:
+            raise ValueError(f"Unknown pipeline stage: {stage!r}") from None
+
+    async def run(self, stage: str, fn: Callable[..., T], *args, **kwargs) -> T:
+        loop = asyncio.get_running_loop()
+        pool = self.pool(stage)
+        if kwargs:
+            fn = functools.partial(fn, **kwargs)
+
+        submitted = time.perf_counter()
+        STAGE_INFLIGHT.inc(stage)
+        try:
+            if isinstance(pool, ProcessPoolExecutor):
+                # Los memoryview (buffers del pool de ingesta) no se pueden picklear
+                args = tuple(bytes(a) if isinstance(a, memoryview) else a for a in args)
+                # En otro proceso solo se puede medir desde aquí (incluye IPC y cola)
+                result = await loop.run_in_executor(pool, fn, *args)
+                STAGE_SECONDS.observe(stage, value=time.perf_counter() - submitted)
+                return result
+            return await loop.run_in_executor(pool, _timed_call, stage, submitted, fn, *args)
+        finally:
+            STAGE_INFLIGHT.dec(stage)
+
+    def describe(self) -> dict:
+        return {stage: {"kind": kind, "workers": workers} for stage, (kind, workers) in self._specs.items()}
+
+    def shutdown(self, wait: bool = True):
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
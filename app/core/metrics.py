@@ -0,0 +1,221 @@
+import bisect
+import functools
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Buckets de latencia (segundos): de 1 ms a 30 s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Tuple[str, ...]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return tuple(str(v) for v in labels)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], list] = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, *labels: str, value: float):
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[idx] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = self.header()
+        for key, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), series[:-2]):
+                cumulative += n
+                le = 'le="%s"' % _fmt(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {series[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+STAGE_SECONDS = registry.register(Histogram(
+    "plate_stage_seconds", "Latency of each pipeline stage (decode, detect, deskew, preprocess, ocr).", ("stage",)))
+EXECUTOR_QUEUE_SECONDS = registry.register(Histogram(
+    "plate_executor_queue_seconds", "Time spent waiting for a free executor worker.", ("stage",)))
+STAGE_INFLIGHT = registry.register(Gauge(
+    "plate_stage_inflight", "Calls submitted to a stage executor and not finished yet.", ("stage",)))
+PORT_CALL_SECONDS = registry.register(Histogram(
+    "plate_port_call_seconds", "Latency of port calls by adapter and method.", ("port", "adapter", "method")))
+PORT_CALL_ERRORS = registry.register(Counter(
+    "plate_port_call_errors_total", "Port calls that raised.", ("port", "adapter", "method")))
+OCR_VARIANT_RUNS = registry.register(Counter(
+    "plate_ocr_variant_runs_total", "OCR cascade variants that completed.", ("variant",)))
+OCR_VARIANT_WINS = registry.register(Counter(
+    "plate_ocr_variant_wins_total", "OCR cascade variant whose reading was returned.", ("variant",)))
+OCR_CASCADE_EARLY_EXITS = registry.register(Counter(
+    "plate_ocr_cascade_early_exits_total", "Cascades that returned before every variant finished."))
+PIPELINE_OUTCOMES = registry.register(Counter(
+    "plate_pipeline_outcomes_total", "Plate pipeline results per request by HTTP status (200, 404, 422, ...).", ("status",)))
+PLATE_READ_OUTCOMES = registry.register(Counter(
+    "plate_multi_plate_outcomes_total", "Per-plate results of multi-plate requests by status (200, 422, 500).", ("status",)))
+PREPROCESS_STEP_SECONDS = registry.register(Histogram(
+    "plate_preprocess_step_seconds", "Latency of each plate preprocessing step (resize, clahe, threshold, ...).", ("step",),
+    buckets=(0.0001, 0.00025, 0.0005) + LATENCY_BUCKETS[:8]))
+DOC_NORMALIZE_PEAK_BYTES = registry.register(Histogram(
+    "document_normalize_peak_bytes", "Peak bytes of the arrays alive at once while normalizing a document for OCR.",
+    buckets=tuple(float(2 ** n * 1024 * 1024) for n in range(0, 10))))
+RESULT_CACHE_LOOKUPS = registry.register(Counter(
+    "plate_result_cache_lookups_total", "Result cache lookups by endpoint and outcome (hit, miss, not_modified).",
+    ("endpoint", "outcome")))
+REQUESTS_TOTAL = registry.register(Counter(
+    "plate_http_requests_total", "HTTP requests by route and status.", ("route", "status")))
+REQUESTS_INFLIGHT = registry.register(Gauge(
+    "plate_http_requests_inflight", "HTTP requests being served."))
+REQUEST_SECONDS = registry.register(Histogram(
+    "plate_http_request_seconds", "HTTP request latency by route.", ("route",)))
+DETECT_BATCH_SIZE = registry.register(Histogram(
+    "plate_detect_batch_size", "Images per batched detector call.", buckets=(1, 2, 4, 8, 16, 32, 64)))
+
+
+def timed(stage: str) -> Callable:
+    """Decorator: records the wrapped function's latency under `plate_stage_seconds{stage}`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                STAGE_SECONDS.observe(stage, value=time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+class InstrumentedPort:
+    """
+    Transparent proxy around any port adapter: public methods are timed into
+    `plate_port_call_seconds{port,adapter,method}`; everything else is delegated.
+    """
+    def __init__(self, inner, port: str):
+        self._inner = inner
+        self._port = port
+        self._adapter = type(inner).__name__
+        self._wrapped: Dict[str, Callable] = {}
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._inner, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        cached = self._wrapped.get(name)
+        if cached is not None:
+            return cached
+
+        port, adapter = self._port, self._adapter
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            except Exception:
+                PORT_CALL_ERRORS.inc(port, adapter, name)
+                raise
+            finally:
+                PORT_CALL_SECONDS.observe(port, adapter, name, value=time.perf_counter() - started)
+
+        self._wrapped[name] = call
+        return call
+
+
+def instrument(adapter, port: str):
+    return InstrumentedPort(adapter, port)
@@ -0,0 +1,64 @@
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Readiness:
+    """
+    Estado de arranque del servicio: tiempos de carga/warmup por componente y
+    si ya puede recibir tráfico.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._components: Dict[str, dict] = {}
+        self._ready = False
+        self._started_at = time.time()
+        self._ready_at: Optional[float] = None
+
+    def load(self, name: str, fn: Callable[[], T]) -> T:
+        """Runs `fn`, recording its duration (and error, re-raised) under `name`."""
+        started = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as exc:
+            self._record(name, started, ok=False, error=f"{type(exc).__name__}: {exc}")
+            raise
+        self._record(name, started, ok=True)
+        return result
+
+    def _record(self, name: str, started: float, ok: bool, error: Optional[str] = None):
+        entry = {"ok": ok, "seconds": round(time.perf_counter() - started, 4)}
+        if error:
+            entry["error"] = error
+        with self._lock:
+            self._components[name] = entry
+
+    def mark_ready(self):
+        with self._lock:
+            self._ready = True
+            self._ready_at = time.time()
+
+    def reset(self):
+        with self._lock:
+            self._components.clear()
+            self._ready = False
+            self._started_at = time.time()
+            self._ready_at = None
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return self._ready
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self._ready,
+                "startupSeconds": round((self._ready_at or time.time()) - self._started_at, 4),
+                "components": dict(self._components),
+            }
+
+
+readiness = Readiness()
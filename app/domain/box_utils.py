@@ -0,0 +1,62 @@
+from typing import List
+import numpy as np
+from app.domain.models import BoundingBox, DetectionResult
+
+
+def xywh_to_xyxy(boxes: np.ndarray) -> np.ndarray:
+    """(cx, cy, w, h) -> (x1, y1, x2, y2), vectorizado."""
+    out = np.empty_like(boxes)
+    half_w = boxes[:, 2] / 2
+    half_h = boxes[:, 3] / 2
+    out[:, 0] = boxes[:, 0] - half_w
+    out[:, 1] = boxes[:, 1] - half_h
+    out[:, 2] = boxes[:, 0] + half_w
+    out[:, 3] = boxes[:, 1] + half_h
+    return out
+
+
+def clamp_boxes(boxes: np.ndarray, img_w: int, img_h: int) -> np.ndarray:
+    """
+    Same clamping as the detector adapters: integer pixel coordinates inside the
+    image, with at least 1 px width/height. Returns an int array (N, 4) in xyxy.
+    """
+    b = boxes.astype(np.int64)  # trunca igual que int()
+    x1 = np.clip(b[:, 0], 0, img_w - 1)
+    y1 = np.clip(b[:, 1], 0, img_h - 1)
+    x2 = np.maximum(x1 + 1, np.minimum(b[:, 2], img_w))
+    y2 = np.maximum(y1 + 1, np.minimum(b[:, 3], img_h))
+    return np.stack([x1, y1, x2, y2], axis=1)
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """
+    Greedy non-maximum suppression over xyxy boxes.
+    Returns the kept indices ordered by descending score.
+    """
+    if boxes.size == 0:
+        return np.empty((0,), dtype=np.int64)
+
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = np.maximum(0.0, x2 - x1) * np.maximum(0.0, y2 - y1)
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        xx1 = np.maximum(x1[i], x1[rest])
+        yy1 = np.maximum(y1[i], y1[rest])
+        xx2 = np.minimum(x2[i], x2[rest])
+        yy2 = np.minimum(y2[i], y2[rest])
+        inter = np.maximum(0.0, xx2 - xx1) * np.maximum(0.0, yy2 - yy1)
+        iou = inter / np.maximum(areas[i] + areas[rest] - inter, 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def to_detections(boxes: np.ndarray, scores: np.ndarray) -> List[DetectionResult]:
+    """Clamped xyxy int boxes + scores -> DetectionResult list (same order)."""
+    return [
+        DetectionResult(box=BoundingBox(x=int(x1), y=int(y1), w=int(x2 - x1), h=int(y2 - y1)), confidence=float(score))
+        for (x1, y1, x2, y2), score in zip(boxes.tolist(), scores.tolist())
+    ]
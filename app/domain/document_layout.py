@@ -0,0 +1,241 @@
+import asyncio
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import cv2
+import numpy as np
+from app.core.executors import InferenceExecutors
+from app.domain.models import BoundingBox, OcrWord
+from app.ports.ocr_port import OcrPort
+
+
+class TextLine(NamedTuple):
+    box: BoundingBox
+    words: List[OcrWord]
+
+    @property
+    def text(self) -> str:
+        return " ".join(w.text for w in self.words)
+
+
+class LayoutRegion(NamedTuple):
+    name: str          # "identity" | "first_name" | "last_name"
+    kind: str          # "digits" | "name": decide el motor OCR de la región
+    box: BoundingBox   # coordenadas de la imagen original
+
+
+def union_box(boxes: Sequence[BoundingBox]) -> BoundingBox:
+    x1 = min(b.x for b in boxes)
+    y1 = min(b.y for b in boxes)
+    x2 = max(b.x + b.w for b in boxes)
+    y2 = max(b.y + b.h for b in boxes)
+    return BoundingBox(x=x1, y=y1, w=x2 - x1, h=y2 - y1)
+
+
+def clip_box(x1: float, y1: float, x2: float, y2: float, shape) -> Optional[BoundingBox]:
+    h, w = shape[:2]
+    x1, y1 = max(0, int(x1)), max(0, int(y1))
+    x2, y2 = min(w, int(round(x2))), min(h, int(round(y2)))
+    if x2 - x1 < 4 or y2 - y1 < 4:
+        return None
+    return BoundingBox(x=x1, y=y1, w=x2 - x1, h=y2 - y1)
+
+
+def layout_image(img: np.ndarray, max_side: int) -> Tuple[np.ndarray, float]:
+    """Gray copy with its longest side capped at `max_side` (never upscaled) and the applied scale."""
+    h, w = img.shape[:2]
+    s = min(1.0, max_side / float(max(h, w))) if max_side > 0 else 1.0
+    if s < 1.0:
+        img = cv2.resize(img, (max(1, round(w * s)), max(1, round(h * s))), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    return gray, s
+
+
+def rescale_words(words: List[OcrWord], scale: float) -> List[OcrWord]:
+    if scale == 1.0:
+        return words
+    inv = 1.0 / scale
+    return [
+        OcrWord(text=w.text, confidence=w.confidence, line=w.line,
+                box=BoundingBox(x=int(w.box.x * inv), y=int(w.box.y * inv),
+                                w=int(round(w.box.w * inv)), h=int(round(w.box.h * inv))))
+        for w in words
+    ]
+
+
+def group_lines(words: List[OcrWord]) -> List[TextLine]:
+    """Words grouped by Tesseract line, top to bottom."""
+    by_line: Dict[Tuple[int, int, int], List[OcrWord]] = {}
+    for w in words:
+        by_line.setdefault(w.line, []).append(w)
+    lines = [
+        TextLine(union_box([w.box for w in ws]), sorted(ws, key=lambda w: w.box.x))
+        for ws in by_line.values()
+    ]
+    lines.sort(key=lambda ln: (ln.box.y, ln.box.x))
+    return lines
+
+
+def _digit_count(text: str) -> int:
+    return sum(map(str.isdigit, text))
+
+
+def _has_label(line: TextLine, labels: Sequence[str]) -> bool:
+    low = line.text.lower()
+    return any(k in low for k in labels)
+
+
+def _value_region(label: TextLine, lines: List[TextLine], labels: Sequence[str],
+                  doc: BoundingBox, shape) -> Optional[BoundingBox]:
+    """
+    Region of the value printed under a label: the nearest line below it that
+    overlaps horizontally (and is not a label itself) or, if the layout pass
+    missed it, a band of ~3 label heights right below the label.
+    """
+    lb = label.box
+    value = None
+    for ln in lines:
+        b = ln.box
+        if b.y < lb.y + lb.h * 0.5 or b.y > lb.y + lb.h * 3.5:
+            continue
+        if b.x > lb.x + lb.w + lb.h * 4 or b.x + b.w < lb.x - lb.h * 2:
+            continue
+        if _has_label(ln, labels) or _digit_count(ln.text) > len(ln.text) // 2:
+            continue
+        value = b
+        break
+
+    # A la derecha hasta el borde del texto del documento: el pase reducido puede perder palabras
+    right = doc.x + doc.w + lb.h
+    if value is not None:
+        pad = value.h * 0.35
+        return clip_box(min(lb.x, value.x) - pad, value.y - pad, max(right, value.x + value.w + pad),
+                        value.y + value.h + pad, shape)
+    return clip_box(lb.x - lb.h * 0.3, lb.y + lb.h * 1.1, right, lb.y + lb.h * 4.0, shape)
+
+
+def _identity_region(lines: List[TextLine], identity_digits: int, shape) -> Optional[BoundingBox]:
+    """Line whose digit words add up closest to the identity length (4-4-5)."""
+    best = None
+    for ln in lines:
+        numeric = [w for w in ln.words if _digit_count(w.text) >= 3 and _digit_count(w.text) * 2 > len(w.text)]
+        n = sum(_digit_count(w.text) for w in numeric)
+        if n < identity_digits - 3 or n > identity_digits + 4:
+            continue
+        key = (abs(n - identity_digits), -sum(w.confidence for w in numeric) / len(numeric))
+        if best is None or key < best[0]:
+            best = (key, union_box([w.box for w in numeric]))
+    if best is None:
+        return None
+    b = best[1]
+    pad = b.h * 0.5
+    # Más margen horizontal: el primer/último grupo puede venir cortado
+    return clip_box(b.x - b.h * 1.5, b.y - pad, b.x + b.w + b.h * 1.5, b.y + b.h + pad, shape)
+
+
+def plan_regions(words: List[OcrWord], shape, first_labels: Sequence[str], last_labels: Sequence[str],
+                 identity_digits: int = 13) -> Tuple[List[TextLine], List[LayoutRegion]]:
+    """Regions to OCR (original-image coordinates) from the word boxes of the layout pass."""
+    lines = group_lines(words)
+    if not lines:
+        return lines, []
+    doc = union_box([ln.box for ln in lines])
+    labels = tuple(first_labels) + tuple(last_labels)
+
+    regions = []
+    box = _identity_region(lines, identity_digits, shape)
+    if box is not None:
+        regions.append(LayoutRegion("identity", "digits", box))
+    for name, wanted in (("first_name", first_labels), ("last_name", last_labels)):
+        anchor = next((ln for ln in lines if _has_label(ln, wanted)), None)
+        if anchor is None:
+            continue
+        box = _value_region(anchor, lines, labels, doc, shape)
+        if box is not None:
+            regions.append(LayoutRegion(name, "name", box))
+    return lines, regions
+
+
+def roi_image(img: np.ndarray, box: BoundingBox, text_height: int) -> np.ndarray:
+    """
+    Crop (gray, binarized) for single-line OCR: scaled so the line measures
+    about `text_height` px, since the documents arrive at very different resolutions.
+    """
+    crop = img[box.y:box.y + box.h, box.x:box.x + box.w]
+    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+    # La caja lleva ~35-50% de margen vertical: la línea mide ~2/3 del alto
+    factor = min(4.0, max(0.5, text_height / (box.h * 0.66)))
+    if abs(factor - 1.0) > 0.05:
+        interp = cv2.INTER_CUBIC if factor > 1 else cv2.INTER_AREA
+        gray = cv2.resize(gray, None, fx=factor, fy=factor, interpolation=interp)
+    _, thr = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return thr
+
+
+class IdentityLayoutReader:
+    """
+    OCR por regiones para DNI/licencia: un pase barato de layout (palabras con
+    caja sobre una copia reducida) ubica la línea de identidad y las etiquetas
+    de nombre; luego solo esas regiones se leen, en paralelo, con motores de
+    una línea (dígitos para la identidad, letras para los nombres).
+
+    `read` devuelve el texto para el extractor (valores de las regiones con su
+    etiqueta, seguido del texto del pase de layout como respaldo) o None si el
+    layout no encontró ninguna región.
+    """
+    def __init__(
+        self,
+        layout_ocr: OcrPort,
+        digits_ocr: OcrPort,
+        name_ocr: OcrPort,
+        executors: InferenceExecutors,
+        first_labels: Sequence[str],
+        last_labels: Sequence[str],
+        identity_digits: int = 13,
+        max_side: int = 1200,
+        text_height: int = 40,
+    ):
+        self.layout_ocr = layout_ocr
+        self.digits_ocr = digits_ocr
+        self.name_ocr = name_ocr
+        self.executors = executors
+        self.first_labels = tuple(first_labels)
+        self.last_labels = tuple(last_labels)
+        self.identity_digits = identity_digits
+        self.max_side = max_side
+        self.text_height = text_height
+
+    async def _read_region(self, img: np.ndarray, region: LayoutRegion) -> Tuple[str, float, int]:
+        roi = await self.executors.run("preprocess", roi_image, img, region.box, self.text_height)
+        ocr = self.digits_ocr if region.kind == "digits" else self.name_ocr
+        text, conf = await self.executors.run("ocr", ocr.extract_text_with_confidence, roi)
+        return " ".join(text.split()), conf, roi.size
+
+    async def read(self, img: np.ndarray) -> Optional[dict]:
+        small, scale = await self.executors.run("preprocess", layout_image, img, self.max_side)
+        words = await self.executors.run("ocr", self.layout_ocr.extract_words, small)
+        words = rescale_words(words, scale)
+        lines, regions = plan_regions(words, img.shape, self.first_labels, self.last_labels, self.identity_digits)
+        if not regions:
+            return None
+
+        reads = await asyncio.gather(*(self._read_region(img, r) for r in regions))
+
+        values = {}
+        out_lines = []
+        for region, (text, conf, _) in zip(regions, reads):
+            values[region.name] = {"x": region.box.x, "y": region.box.y, "w": region.box.w, "h": region.box.h, "text": text, "confidence": conf}
+            if not text:
+                continue
+            if region.name == "first_name":
+                out_lines += [self.first_labels[0].upper(), text]
+            elif region.name == "last_name":
+                out_lines += [self.last_labels[0].upper(), text]
+            else:
+                out_lines.append(text)
+        layout_text = "\n".join(ln.text for ln in lines)
+
+        return {
+            "text": "\n".join(out_lines + [layout_text]),
+            "layoutText": layout_text,
+            "regions": values,
+            "ocrPixels": small.size + sum(n for _, _, n in reads),
+        }
@@ -0,0 +1,170 @@
+import time
+from functools import lru_cache
+from typing import NamedTuple, Optional
+import cv2
+import numpy as np
+from app.core.config import settings
+from app.core.metrics import DOC_NORMALIZE_PEAK_BYTES, STAGE_SECONDS
+
+
+class NormalizedDocument(NamedTuple):
+    image: np.ndarray              # para OCR: binarizada, o el gris si binarize=False
+    gray: np.ndarray               # gris escalado y filtrado (fallback sin umbral)
+    scale: float                   # factor aplicado sobre la imagen original
+    text_height: Optional[float]   # alto de carácter estimado en la original (px); None si no se pudo estimar
+    denoise: str                   # "bilateral" | "median"
+    peak_bytes: int                # pico de bytes de los arrays vivos a la vez (entrada incluida)
+    ms: float
+
+    def info(self) -> dict:
+        h, w = self.image.shape[:2]
+        return {
+            "width": w,
+            "height": h,
+            "scale": round(self.scale, 3),
+            "textHeight": None if self.text_height is None else round(self.text_height, 1),
+            "denoise": self.denoise,
+            "peakBytes": self.peak_bytes,
+            "ms": round(self.ms, 1),
+        }
+
+
+def estimate_text_height(gray: np.ndarray, thumb_side: int = 1280) -> Optional[float]:
+    """
+    Median character height (original-image px) from connected components of a
+    thumbnail with its long side capped at `thumb_side`. None when there are
+    too few character-like components.
+    """
+    h, w = gray.shape[:2]
+    s = min(1.0, thumb_side / float(max(h, w)))
+    if s < 1.0:
+        gray = cv2.resize(gray, (max(1, round(w * s)), max(1, round(h * s))), interpolation=cv2.INTER_AREA)
+    th = gray.shape[0]
+    block = max(11, (max(gray.shape[:2]) // 40) | 1)
+    thr = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, block, 10)
+    n, _, stats, _ = cv2.connectedComponentsWithStats(thr, connectivity=8)
+    if n < 2:
+        return None
+
+    cw = stats[1:, cv2.CC_STAT_WIDTH]
+    ch = stats[1:, cv2.CC_STAT_HEIGHT]
+    fill = stats[1:, cv2.CC_STAT_AREA] / np.maximum(1, cw * ch)
+    # Letra/dígito: alto razonable, proporción y relleno típicos de un trazo
+    chars = (ch >= 4) & (ch <= th * 0.2) & (cw <= ch * 1.5) & (cw * 7 >= ch) & (fill > 0.15) & (fill < 0.95)
+    if np.count_nonzero(chars) < 20:
+        return None
+    return float(np.median(ch[chars])) / s
+
+
+class DocumentNormalizer:
+    """
+    Document (DNI, licence, dispatch sheet) normalizer for full-page OCR.
+
+    The scale aims for characters of `target_text_height` px (estimated on a
+    thumbnail), is clamped to [min_scale, max_upscale], and the output is then
+    capped at `max_megapixels`. The work is done in gray from the start, and
+    bilateral filtering only runs up to `bilateral_max_megapixels`; above that a
+    3x3 median (also edge-preserving, much cheaper) is used. With
+    `target_text_height=0` the original fixed 2x is kept (still capped).
+    """
+    def __init__(
+        self,
+        target_text_height: float = 32,
+        max_upscale: float = 2.0,
+        min_scale: float = 0.25,
+        max_megapixels: float = 8.0,
+        bilateral_max_megapixels: float = 4.0,
+        binarize: bool = True,
+        block: int = 35,
+        c: float = 15,
+    ):
+        self.target_text_height = target_text_height
+        self.max_upscale = max_upscale
+        self.min_scale = min_scale
+        self.max_megapixels = max_megapixels
+        self.bilateral_max_megapixels = bilateral_max_megapixels
+        self.binarize = binarize
+        self.block = block
+        self.c = c
+
+    def estimate(self, gray: np.ndarray) -> Optional[float]:
+        return estimate_text_height(gray) if self.target_text_height > 0 else None
+
+    def scale_for(self, height: int, width: int, text_height: Optional[float] = None) -> float:
+        if text_height:
+            scale = min(self.max_upscale, max(self.min_scale, self.target_text_height / text_height))
+        else:
+            scale = self.max_upscale
+        if self.max_megapixels > 0:
+            scale = min(scale, (self.max_megapixels * 1e6 / float(height * width)) ** 0.5)
+        return scale
+
+    def __call__(self, img: np.ndarray) -> NormalizedDocument:
+        if img is None or img.size == 0:
+            raise ValueError("Empty document image for OCR preprocessing")
+        started = time.perf_counter()
+        peak = base = img.nbytes
+
+        def track(*arrays):
+            nonlocal peak
+            peak = max(peak, base + sum(a.nbytes for a in arrays if a is not img))
+
+        # Gris antes de escalar: el intermedio grande nunca es de 3 canales
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+        track(gray)
+        text_height = self.estimate(gray)
+        h, w = gray.shape[:2]
+        scale = self.scale_for(h, w, text_height)
+
+        if abs(scale - 1.0) > 1e-3:
+            interp = cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA
+            scaled = cv2.resize(gray, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=interp)
+            track(gray, scaled)
+            gray = scaled
+            del scaled
+
+        megapixels = gray.size / 1e6
+        if megapixels <= self.bilateral_max_megapixels:
+            denoise = "bilateral"
+            filtered = cv2.bilateralFilter(gray, d=7, sigmaColor=40, sigmaSpace=40)
+        else:
+            denoise = "median"
+            filtered = cv2.medianBlur(gray, 3)
+        track(gray, filtered)
+        gray = filtered
+        del filtered
+
+        out = gray
+        if self.binarize:
+            # Bloque calibrado para el 2x original: se reescala con el factor aplicado
+            block = max(11, int(round(self.block * scale / 2.0)) | 1)
+            out = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, block, self.c)
+            track(gray, out)
+
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe("doc_normalize", value=elapsed)
+        DOC_NORMALIZE_PEAK_BYTES.observe(value=peak)
+        return NormalizedDocument(out, gray, scale, text_height, denoise, peak, elapsed * 1000.0)
+
+
+@lru_cache(maxsize=8)
+def document_normalizer(target_text_height: float, max_upscale: float, max_megapixels: float,
+                        bilateral_max_megapixels: float, binarize: bool) -> DocumentNormalizer:
+    return DocumentNormalizer(
+        target_text_height=target_text_height,
+        max_upscale=max_upscale,
+        max_megapixels=max_megapixels,
+        bilateral_max_megapixels=bilateral_max_megapixels,
+        binarize=binarize,
+    )
+
+
+def default_document_normalizer(binarize: bool = True) -> DocumentNormalizer:
+    """Normalizer with the DOC_* settings; binarize=False for the dispatch sheets (/extract-info)."""
+    return document_normalizer(
+        settings.doc_target_text_height,
+        settings.doc_max_upscale,
+        settings.doc_max_megapixels,
+        settings.doc_bilateral_max_megapixels,
+        binarize,
+    )
@@ -1,237 +1,147 @@
+import math
+from typing import List, NamedTuple, Optional, Tuple
 import numpy as np
 import cv2
+from app.domain.document_normalize import default_document_normalizer
+from app.domain.image_header import read_image_size
+from app.domain.plate_deskew import default_deskewer
+from app.domain.plate_preprocess import default_preprocessor
+from app.domain.models import BoundingBox, DetectionResult
 
 
-def crop_lr_by_projection(bin_img: np.ndarray, margin: int = 6, min_col_frac: float = 0.01):
-    if bin_img is None or bin_img.size == 0:
-        return bin_img
-
-    h, w = bin_img.shape[:2]
-    if h < 5 or w < 5:
-        return bin_img
-
-    b = (bin_img > 0).astype(np.uint8)
-    col_sum = b.sum(axis=0)
-    thresh = max(1, int(h * min_col_frac))
-
-    cols = np.where(col_sum >= thresh)[0]
-    if cols.size == 0:
-        return bin_img
-
-    x_min = int(max(0, cols[0] - margin))
-    x_max = int(min(w, cols[-1] + margin + 1))
-    return bin_img[:, x_min:x_max]
-
-
-def crop_bbox_text(bin_img: np.ndarray, pad: int = 4, min_area: int = 80):
-    b = (bin_img > 0).astype(np.uint8) * 255
-    cnts, _ = cv2.findContours(b, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    if not cnts:
-        return bin_img
-
-    cnts = [c for c in cnts if cv2.contourArea(c) >= min_area]
-    if not cnts:
-        return bin_img
-
-    x, y, w, h = cv2.boundingRect(np.vstack(cnts))
-    H, W = bin_img.shape[:2]
-
-    x1 = max(0, x - pad)
-    y1 = max(0, y - pad)
-    x2 = min(W, x + w + pad)
-    y2 = min(H, y + h + pad)
-
-    return bin_img[y1:y2, x1:x2]
+def decode_image(data: bytes) -> np.ndarray:
+    """
+    Decodes an encoded image (JPG/PNG/WEBP) into a BGR array. Returns None if it cannot be decoded.
+    """
+    img_array = np.frombuffer(data, np.uint8)
+    return cv2.imdecode(img_array, cv2.IMREAD_COLOR)
 
 
-def shave_lr_edges(bin_img: np.ndarray, edge_white_frac: float = 0.55, max_shave: int = 200):
-    if bin_img is None or bin_img.size == 0:
-        return bin_img
+_REDUCED_FLAGS = {2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
 
-    h, w = bin_img.shape[:2]
-    b = (bin_img > 0).astype(np.uint8)
-    col_frac = b.mean(axis=0)
 
-    left = 0
-    shaved = 0
-    while left < w - 1 and col_frac[left] >= edge_white_frac and shaved < max_shave:
-        left += 1
-        shaved += 1
+class ReducedDecode(NamedTuple):
+    image: np.ndarray  # BGR para el detector (reducido si factor > 1)
+    factor: int  # 1, 2, 4 u 8
+    full_size: Tuple[int, int]  # (w, h) de la imagen completa, ya orientada
 
-    right = w - 1
-    shaved = 0
-    while right > 0 and col_frac[right] >= edge_white_frac and shaved < max_shave:
-        right -= 1
-        shaved += 1
 
-    if right - left < 10:
-        return bin_img
+def reduction_factor(width: int, height: int, target: int) -> int:
+    """Largest 2/4/8 reduction that keeps the long side >= `target` (1 if none)."""
+    factor = 1
+    for f in (2, 4, 8):
+        if max(width, height) / f >= target:
+            factor = f
+    return factor
 
-    return bin_img[:, left:right+1]
 
+def decode_for_detection(data: bytes, target: int) -> Optional[ReducedDecode]:
+    """
+    Decodes at the reduced scale chosen from the header dimensions
+    (IMREAD_REDUCED_COLOR_2/4/8: JPEG is downscaled inside the DCT, so the
+    full-resolution array is never built). The detector resizes to `target`
+    anyway. Returns None if the image cannot be decoded.
+    """
+    size = read_image_size(data)
+    factor = reduction_factor(size[0], size[1], target) if size and target > 0 else 1
+    if factor == 1:
+        img = decode_image(data)
+        return ReducedDecode(img, 1, (img.shape[1], img.shape[0])) if img is not None else None
+
+    img = cv2.imdecode(np.frombuffer(data, np.uint8), _REDUCED_FLAGS[factor])
+    if img is None:
+        return None
+    full_w, full_h = size
+    small_h, small_w = img.shape[:2]
+    # imdecode aplica la orientación EXIF; el header no
+    if (small_w > small_h) != (full_w > full_h) and full_w != full_h:
+        full_w, full_h = full_h, full_w
+    return ReducedDecode(img, factor, (full_w, full_h))
+
+
+def map_detection(det: DetectionResult, decoded: ReducedDecode) -> DetectionResult:
+    """Maps a detection on the reduced image back to full-resolution coordinates."""
+    if decoded.factor == 1:
+        return det
+    full_w, full_h = decoded.full_size
+    small_h, small_w = decoded.image.shape[:2]
+    sx, sy = full_w / small_w, full_h / small_h
+    b = det.box
+    x1 = min(full_w - 1, int(b.x * sx))
+    y1 = min(full_h - 1, int(b.y * sy))
+    x2 = max(x1 + 1, min(full_w, math.ceil((b.x + b.w) * sx)))
+    y2 = max(y1 + 1, min(full_h, math.ceil((b.y + b.h) * sy)))
+    return DetectionResult(box=BoundingBox(x=x1, y=y1, w=x2 - x1, h=y2 - y1), confidence=det.confidence)
+
+
+def crop_factor(decoded: ReducedDecode, boxes: List[BoundingBox], min_height: int) -> int:
+    """
+    Largest reduction (never above the detection one) at which every box still
+    measures at least `min_height` px; 1 (full resolution) with min_height <= 0.
+    """
+    if min_height <= 0 or not boxes:
+        return 1
+    shortest = min(b.h for b in boxes)
+    factor = 1
+    for f in (2, 4, 8):
+        if f <= decoded.factor and shortest / f >= min_height:
+            factor = f
+    return factor
+
+
+def _scaled_crops(img: np.ndarray, full_size: Tuple[int, int], boxes: List[BoundingBox], pad: int) -> List[np.ndarray]:
+    """Crops of full-resolution `boxes` taken from `img`, a (possibly reduced) decode of the same image."""
+    sx, sy = img.shape[1] / full_size[0], img.shape[0] / full_size[1]
+    pad = int(round(pad * sx))
+    crops = []
+    for b in boxes:
+        x1, y1 = int(b.x * sx), int(b.y * sy)
+        x2 = max(x1 + 1, math.ceil((b.x + b.w) * sx))
+        y2 = max(y1 + 1, math.ceil((b.y + b.h) * sy))
+        crops.append(crop_with_padding(img, x1, y1, x2, y2, pad=pad))
+    return crops
+
+
+def detection_crops(data: bytes, decoded: ReducedDecode, boxes: List[BoundingBox], pad: int = 10,
+                    min_height: int = 0) -> List[np.ndarray]:
+    """
+    Padded crops of `boxes` (full-resolution coordinates) for OCR.
+
+    Tradeoff: a second decode costs about as much as the first one, but a plate
+    a few dozen px tall in the reduced image loses strokes the OCR needs. So
+    the crops come from the reduced decode already in memory when every box
+    keeps >= `min_height` px there; otherwise the image is decoded again at
+    the smallest reduction that reaches `min_height` (full resolution with
+    min_height=0) and only the crops (copies) survive the call.
+    """
+    factor = crop_factor(decoded, boxes, min_height)
+    if factor == decoded.factor:
+        return _scaled_crops(decoded.image, decoded.full_size, boxes, pad)
+    if factor == 1:
+        img = decode_image(data)
+    else:
+        img = cv2.imdecode(np.frombuffer(data, np.uint8), _REDUCED_FLAGS[factor])
+    if img is None:
+        return []
+    return [c.copy() for c in _scaled_crops(img, decoded.full_size, boxes, pad)]
 
 
 def deskew_plate(img_bgr: np.ndarray) -> np.ndarray:
     """
     Corrects the skew of the plate image using contour analysis on character candidates.
-    Conservative approach to avoid over-rotation.
+    Conservative approach to avoid over-rotation (see PlateDeskewer).
     """
     if img_bgr is None or img_bgr.size == 0:
         return img_bgr
-
-    h_img, w_img = img_bgr.shape[:2]
-    
-    # Skip deskewing for very small images
-    if h_img < 30 or w_img < 60:
-        return img_bgr
-    
-    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-    
-    # Use adaptive threshold to handle shadows/gradients better than global Otsu
-    # Invert so text is white (foreground)
-    thresh = cv2.adaptiveThreshold(
-        gray, 255, 
-        cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-        cv2.THRESH_BINARY_INV, 
-        19, 9
-    )
-
-    # Find contours
-    cnts, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    
-    if len(cnts) < 3:  # Need at least 3 character-like contours for reliable deskew
-        return img_bgr
-    
-    # Filter for character-like contours
-    merged_pts = []
-    
-    min_h = h_img * 0.15  # Lowered from 0.2 for more flexibility
-    max_h = h_img * 0.95
-    min_area = 50  # Minimum area to avoid noise
-    
-    for c in cnts:
-        area = cv2.contourArea(c)
-        if area < min_area:
-            continue
-            
-        x, y, w, h = cv2.boundingRect(c)
-        aspect = w / float(h) if h > 0 else 0
-        
-        # Filter noise: 
-        # - Height must be significant (character sized)
-        # - Aspect ratio reasonable for a letter/digit
-        if h > min_h and h < max_h and 0.15 < aspect < 2.5:
-            merged_pts.append(c)
-            
-    if len(merged_pts) < 3:  # Need at least 3 valid character contours
-        return img_bgr
-        
-    # Combine valid contours
-    all_points = np.vstack(merged_pts)
-    rect = cv2.minAreaRect(all_points)
-    center, size, angle = rect
-
-    # Correct angle logic
-    # OpenCV's minAreaRect returns angle in [-90, 0)
-    # We want to align the longest side horizontally
-    width, height = size
-    if width < height:
-        angle = angle + 90
-    
-    # Normalize angle to [-45, 45] range
-    if angle > 45:
-        angle = angle - 90
-    elif angle < -45:
-        angle = angle + 90
-        
-    # VERY conservative: only correct small tilts (max 10 degrees)
-    # Ignore rotations that are too small or too large
-    if abs(angle) < 0.5 or abs(angle) > 10.0:
-        return img_bgr
-
-    # Apply rotation
-    image_center = (w_img // 2, h_img // 2)
-    M = cv2.getRotationMatrix2D(image_center, angle, 1.0)
-    
-    rotated = cv2.warpAffine(
-        img_bgr, M, (w_img, h_img), 
-        flags=cv2.INTER_CUBIC, 
-        borderMode=cv2.BORDER_REPLICATE
-    )
-    return rotated
-
+    return default_deskewer()(img_bgr).image
 
 
 def preprocess_for_ocr(plate_bgr: np.ndarray) -> np.ndarray:
     """
     Returns a binary image ready for OCR (white text on black background).
+    Runs the declarative pipeline in app.domain.plate_preprocess (PLATE_STEPS).
     """
-    if plate_bgr is None or plate_bgr.size == 0:
-        raise ValueError("Empty plate image for OCR preprocessing")
-
-    # 0) Deskew (straighten) the plate before cropping vertical bands
-    plate_bgr = deskew_plate(plate_bgr)
-
-    # 1) Crop useful band of the plate (avoid top/bottom borders)
-    # More aggressive crop to exclude "HONDURAS" text at top and "CENTROAMERICA" at bottom
-    h, w = plate_bgr.shape[:2]
-    plate = plate_bgr[int(h * 0.30):int(h * 0.75), :]
-
-    # 2) Upscale to help OCR
-    plate = cv2.resize(plate, None, fx=5, fy=5, interpolation=cv2.INTER_CUBIC)
-
-    # 3) Gray + blur
-    gray = cv2.cvtColor(plate, cv2.COLOR_BGR2GRAY)
-    gray = cv2.GaussianBlur(gray, (3, 3), 0)
-
-    # Unsharp mask to recover edges
-    sharp = cv2.addWeighted(gray, 1.5, cv2.GaussianBlur(gray, (0, 0), 1.0), -0.5, 0)
-
-    # Boost contrast slightly
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    sharp = clahe.apply(sharp)
-
-    # 4) Threshold inverted (text as white)
-    # Reduced block size and C value for cleaner edges
-    thr_adapt = cv2.adaptiveThreshold(
-        sharp, 255,
-        cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-        cv2.THRESH_BINARY_INV,
-        25, 5  # Changed from 35, 7 to get sharper edges
-    )
-    # Otsu fallback
-    _, thr_otsu = cv2.threshold(sharp, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
-    # Pick the one with better balance (closer to 0.5 foreground ratio)
-    def balance_score(img):
-        p = img.mean() / 255.0
-        return abs(0.5 - p)
-    thr = thr_adapt if balance_score(thr_adapt) < balance_score(thr_otsu) else thr_otsu
-
-    # 5) Morph operations - BALANCED approach
-    # Small CLOSE to connect broken characters (numbers with cuts)
-    # Then OPEN to remove small noise
-    thr = cv2.morphologyEx(
-        thr,
-        cv2.MORPH_CLOSE,
-        cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2)),  # Very small kernel
-        iterations=1
-    )
-    thr = cv2.morphologyEx(
-        thr,
-        cv2.MORPH_OPEN,
-        cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2)),
-        iterations=1
-    )
-
-    # 6) Trim lateral borders and keep only text region
-    thr = shave_lr_edges(thr, edge_white_frac=0.55, max_shave=200)
-    thr = crop_lr_by_projection(thr, margin=8, min_col_frac=0.01)
-    thr = crop_bbox_text(thr, pad=6, min_area=120)
-
-    if thr is None or thr.size == 0:
-        raise ValueError("OCR preprocessing returned an empty image")
-
-    return thr
+    return default_preprocessor().run(plate_bgr)
 
 
 def crop_with_padding(img_bgr: np.ndarray, x1, y1, x2, y2, pad: int = 10):
@@ -245,23 +155,6 @@ def crop_with_padding(img_bgr: np.ndarray, x1, y1, x2, y2, pad: int = 10):
 def preprocess_document_for_ocr(img_bgr: np.ndarray) -> np.ndarray:
     """
     Preprocesa documentos (DNI/licencia) para OCR de texto general.
+    Ver DocumentNormalizer: escala por alto de texto con tope de megapíxeles.
     """
-    if img_bgr is None or img_bgr.size == 0:
-        raise ValueError("Empty document image for OCR preprocessing")
-
-    # Escala para ganar resolución
-    img = cv2.resize(img_bgr, None, fx=2.0, fy=2.0, interpolation=cv2.INTER_CUBIC)
-
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    gray = cv2.bilateralFilter(gray, d=7, sigmaColor=40, sigmaSpace=40)
-
-    # Threshold suave para mantener espacios
-    thr = cv2.adaptiveThreshold(
-        gray, 255,
-        cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-        cv2.THRESH_BINARY,
-        35, 15
-    )
-
-    # Inverción si hay fondo claro con texto oscuro? Probamos a mantener original
-    return thr
+    return default_document_normalizer()(img_bgr).image
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 class BoundingBox(BaseModel):
     x: int
@@ -18,3 +18,9 @@ class OcrResult(BaseModel):
     raw_text: str
     detection_confidence: float
     bbox: BoundingBox
+
+class OcrWord(BaseModel):
+    text: str
+    confidence: float
+    box: BoundingBox
+    line: Tuple[int, int, int]  # (block, paragraph, line) de Tesseract
@@ -0,0 +1,192 @@
+import asyncio
+import time
+from typing import Dict, List, NamedTuple, Optional
+import cv2
+import numpy as np
+from app.core.executors import InferenceExecutors
+from app.core.metrics import OCR_VARIANT_RUNS, OCR_VARIANT_WINS, OCR_CASCADE_EARLY_EXITS
+from app.domain import services
+from app.ports.ocr_port import OcrPort
+
+# Fuentes de imagen disponibles para cada variante
+SOURCES = ("binary", "gray")
+
+
+class CascadeVariant(NamedTuple):
+    name: str
+    source: str  # "binary" (salida de preprocess_for_ocr) | "gray" (recorte en gris)
+    ocr: OcrPort
+
+
+class CascadeCandidate(NamedTuple):
+    variant: str
+    raw_text: str
+    plate_text: str
+    confidence: float
+    score: float
+    elapsed_ms: float
+
+
+class CascadeOutcome(NamedTuple):
+    raw_text: str
+    plate_text: str
+    confidence: float
+    variant: Optional[str]
+    early_exit: bool
+    candidates: List[CascadeCandidate]
+
+
+def score_candidate(plate_text: str, raw_text: str, confidence: float) -> float:
+    """
+    A reading in `AAA ####` format always beats a non-matching one; ties are
+    broken by Tesseract confidence.
+    """
+    conf = max(confidence, 0.0) / 100.0
+    if plate_text:
+        return 1.0 + conf
+    if raw_text:
+        return 0.5 * conf
+    return 0.0
+
+
+class OcrCascade:
+    """
+    Runs the OCR variants in priority order on the "ocr" executor, at most
+    `parallel` at a time (1 = strictly sequential, one Tesseract run when the
+    first variant already matches). Each candidate is scored with
+    `normalize_hn_plate` + Tesseract confidence; an accepted candidate only
+    wins once every higher-priority variant has finished, so the result does
+    not depend on timing. Variants not started yet are skipped (only queued
+    work can be cancelled; a Tesseract call already running finishes in its
+    worker). When none matches, the best candidate received within the
+    latency budget wins.
+    """
+    def __init__(self, variants: List[CascadeVariant], budget_ms: float = 0.0, min_confidence: float = 0.0,
+                 parallel: int = 1):
+        if not variants:
+            raise ValueError("OCR cascade needs at least one variant")
+        for v in variants:
+            if v.source not in SOURCES:
+                raise ValueError(f"Unknown OCR cascade source: {v.source!r}")
+        self.variants = list(variants)
+        self.budget_ms = budget_ms
+        self.min_confidence = min_confidence
+        self.parallel = max(1, parallel)
+
+    @classmethod
+    def from_spec(cls, spec: str, engines: Dict[str, OcrPort], budget_ms: float = 0.0,
+                  min_confidence: float = 0.0, parallel: int = 1) -> "OcrCascade":
+        """
+        `spec` is an ordered, comma separated list of `source:engine`
+        (e.g. "binary:psm7,binary:psm6,gray:psm7,gray:psm6").
+        """
+        variants = []
+        for item in (part.strip() for part in spec.split(",")):
+            if not item:
+                continue
+            source, _, engine = item.partition(":")
+            if engine not in engines:
+                raise ValueError(f"Unknown OCR cascade engine: {engine!r}")
+            variants.append(CascadeVariant(name=item, source=source, ocr=engines[engine]))
+        return cls(variants, budget_ms=budget_ms, min_confidence=min_confidence, parallel=parallel)
+
+    def _images(self, plate_bgr: np.ndarray, thr: np.ndarray) -> Dict[str, np.ndarray]:
+        images = {"binary": thr}
+        if any(v.source == "gray" for v in self.variants):
+            images["gray"] = cv2.cvtColor(plate_bgr, cv2.COLOR_BGR2GRAY)
+        return images
+
+    @staticmethod
+    def _read(variant: CascadeVariant, img: np.ndarray) -> CascadeCandidate:
+        started = time.perf_counter()
+        raw, conf = variant.ocr.extract_text_with_confidence(img)
+        raw = (raw or "").strip()
+        plate_text = services.normalize_hn_plate(raw)
+        return CascadeCandidate(
+            variant=variant.name,
+            raw_text=raw,
+            plate_text=plate_text,
+            confidence=conf,
+            score=score_candidate(plate_text, raw, conf),
+            elapsed_ms=(time.perf_counter() - started) * 1000.0,
+        )
+
+    def _accepts(self, cand: CascadeCandidate) -> bool:
+        return bool(cand.plate_text) and cand.confidence >= self.min_confidence
+
+    async def run(self, plate_bgr: np.ndarray, thr: np.ndarray, executors: InferenceExecutors) -> CascadeOutcome:
+        images = self._images(plate_bgr, thr)
+        n = len(self.variants)
+        deadline = time.perf_counter() + self.budget_ms / 1000.0 if self.budget_ms > 0 else None
+        # Índice de variante -> candidato (None si la llamada falló); solo las terminadas
+        finished: Dict[int, Optional[CascadeCandidate]] = {}
+        in_flight: Dict[asyncio.Future, int] = {}
+        errors: List[BaseException] = []
+        winner: Optional[CascadeCandidate] = None
+        next_idx = 0
+        limit = n  # ninguna variante por debajo de una aceptada puede ganar: no se lanzan
+
+        try:
+            while True:
+                while len(in_flight) < self.parallel and next_idx < limit:
+                    v = self.variants[next_idx]
+                    in_flight[asyncio.ensure_future(executors.run("ocr", self._read, v, images[v.source]))] = next_idx
+                    next_idx += 1
+                if not in_flight:
+                    break
+                timeout = None
+                if deadline is not None:
+                    timeout = deadline - time.perf_counter()
+                    if timeout <= 0:
+                        break
+                done, _ = await asyncio.wait(in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break  # presupuesto agotado
+                for task in done:
+                    idx = in_flight.pop(task)
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                        finished[idx] = None
+                        continue
+                    cand = task.result()
+                    OCR_VARIANT_RUNS.inc(cand.variant)
+                    finished[idx] = cand
+                    if self._accepts(cand):
+                        limit = min(limit, idx)
+
+                # Gana la primera aceptada cuyas anteriores ya terminaron todas
+                for idx in range(n):
+                    if idx not in finished:
+                        break
+                    cand = finished[idx]
+                    if cand is not None and self._accepts(cand):
+                        winner = cand
+                        break
+                if winner is not None:
+                    break
+        finally:
+            # Solo se evita lo que sigue en cola; una llamada ya iniciada termina en su worker
+            for task in in_flight:
+                task.cancel()
+
+        candidates = [finished[i] for i in sorted(finished) if finished[i] is not None]
+        early_exit = winner is not None and len(finished) < n
+        if winner is None and candidates:
+            order = {v.name: i for i, v in enumerate(self.variants)}
+            winner = max(candidates, key=lambda c: (c.score, -order[c.variant]))
+        if winner is None and errors:
+            # Ninguna variante respondió: se propaga el error original
+            raise errors[0]
+        if winner is None:
+            return CascadeOutcome("", "", -1.0, None, False, candidates)
+        OCR_VARIANT_WINS.inc(winner.variant)
+        if early_exit:
+            OCR_CASCADE_EARLY_EXITS.inc()
+        return CascadeOutcome(
+            raw_text=winner.raw_text,
+            plate_text=winner.plate_text,
+            confidence=winner.confidence,
+            variant=winner.variant,
+            early_exit=early_exit,
+            candidates=candidates,
+        )
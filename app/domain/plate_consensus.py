@@ -0,0 +1,99 @@
+from collections import Counter
+from typing import Dict, List, Optional
+from app.domain.services import DIGIT_FIX, LETTER_FIX, clean_alnum_upper, normalize_hn_plate
+
+PLATE_LEN = 7  # AAA####
+LETTER_POSITIONS = 3
+
+
+def align_plate(raw_text: str, min_valid: int = 6) -> Optional[str]:
+    """
+    Aligns a raw OCR reading to the 7 AAA#### positions.
+
+    Readings that `normalize_hn_plate` accepts are used as-is. Otherwise every
+    7-char window is tried applying LETTER_FIX to the first 3 positions and
+    DIGIT_FIX to the last 4; the window with most positions in format wins and
+    positions that still don't fit are returned as "?" (they don't vote).
+    Returns None when no window has at least `min_valid` valid positions.
+    """
+    normalized = normalize_hn_plate(raw_text)
+    if normalized:
+        return normalized.replace(" ", "")
+
+    cleaned = clean_alnum_upper(raw_text)
+    best, best_valid = None, -1
+    for start in range(0, len(cleaned) - PLATE_LEN + 1):
+        window = cleaned[start:start + PLATE_LEN]
+        letters = window[:LETTER_POSITIONS].translate(LETTER_FIX)
+        digits = window[LETTER_POSITIONS:].translate(DIGIT_FIX)
+        chars = [c if c.isalpha() else "?" for c in letters] + [c if c.isdigit() else "?" for c in digits]
+        valid = PLATE_LEN - chars.count("?")
+        if valid > best_valid:
+            best, best_valid = "".join(chars), valid
+    if best is None or best_valid < min_valid:
+        return None
+    return best
+
+
+class PlateVoter:
+    """
+    Per-position character voting over several readings of the same plate.
+
+    Each aligned reading casts one vote per position; the Tesseract confidence
+    only breaks ties and weights the reported per-character confidence.
+    `decided(remaining)` is True once no position can change its winner with
+    the readings still to come, which lets callers stop issuing OCR calls.
+    """
+    def __init__(self):
+        self.counts: List[Counter] = [Counter() for _ in range(PLATE_LEN)]
+        self.weights: List[Dict[str, float]] = [{} for _ in range(PLATE_LEN)]
+        self.readings = 0
+
+    def add(self, raw_text: str, confidence: float = -1.0) -> Optional[str]:
+        aligned = align_plate(raw_text)
+        if aligned is None:
+            return None
+        weight = max(confidence, 0.0) / 100.0 or 0.01
+        for pos, ch in enumerate(aligned):
+            if ch == "?":
+                continue
+            self.counts[pos][ch] += 1
+            self.weights[pos][ch] = self.weights[pos].get(ch, 0.0) + weight
+        self.readings += 1
+        return aligned
+
+    def _ranked(self, pos: int) -> List[str]:
+        return sorted(self.counts[pos], key=lambda ch: (self.counts[pos][ch], self.weights[pos][ch]), reverse=True)
+
+    def decided(self, remaining: int) -> bool:
+        for pos in range(PLATE_LEN):
+            ranked = self._ranked(pos)
+            if not ranked:
+                return False
+            lead = self.counts[pos][ranked[0]]
+            second = self.counts[pos][ranked[1]] if len(ranked) > 1 else 0
+            if lead <= second + remaining:
+                return False
+        return True
+
+    def result(self) -> Optional[dict]:
+        """Winning plate ("AAA 1234") with per-character confidence, or None if a position has no votes."""
+        characters = []
+        for pos in range(PLATE_LEN):
+            ranked = self._ranked(pos)
+            if not ranked:
+                return None
+            ch = ranked[0]
+            total = sum(self.weights[pos].values())
+            characters.append({
+                "position": pos,
+                "char": ch,
+                "confidence": round(self.weights[pos][ch] / total, 3) if total else 0.0,
+                "votes": dict(self.counts[pos]),
+            })
+        text = "".join(c["char"] for c in characters)
+        return {
+            "plateText": f"{text[:LETTER_POSITIONS]} {text[LETTER_POSITIONS:]}",
+            "confidence": min(c["confidence"] for c in characters),
+            "characters": characters,
+        }
@@ -0,0 +1,65 @@
+import cv2
+import numpy as np
+
+
+def crop_lr_by_projection(bin_img: np.ndarray, margin: int = 6, min_col_frac: float = 0.01):
+    if bin_img is None or bin_img.size == 0:
+        return bin_img
+
+    h, w = bin_img.shape[:2]
+    if h < 5 or w < 5:
+        return bin_img
+
+    b = (bin_img > 0).astype(np.uint8)
+    col_sum = b.sum(axis=0)
+    thresh = max(1, int(h * min_col_frac))
+
+    cols = np.where(col_sum >= thresh)[0]
+    if cols.size == 0:
+        return bin_img
+
+    x_min = int(max(0, cols[0] - margin))
+    x_max = int(min(w, cols[-1] + margin + 1))
+    return bin_img[:, x_min:x_max]
+
+
+def crop_bbox_text(bin_img: np.ndarray, pad: int = 4, min_area: int = 80):
+    b = (bin_img > 0).astype(np.uint8) * 255
+    cnts, _ = cv2.findContours(b, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not cnts:
+        return bin_img
+
+    cnts = [c for c in cnts if cv2.contourArea(c) >= min_area]
+    if not cnts:
+        return bin_img
+
+    x, y, w, h = cv2.boundingRect(np.vstack(cnts))
+    H, W = bin_img.shape[:2]
+
+    x1 = max(0, x - pad)
+    y1 = max(0, y - pad)
+    x2 = min(W, x + w + pad)
+    y2 = min(H, y + h + pad)
+
+    return bin_img[y1:y2, x1:x2]
+
+
+def _leading_true(mask: np.ndarray) -> int:
+    return mask.size if mask.all() else int(np.argmin(mask))
+
+
+def shave_lr_edges(bin_img: np.ndarray, edge_white_frac: float = 0.55, max_shave: int = 200):
+    if bin_img is None or bin_img.size == 0:
+        return bin_img
+
+    h, w = bin_img.shape[:2]
+    # Columnas "de borde" (mayoría blanca): se recortan las rachas iniciales y finales
+    edge = np.count_nonzero(bin_img, axis=0) / h >= edge_white_frac
+    limit = min(max_shave, w - 1)
+    left = min(_leading_true(edge), limit)
+    right = w - 1 - min(_leading_true(edge[::-1]), limit)
+
+    if right - left < 10:
+        return bin_img
+
+    return bin_img[:, left:right+1]
@@ -0,0 +1,105 @@
+import time
+from functools import lru_cache
+from typing import NamedTuple, Optional
+import cv2
+import numpy as np
+from app.core.config import settings
+from app.core.metrics import STAGE_SECONDS
+
+
+class DeskewResult(NamedTuple):
+    image: np.ndarray          # entrada rotada, o el mismo array (sin copia) si no se rota
+    gray: np.ndarray           # `image` en gris a resolución completa, reutilizable por las etapas siguientes
+    angle: Optional[float]     # ángulo estimado (grados); None si no hubo suficientes caracteres
+    rotated: bool
+    ms: float                  # costo medido (estimación + warp)
+
+
+class PlateDeskewer:
+    """
+    Plate deskew: the angle is estimated on a grayscale thumbnail of at most
+    `thumb_height` px (same contour heuristics as before, with pixel
+    thresholds scaled to the thumbnail) and the warp only runs when the angle
+    falls inside [min_angle, max_angle]. Otherwise the input array is returned
+    as-is, together with its grayscale conversion.
+    """
+    def __init__(self, thumb_height: int = 64, min_angle: float = 0.5, max_angle: float = 10.0):
+        self.thumb_height = thumb_height
+        self.min_angle = min_angle
+        self.max_angle = max_angle
+
+    def estimate_angle(self, gray: np.ndarray) -> Optional[float]:
+        h_img, w_img = gray.shape[:2]
+        # Skip deskewing for very small images
+        if h_img < 30 or w_img < 60:
+            return None
+
+        s = 1.0
+        if self.thumb_height and h_img > self.thumb_height:
+            s = self.thumb_height / h_img
+            gray = cv2.resize(gray, (max(1, round(w_img * s)), self.thumb_height), interpolation=cv2.INTER_AREA)
+        h = gray.shape[0]
+
+        # Adaptive threshold (text as foreground), block 19 at the original resolution
+        block = max(3, int(round(19 * s)) | 1)
+        thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, block, 9)
+        cnts, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if len(cnts) < 3:
+            return None
+
+        # Character-like contours: significant height, letter/digit aspect ratio
+        min_area = 50 * s * s
+        min_h, max_h = h * 0.15, h * 0.95
+        chars = []
+        for c in cnts:
+            if cv2.contourArea(c) < min_area:
+                continue
+            _, _, w, ch = cv2.boundingRect(c)
+            aspect = w / float(ch) if ch > 0 else 0
+            if min_h < ch < max_h and 0.15 < aspect < 2.5:
+                chars.append(c)
+        if len(chars) < 3:
+            return None
+
+        (_, _), (width, height), angle = cv2.minAreaRect(np.vstack(chars))
+        # Align the longest side horizontally, normalized to [-45, 45]
+        if width < height:
+            angle = angle + 90
+        if angle > 45:
+            angle = angle - 90
+        elif angle < -45:
+            angle = angle + 90
+        return float(angle)
+
+    def __call__(self, img: np.ndarray, gray: Optional[np.ndarray] = None, color: bool = True) -> DeskewResult:
+        """
+        Deskews `img` (BGR or gray). With `color=False` only the grayscale is
+        warped and `image` is the rotated gray (cheaper when the caller only
+        needs gray downstream).
+        """
+        started = time.perf_counter()
+        if gray is None:
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+        angle = self.estimate_angle(gray)
+
+        # VERY conservative: only correct small tilts
+        rotated = angle is not None and self.min_angle <= abs(angle) <= self.max_angle
+        if rotated:
+            h, w = gray.shape[:2]
+            m = cv2.getRotationMatrix2D((w // 2, h // 2), angle, 1.0)
+
+            def warp(src):
+                return cv2.warpAffine(src, m, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+
+            gray = warp(gray)
+            img = warp(img) if color and img.ndim == 3 else gray
+
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe("deskew", value=elapsed)
+        return DeskewResult(img if color else gray, gray, angle, rotated, elapsed * 1000.0)
+
+
+@lru_cache()
+def default_deskewer() -> PlateDeskewer:
+    """PlateDeskewer con la miniatura de settings (DESKEW_THUMB_HEIGHT)."""
+    return PlateDeskewer(thumb_height=settings.deskew_thumb_height)
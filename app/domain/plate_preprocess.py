@@ -0,0 +1,233 @@
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import cv2
+import numpy as np
+from app.core.config import settings
+from app.core.metrics import PREPROCESS_STEP_SECONDS
+from app.domain.plate_crop import crop_bbox_text, crop_lr_by_projection, shave_lr_edges
+from app.domain.plate_deskew import DeskewResult, PlateDeskewer
+
+class PreprocessContext:
+    """
+    State shared by the steps of one run. `scale` is the applied upscale over
+    the original fixed 5x: pixel parameters (kernels, block size, margins) are
+    multiplied by it so each step covers the same source area as before.
+    """
+    def __init__(self):
+        self.scale = 1.0
+        self.deskew: Optional[DeskewResult] = None
+        self.timings: Dict[str, float] = {}
+
+    def px(self, value: float, minimum: int = 1) -> int:
+        return max(minimum, int(round(value * self.scale)))
+
+    def odd(self, value: float, minimum: int = 3) -> int:
+        v = self.px(value, minimum)
+        return v if v % 2 else v + 1
+
+
+class Step(NamedTuple):
+    name: str
+    fn: Callable[..., np.ndarray]
+    params: dict
+
+
+# --- Objetos cacheados -------------------------------------------------------
+
+@lru_cache(maxsize=32)
+def rect_kernel(w: int, h: int) -> np.ndarray:
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (w, h))
+    kernel.flags.writeable = False
+    return kernel
+
+
+_clahe_local = threading.local()
+
+
+def clahe(clip_limit: float, tile: int):
+    """CLAHE cacheado por hilo: `apply` usa buffers internos y no es thread-safe."""
+    cache = getattr(_clahe_local, "cache", None)
+    if cache is None:
+        cache = _clahe_local.cache = {}
+    key = (clip_limit, tile)
+    obj = cache.get(key)
+    if obj is None:
+        obj = cache[key] = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(tile, tile))
+    return obj
+
+
+# --- Pasos ---------------------------------------------------------------------
+
+@lru_cache(maxsize=8)
+def deskewer(thumb_height: int, min_angle: float, max_angle: float) -> PlateDeskewer:
+    return PlateDeskewer(thumb_height, min_angle, max_angle)
+
+
+def step_deskew(img, ctx, thumb_height: int = 64, min_angle: float = 0.5, max_angle: float = 10.0):
+    # Solo se rota el gris: el resto del pipeline trabaja en gris (el paso "gray" queda sin costo)
+    ctx.deskew = deskewer(thumb_height, min_angle, max_angle)(img, color=False)
+    return ctx.deskew.image
+
+
+def step_band(img, ctx, top: float = 0.30, bottom: float = 0.75):
+    # Excluye "HONDURAS" arriba y "CENTROAMERICA" abajo
+    h = img.shape[0]
+    return img[int(h * top):int(h * bottom), :]
+
+
+def step_resize(img, ctx, target_char_height: float = 0.0, char_frac: float = 0.8,
+                fixed_factor: float = 5.0, min_factor: float = 1.0, max_factor: float = 5.0):
+    """
+    Escala para que los caracteres (~`char_frac` de la banda) midan
+    `target_char_height` px. Con target 0 se usa `fixed_factor` (comportamiento original).
+    """
+    h = img.shape[0]
+    if target_char_height > 0 and h > 0:
+        factor = min(max_factor, max(min_factor, target_char_height / (h * char_frac)))
+    else:
+        factor = fixed_factor
+    ctx.scale = factor / fixed_factor
+    if abs(factor - 1.0) < 1e-3:
+        return img
+    interp = cv2.INTER_CUBIC if factor > 1 else cv2.INTER_AREA
+    return cv2.resize(img, None, fx=factor, fy=factor, interpolation=interp)
+
+
+def step_gray(img, ctx):
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+
+
+def step_blur(img, ctx, ksize: int = 3):
+    k = ctx.odd(ksize, minimum=1)
+    return cv2.GaussianBlur(img, (k, k), 0) if k > 1 else img
+
+
+def step_unsharp(img, ctx, amount: float = 0.5, sigma: float = 1.0):
+    # Unsharp mask to recover edges
+    blurred = cv2.GaussianBlur(img, (0, 0), max(0.2, sigma * ctx.scale))
+    return cv2.addWeighted(img, 1.0 + amount, blurred, -amount, 0)
+
+
+def step_clahe(img, ctx, clip_limit: float = 2.0, tile: int = 8):
+    return clahe(clip_limit, tile).apply(img)
+
+
+def _balance_score(img: np.ndarray) -> float:
+    return abs(0.5 - cv2.countNonZero(img) / img.size)
+
+
+def step_threshold(img, ctx, block: int = 25, c: float = 5):
+    """Inverted adaptive threshold vs Otsu: keeps the one closer to 50% foreground."""
+    thr_adapt = cv2.adaptiveThreshold(
+        img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, ctx.odd(block), c
+    )
+    _, thr_otsu = cv2.threshold(img, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    return thr_adapt if _balance_score(thr_adapt) < _balance_score(thr_otsu) else thr_otsu
+
+
+def step_morph(img, ctx, op: str = "close", size: int = 2):
+    k = ctx.px(size)
+    if k < 2:
+        return img
+    morph = cv2.MORPH_CLOSE if op == "close" else cv2.MORPH_OPEN
+    return cv2.morphologyEx(img, morph, rect_kernel(k, k), iterations=1)
+
+
+def step_shave(img, ctx, edge_white_frac: float = 0.55, max_shave: int = 200):
+    return shave_lr_edges(img, edge_white_frac=edge_white_frac, max_shave=ctx.px(max_shave))
+
+
+def step_crop_projection(img, ctx, margin: int = 8, min_col_frac: float = 0.01):
+    return crop_lr_by_projection(img, margin=ctx.px(margin), min_col_frac=min_col_frac)
+
+
+def step_crop_text(img, ctx, pad: int = 6, min_area: int = 120):
+    return crop_bbox_text(img, pad=ctx.px(pad), min_area=max(1, int(round(min_area * ctx.scale ** 2))))
+
+
+STEPS: Dict[str, Callable[..., np.ndarray]] = {
+    "deskew": step_deskew,
+    "band": step_band,
+    "resize": step_resize,
+    "gray": step_gray,
+    "blur": step_blur,
+    "unsharp": step_unsharp,
+    "clahe": step_clahe,
+    "threshold": step_threshold,
+    "morph": step_morph,
+    "shave": step_shave,
+    "crop_projection": step_crop_projection,
+    "crop_text": step_crop_text,
+}
+
+# Pipeline de placas: mismos pasos y parámetros que el preprocess_for_ocr original
+# (parámetros en px calibrados para el 5x fijo; se reescalan con ctx.scale)
+PLATE_STEPS: Sequence[Tuple[str, dict]] = (
+    ("deskew", {"thumb_height": 64, "min_angle": 0.5, "max_angle": 10.0}),
+    ("band", {"top": 0.30, "bottom": 0.75}),
+    ("resize", {"target_char_height": 64, "max_factor": 5.0}),
+    ("gray", {}),
+    ("blur", {"ksize": 3}),
+    ("unsharp", {"amount": 0.5, "sigma": 1.0}),
+    ("clahe", {"clip_limit": 2.0, "tile": 8}),
+    ("threshold", {"block": 25, "c": 5}),
+    ("morph", {"op": "close", "size": 2}),
+    ("morph", {"op": "open", "size": 2}),
+    ("shave", {"edge_white_frac": 0.55, "max_shave": 200}),
+    ("crop_projection", {"margin": 8, "min_col_frac": 0.01}),
+    ("crop_text", {"pad": 6, "min_area": 120}),
+)
+
+
+class PlatePreprocessor:
+    """
+    Declarative preprocessing pipeline: an ordered list of (step, params)
+    resolved against STEPS. Each step is timed into
+    `plate_preprocess_step_seconds{step}`; `run(..., trace=True)` also returns
+    the per-step milliseconds.
+    """
+    def __init__(self, steps: List[Step]):
+        if not steps:
+            raise ValueError("Preprocess pipeline needs at least one step")
+        self.steps = steps
+
+    @classmethod
+    def from_spec(cls, spec: Sequence[Tuple[str, dict]], overrides: Optional[Dict[str, dict]] = None,
+                  skip: Sequence[str] = ()) -> "PlatePreprocessor":
+        overrides = overrides or {}
+        steps = []
+        for name, params in spec:
+            if name not in STEPS:
+                raise ValueError(f"Unknown preprocess step: {name!r}")
+            if name in skip:
+                continue
+            steps.append(Step(name, STEPS[name], {**params, **overrides.get(name, {})}))
+        return cls(steps)
+
+    def run(self, img: np.ndarray, trace: bool = False):
+        if img is None or img.size == 0:
+            raise ValueError("Empty plate image for OCR preprocessing")
+        ctx = PreprocessContext()
+        for step in self.steps:
+            started = time.perf_counter()
+            img = step.fn(img, ctx, **step.params)
+            elapsed = time.perf_counter() - started
+            PREPROCESS_STEP_SECONDS.observe(step.name, value=elapsed)
+            ctx.timings[step.name] = ctx.timings.get(step.name, 0.0) + elapsed * 1000.0
+            if img is None or img.size == 0:
+                raise ValueError(f"OCR preprocessing returned an empty image (step {step.name!r})")
+        return (img, ctx.timings) if trace else img
+
+
+@lru_cache()
+def default_preprocessor() -> PlatePreprocessor:
+    """PLATE_STEPS con la altura objetivo de settings (PREPROCESS_TARGET_CHAR_HEIGHT=0 -> 5x fijo original)."""
+    return PlatePreprocessor.from_spec(PLATE_STEPS, overrides={
+        "deskew": {"thumb_height": settings.deskew_thumb_height},
+        "resize": {
+            "target_char_height": settings.preprocess_target_char_height,
+            "max_factor": settings.preprocess_max_upscale,
+        },
+    })
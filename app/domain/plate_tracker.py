@@ -0,0 +1,217 @@
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+from app.domain.models import BoundingBox
+from app.domain.ocr_cascade import score_candidate
+
+
+def box_iou(a: BoundingBox, b: BoundingBox) -> float:
+    ix = max(0, min(a.x + a.w, b.x + b.w) - max(a.x, b.x))
+    iy = max(0, min(a.y + a.h, b.y + b.h) - max(a.y, b.y))
+    inter = ix * iy
+    union = a.w * a.h + b.w * b.h - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _center_distance(a: BoundingBox, b: BoundingBox) -> float:
+    dx = (a.x + a.w / 2) - (b.x + b.w / 2)
+    dy = (a.y + a.h / 2) - (b.y + b.h / 2)
+    return (dx * dx + dy * dy) ** 0.5
+
+
+class AdaptiveSampler:
+    """
+    Decide cada cuánto muestrear y si vale la pena llamar al detector:
+
+    - sin placas a la vista se muestrea cada `idle_ms`; tras una detección
+      se pasa a `active_ms` durante `hold_ms`;
+    - en reposo, un frame sin movimiento respecto al último analizado no
+      pasa por el detector, salvo que hayan pasado `max_skip_ms` desde la
+      última detección. Movimiento = % de píxeles de una miniatura en gris
+      que cambian más de `PIXEL_DELTA` niveles.
+    """
+    THUMB_SIZE = (64, 36)
+    PIXEL_DELTA = 25
+
+    def __init__(self, idle_ms: float = 500.0, active_ms: float = 100.0, hold_ms: float = 1500.0,
+                 motion_threshold: float = 1.0, max_skip_ms: float = 2000.0):
+        self.idle_ms = idle_ms
+        self.active_ms = active_ms
+        self.hold_ms = hold_ms
+        self.motion_threshold = motion_threshold
+        self.max_skip_ms = max_skip_ms
+        self._active_until = -1.0
+        self._last_detect_ms: Optional[float] = None
+        self._last_thumb: Optional[np.ndarray] = None
+
+    def active(self, ts_ms: float) -> bool:
+        return ts_ms <= self._active_until
+
+    def stride_frames(self, ts_ms: float, fps: float) -> int:
+        """Frames a saltar antes del próximo muestreo."""
+        interval = self.active_ms if self.active(ts_ms) else self.idle_ms
+        return max(0, int(round(interval * fps / 1000.0)) - 1)
+
+    def should_detect(self, ts_ms: float, frame_bgr: np.ndarray) -> bool:
+        small = cv2.resize(frame_bgr, self.THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        thumb = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        previous, self._last_thumb = self._last_thumb, thumb
+        if previous is None or self.active(ts_ms) or self.motion_threshold <= 0:
+            return True
+        if self._last_detect_ms is None or ts_ms - self._last_detect_ms >= self.max_skip_ms:
+            return True
+        changed = np.count_nonzero(cv2.absdiff(thumb, previous) > self.PIXEL_DELTA)
+        return changed * 100.0 / thumb.size >= self.motion_threshold
+
+    def detector_called(self, ts_ms: float, found: bool):
+        self._last_detect_ms = ts_ms
+        if found:
+            self._active_until = ts_ms + self.hold_ms
+
+
+class PlateTrack:
+    def __init__(self, track_id: int, ts_ms: float, bbox: BoundingBox, det_conf: float):
+        self.track_id = track_id
+        self.first_ms = ts_ms
+        self.last_ms = ts_ms
+        self.bbox = bbox
+        self.frames = 1
+        self.best_det_conf = det_conf
+        self.ocr_det_conf = -1.0  # confianza de detección del último frame enviado a OCR
+        self.ocr_calls = 0
+        self.votes: Counter = Counter()
+        self.best: Optional[dict] = None
+        self.best_score = -1.0
+
+    def add_reading(self, ts_ms: float, bbox: BoundingBox, det_conf: float,
+                    plate_text: str, raw_text: str, ocr_conf: float, variant: Optional[str]):
+        if plate_text:
+            self.votes[plate_text] += 1
+        score = score_candidate(plate_text, raw_text, ocr_conf)
+        if score > self.best_score:
+            self.best_score = score
+            self.best = {
+                "plateText": plate_text,
+                "rawText": raw_text,
+                "ocrConf": ocr_conf,
+                "ocrVariant": variant,
+                "detConf": det_conf,
+                "frameMs": round(ts_ms, 1),
+                "bbox": {"x": bbox.x, "y": bbox.y, "w": bbox.w, "h": bbox.h},
+            }
+
+    def plate_text(self) -> str:
+        if not self.votes:
+            return ""
+        # Mayoría de lecturas; empate -> la de la mejor lectura individual
+        best_text = self.best["plateText"] if self.best else ""
+        return max(self.votes, key=lambda text: (self.votes[text], text == best_text))
+
+
+class PlateTracker:
+    """
+    Agrupa detecciones de frames muestreados en "tracks" (un vehículo) por
+    solapamiento/cercanía de la caja y continuidad temporal, y decide qué
+    frames merecen OCR: el primero de cada track y los que mejoran la
+    confianza de detección en al menos `improve_margin`, hasta
+    `max_ocr_per_track` lecturas.
+    """
+    def __init__(self, gap_ms: float = 1500.0, iou_threshold: float = 0.1, improve_margin: float = 0.05,
+                 max_ocr_per_track: int = 4, min_frames: int = 2):
+        self.gap_ms = gap_ms
+        self.iou_threshold = iou_threshold
+        self.improve_margin = improve_margin
+        self.max_ocr_per_track = max(1, max_ocr_per_track)
+        self.min_frames = max(1, min_frames)
+        self._open: List[PlateTrack] = []
+        self._closed: List[PlateTrack] = []
+        self._next_id = 1
+
+    def _match(self, ts_ms: float, bbox: BoundingBox) -> Optional[PlateTrack]:
+        best, best_key = None, None
+        for track in self._open:
+            if ts_ms - track.last_ms > self.gap_ms:
+                continue
+            iou = box_iou(track.bbox, bbox)
+            near = _center_distance(track.bbox, bbox) <= 1.5 * max(track.bbox.w, bbox.w)
+            if iou < self.iou_threshold and not near:
+                continue
+            key = (iou, -track.last_ms)
+            if best_key is None or key > best_key:
+                best, best_key = track, key
+        return best
+
+    def update(self, ts_ms: float, bbox: BoundingBox, det_conf: float) -> Tuple[PlateTrack, bool]:
+        """Registra una detección; devuelve (track, hay_que_hacer_ocr)."""
+        self.expire(ts_ms)
+        track = self._match(ts_ms, bbox)
+        if track is None:
+            track = PlateTrack(self._next_id, ts_ms, bbox, det_conf)
+            self._next_id += 1
+            self._open.append(track)
+        else:
+            track.last_ms = ts_ms
+            track.bbox = bbox
+            track.frames += 1
+            track.best_det_conf = max(track.best_det_conf, det_conf)
+
+        needs_ocr = track.ocr_calls < self.max_ocr_per_track and (
+            track.ocr_calls == 0 or det_conf >= track.ocr_det_conf + self.improve_margin
+        )
+        if needs_ocr:
+            track.ocr_calls += 1
+            track.ocr_det_conf = det_conf
+        return track, needs_ocr
+
+    def expire(self, ts_ms: float):
+        still_open = []
+        for track in self._open:
+            (still_open if ts_ms - track.last_ms <= self.gap_ms else self._closed).append(track)
+        self._open = still_open
+
+    def has_open_tracks(self) -> bool:
+        return bool(self._open)
+
+    def events(self) -> List[dict]:
+        """
+        Cierra todos los tracks y devuelve un evento por vehículo. Tracks
+        consecutivos con la misma placa separados por menos de 2 * gap_ms se
+        fusionan (oclusiones breves); los tracks sin lectura válida y con
+        menos de `min_frames` frames se descartan como falsos positivos.
+        """
+        tracks = sorted(self._closed + self._open, key=lambda t: t.first_ms)
+        self._closed, self._open = [], []
+
+        merged: List[Tuple[str, List[PlateTrack]]] = []
+        last_by_text: Dict[str, int] = {}
+        for track in tracks:
+            text = track.plate_text()
+            if not text and track.frames < self.min_frames:
+                continue
+            idx = last_by_text.get(text) if text else None
+            if idx is not None and track.first_ms - merged[idx][1][-1].last_ms <= 2 * self.gap_ms:
+                merged[idx][1].append(track)
+                continue
+            merged.append((text, [track]))
+            if text:
+                last_by_text[text] = len(merged) - 1
+
+        events = []
+        for event_id, (text, group) in enumerate(merged, start=1):
+            best = max((t for t in group if t.best), key=lambda t: t.best_score, default=None)
+            votes: Counter = Counter()
+            for t in group:
+                votes.update(t.votes)
+            events.append({
+                "eventId": event_id,
+                "plateText": text or None,
+                "firstSeenMs": round(group[0].first_ms, 1),
+                "lastSeenMs": round(max(t.last_ms for t in group), 1),
+                "frames": sum(t.frames for t in group),
+                "ocrCalls": sum(t.ocr_calls for t in group),
+                "detConf": max(t.best_det_conf for t in group),
+                "votes": dict(votes),
+                "best": best.best if best else None,
+            })
+        return events
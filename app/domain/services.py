@@ -1,4 +1,5 @@
 import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 # =========================
 # DOMAIN LOGIC (Pure Python)
@@ -28,8 +29,11 @@ DIGIT_FIX = str.maketrans({
 })
 
 
+_NON_ALNUM_RE = re.compile(r"[\W_]+")
+
+
 def clean_alnum_upper(s: str) -> str:
-    return "".join(ch for ch in (s or "").upper() if ch.isalnum())
+    return _NON_ALNUM_RE.sub("", (s or "").upper())
 
 LETTER_FIRST_FIX = {
     "I": "T",
@@ -37,93 +41,175 @@ LETTER_FIRST_FIX = {
     "1": "T",
 }
 
-def _fix_first_letter(s: str) -> str:
-    if s and s[0] in LETTER_FIRST_FIX:
-        return LETTER_FIRST_FIX[s[0]] + s[1:]
-    return s
+PLATE_LEN = 7  # AAA####
 
 
-def normalize_hn_plate(raw_text: str) -> str:
+def _table_chars(table: dict) -> str:
+    return "".join(sorted(chr(k) if isinstance(k, int) else k for k in table))
+
+
+# Clases por posición precompiladas desde las tablas de confusión: una sola
+# búsqueda (lookahead, ventanas solapadas) devuelve toda ventana corregible.
+_LETTER_CLASS = "A-Z" + re.escape(_table_chars(LETTER_FIX))
+_DIGIT_CLASS = "0-9" + re.escape(_table_chars(DIGIT_FIX))
+_PLATE_WINDOW_RE = re.compile(rf"(?=([{_LETTER_CLASS}]{{3}}[{_DIGIT_CLASS}]{{4}}))")
+_LOST_LETTER_RE = re.compile(rf"[{_LETTER_CLASS}]{{2}}[{_DIGIT_CLASS}]{{4}}")
+_FIRST_FIX = str.maketrans(LETTER_FIRST_FIX)
+_DROP_DIGITS = str.maketrans("", "", "0123456789")
+_DROP_LETTERS = str.maketrans("", "", "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+
+class PlateReading(NamedTuple):
+    text: str          # "AAA 1234"
+    score: float       # 1.0 = leído tal cual; baja con cada corrección
+    corrections: int   # caracteres corregidos (o insertados)
+    start: int         # inicio de la ventana en el texto limpio (-1 si hubo inserción)
+
+
+def _reading(letters: str, digits: str, corrections: int, start: int) -> PlateReading:
+    return PlateReading(f"{letters} {digits}", round(1.0 - corrections / PLATE_LEN, 3), corrections, start)
+
+
+def _score_window(window: str) -> Tuple[int, str, str]:
+    # En la primera posición de una ventana corregida I/L/1 se leen como T (camiones)
+    first = window[0].translate(_FIRST_FIX)
+    letters = first.translate(LETTER_FIX) + window[1:3].translate(LETTER_FIX)
+    digits = window[3:].translate(DIGIT_FIX)
+    cost = (first != window[0] or window[0].isdigit()) + (2 - len(window[1:3].translate(_DROP_DIGITS))) \
+        + (4 - len(window[3:].translate(_DROP_LETTERS)))
+    return cost, letters, digits
+
+
+def _best_window(cleaned: str) -> Optional[PlateReading]:
+    """Scores every correctable 7-char window: fewest corrections wins, leftmost on ties."""
+    best = None
+    for m in _PLATE_WINDOW_RE.finditer(cleaned):
+        cost, letters, digits = _score_window(m.group(1))
+        if best is None or cost < best.corrections:
+            best = _reading(letters, digits, cost, m.start())
+            if cost <= 1:  # 0 ya lo resolvió la búsqueda directa
+                break
+    return best
+
+
+def _six_char_reading(cleaned: str) -> Optional[PlateReading]:
     """
-    Extracts Honduras plate: AAA#### -> 'AAA 1234'.
-    Applies position-aware letter/digit corrections.
+    6-char readings with a lost letter: "T13368" -> "TCI 3368" ("1" read as
+    "C" plus the missing "I"), otherwise 2 letters + 4 digits + inserted "I".
+    """
+    if not _LOST_LETTER_RE.fullmatch(cleaned):
+        return None
+    letters = cleaned[:2].translate(LETTER_FIX)
+    if cleaned[1] == "1" and cleaned[2:].isdigit():
+        return _reading(letters[0] + "CI", cleaned[2:], 2 + cleaned[0].isdigit(), -1)
+    digits = cleaned[2:].translate(DIGIT_FIX)
+    cost = 1 + (2 - len(cleaned[:2].translate(_DROP_DIGITS))) + (4 - len(cleaned[2:].translate(_DROP_LETTERS)))
+    return _reading(letters + "I", digits, cost, -1)
+
+
+def read_hn_plate(raw_text: str) -> Optional[PlateReading]:
+    """
+    Best Honduras plate reading (AAA####) in an OCR string, with its score.
+    An exact match wins; otherwise every 7-char window is scored with the
+    per-position confusion tables (LETTER_FIX, DIGIT_FIX, LETTER_FIRST_FIX).
     """
     cleaned = clean_alnum_upper(raw_text)
     if not cleaned:
-        return ""
+        return None
 
-    # Try fixing first letter confusion (I/L -> T) for trucks
-    cleaned_first_fixed = _fix_first_letter(cleaned)
-
-    # Direct match
     m = HN_PLATE_RE.search(cleaned)
-    if not m:
-        m = HN_PLATE_RE.search(cleaned_first_fixed)
     if m:
-        letters = m.group(1)
-        digits = m.group(2)
-        return f"{letters} {digits}"
-
-    # Special case: Handle when OCR reads letters as digits in first 3 positions
-    # Example: "T13368" should be "TCI 3368" where "1" might be "C" or "I"
-    if len(cleaned) == 6:
-        # For 6-char strings like "T13368", try multiple interpretations
-        # Most common: missing one letter, or one letter read as digit
-        
-        # Interpretation 1: First char is letter, second is digit->letter, add missing I
-        # T13368 -> T + C (from 1) + I (added) + 3368
-        first = cleaned[0]
-        second_as_letter = cleaned[1].translate(LETTER_FIX)  # 1->I, but could be C
-        last_four = cleaned[2:]
-        
-        # Try with "C" instead of what LETTER_FIX gives
-        if cleaned[1] == '1':
-            # "1" could be "C" or "I"
-            # Try C first (more common in TCI pattern)
-            if re.fullmatch(r"\d{4}", last_four):
-                return f"{first}CI {last_four}"
-        
-        # Interpretation 2: Use LETTER_FIX translation + add I
-        lpart = cleaned[:2].translate(LETTER_FIX)
-        dpart = cleaned[2:].translate(DIGIT_FIX)
-        
-        if re.fullmatch(r"[A-Z]{2}", lpart) and re.fullmatch(r"\d{4}", dpart):
-            # We have 2 letters + 4 digits, add missing I
-            return f"{lpart}I {dpart}"
-    
-    # Handle 7+ character strings
-    if len(cleaned) >= 7:
-        # Try interpreting first 3 chars as letters (even if they contain digits)
-        # and last 4 as digits
-        for i in range(min(2, len(cleaned) - 4)):  # Try starting positions 0 and 1
-            chunk = cleaned[i:i + 7]
-                
-            # Apply first-letter correction
-            chunk = _fix_first_letter(chunk)
-            
-            lpart = chunk[:3].translate(LETTER_FIX)
-            dpart = chunk[3:].translate(DIGIT_FIX)
-
-            if re.fullmatch(r"[A-Z]{3}", lpart) and re.fullmatch(r"\d{4}", dpart):
-                return f"{lpart} {dpart}"
-
-    # Original 7-char window logic
-    if len(cleaned) < 7:
-        cleaned = cleaned_first_fixed
-        if len(cleaned) < 7:
-            return ""
-
-    for i in range(0, len(cleaned) - 6):
-        chunk = cleaned[i:i + 7]  # 3 letters + 4 digits
-        # Apply first-letter correction on the window
-        chunk = _fix_first_letter(chunk)
-        lpart = chunk[:3].translate(LETTER_FIX)
-        dpart = chunk[3:].translate(DIGIT_FIX)
-
-        if re.fullmatch(r"[A-Z]{3}", lpart) and re.fullmatch(r"\d{4}", dpart):
-            return f"{lpart} {dpart}"
-
-    return ""
+        return _reading(m.group(1), m.group(2), 0, m.start())
+    if len(cleaned) >= PLATE_LEN:
+        return _best_window(cleaned)
+    if len(cleaned) == PLATE_LEN - 1:
+        return _six_char_reading(cleaned)
+    return None
+
+
+def normalize_hn_plate(raw_text: str) -> str:
+    """
+    Extracts Honduras plate: AAA#### -> 'AAA 1234'.
+    Applies position-aware letter/digit corrections ("" when nothing fits).
+    """
+    reading = read_hn_plate(raw_text)
+    return reading.text if reading else ""
+
+
+def read_hn_plates(raw_texts: Iterable[str]) -> List[Optional[PlateReading]]:
+    """Batch read_hn_plate for bulk reprocessing; repeated strings are scored once."""
+    memo: Dict[str, Optional[PlateReading]] = {}
+    out = []
+    for raw in raw_texts:
+        if raw not in memo:
+            memo[raw] = read_hn_plate(raw)
+        out.append(memo[raw])
+    return out
+
+
+# Campos de la hoja de despacho: (campo, etiqueta + separador, valor con un grupo de captura)
+DISPATCH_FIELDS = (
+    ("anio", r"a(?:n|\u00f1)o[:\s]+", r"([0-9]{4})"),
+    ("telefono", r"tel(?:e|\u00e9)fono[:\s-]+", r"(.+)"),
+    ("motorista", r"motorista[:\s]+", r"(.+)"),
+    ("licencia", r"licen[cs]ia[:\s]+", r"(.+)"),
+    ("placa", r"placa[:\s]+", r"(.+)"),
+    ("color", r"color[:\s]+", r"(.+)"),
+    ("marca", r"marca[:\s]+", r"(.+)"),
+    ("motor", r"motor[:\s]+", r"(.+)"),
+    ("vin", r"(?:chasis\s*/?\s*vin|chasis|vin)[:\s]+", r"(.+)"),
+    ("codigo", r"c(?:o|\u00f3)digo[:\s]+", r"(.+)"),
+    ("transporte", r"transporte[:\s]+", r"(.+)"),
+    ("rtn", r"(?:rtn|rin)[:\s]+", r"(.+)"),
+)
+
+# Una sola alternación compilada: cada match consume solo etiqueta + separador
+# (el valor va en un lookahead), así finditer encuentra todas las etiquetas de
+# la línea en una pasada. Ninguna etiqueta empieza dentro de otra ni de un separador.
+# El lookahead inicial (primeras letras de las etiquetas) descarta rápido las
+# posiciones donde no empieza ninguna.
+_DISPATCH_LEXER = re.compile(
+    "(?=[aclmprtv])(?:" + "|".join(f"(?P<{name}>{label}(?={value}))" for name, label, value in DISPATCH_FIELDS) + ")",
+    re.IGNORECASE,
+)
+_DISPATCH_VALUE_GROUP = {name: _DISPATCH_LEXER.groupindex[name] + 1 for name, _, _ in DISPATCH_FIELDS}
+_DISPATCH_TIME_RE = re.compile(r"(\d{1,2}:\d{2})")
+_NON_DIGIT_RE = re.compile(r"\D+")
+_NON_LICENSE_RE = re.compile(r"[^0-9-]")
+_FIELD_STRIP = " -:_,.;"
+
+
+def _normalize_phone(raw: str) -> str:
+    digits = _NON_DIGIT_RE.sub("", raw or "")
+    if len(digits) == 8:
+        return f"{digits[:4]}-{digits[4:]}"
+    if len(digits) == 9:  # sometimes leading digit for country
+        return f"{digits[1:5]}-{digits[5:]}"
+    return raw.strip()
+
+
+def _lex_dispatch_lines(lines: List[str]) -> Tuple[Dict[str, str], str, str]:
+    """
+    Single pass over the lines: first value of every field (first line where
+    its label appears, leftmost occurrence), the dispatch time and the first
+    line starting with "motorista" (fallback for the driver name).
+    """
+    values: Dict[str, str] = {}
+    dispatch_time = ""
+    motorista_line = ""
+    for ln in lines:
+        low = ln.lower()
+        if not dispatch_time and "despacho" in low:
+            m = _DISPATCH_TIME_RE.search(ln)
+            if m:
+                dispatch_time = m.group(1)
+        if not motorista_line and low.startswith("motorista"):
+            motorista_line = ln
+        for m in _DISPATCH_LEXER.finditer(ln):
+            name = m.lastgroup
+            if name not in values:
+                values[name] = m.group(_DISPATCH_VALUE_GROUP[name]).strip(_FIELD_STRIP)
+    return values, dispatch_time, motorista_line
 
 
 def parse_dispatch_info(raw_text: str) -> dict:
@@ -132,71 +218,42 @@ def parse_dispatch_info(raw_text: str) -> dict:
     Returns a dict with cleaned values (empty strings if missing).
     """
     lines = [ln.strip() for ln in (raw_text or "").splitlines() if ln.strip()]
+    values, dispatch_time, motorista_line = _lex_dispatch_lines(lines)
 
-    def match_field(pattern: str):
-        for ln in lines:
-            m = re.search(pattern, ln, re.IGNORECASE)
-            if m:
-                groups = [g for g in m.groups() if g]
-                value = groups[-1] if groups else m.group(1)
-                return value.strip(" -:_,.;")
-        return ""
-
-    def normalize_phone(raw: str) -> str:
-        digits = re.sub(r"\D+", "", raw or "")
-        if len(digits) == 8:
-            return f"{digits[:4]}-{digits[4:]}"
-        if len(digits) == 9:  # sometimes leading digit for country
-            return f"{digits[1:5]}-{digits[5:]}"
-        return raw.strip()
+    def field(name: str) -> str:
+        return values.get(name, "")
 
-    dispatch_time = ""
-    for ln in lines:
-        m = re.search(r"(\d{1,2}:\d{2})", ln)
-        if "despacho" in ln.lower() and m:
-            dispatch_time = m.group(1)
-            break
-
-    year_raw = match_field(r"a(?:n|\u00f1)o[:\s]+([0-9]{4})")
+    year_raw = field("anio")
     year_int = int(year_raw) if year_raw.isdigit() else None
 
-    phone_raw = match_field(r"tel(?:e|\u00e9)fono[:\s-]+(.+)")
-
-    motorista_val = match_field(r"motorista[:\s]+(.+)")
+    motorista_val = field("motorista")
     # Evita capturar la frase de la cabecera "para despacho..."
     if "despacho" in motorista_val.lower():
         motorista_val = ""
-    if not motorista_val:
-        for ln in lines:
-            if ln.lower().startswith("motorista"):
-                parts = ln.split(maxsplit=1)
-                if len(parts) == 2:
-                    motorista_val = parts[1].strip(" -:_,.;")
-                break
-
-    licencia_val = match_field(r"licen[cs]ia[:\s]+(.+)")
-    licencia_val = re.sub(r"[^0-9-]", "", licencia_val)
-
-    placa_val = match_field(r"placa[:\s]+(.+)")
-    placa_val = placa_val.replace(",", "").strip()
-
-    rtn_val = match_field(r"(?:rtn|rin)[:\s]+(.+)")
-    rtn_val = re.sub(r"[^\d]", "", rtn_val)
+    if not motorista_val and motorista_line:
+        parts = motorista_line.split(maxsplit=1)
+        if len(parts) == 2:
+            motorista_val = parts[1].strip(_FIELD_STRIP)
 
     # Build payload with Spanish keys as requested
     return {
         "horaDespacho": dispatch_time,
         "motorista": motorista_val,
-        "licencia": licencia_val,
-        "placa": placa_val,
-        "telefono": normalize_phone(phone_raw),
-        "color": match_field(r"color[:\s]+(.+)"),
-        "marca": match_field(r"marca[:\s]+(.+)"),
+        "licencia": _NON_LICENSE_RE.sub("", field("licencia")),
+        "placa": field("placa").replace(",", "").strip(),
+        "telefono": _normalize_phone(field("telefono")),
+        "color": field("color"),
+        "marca": field("marca"),
         "anio": year_int or year_raw,
-        "motor": match_field(r"motor[:\s]+(.+)"),
-        "vin": match_field(r"(?:chasis\s*/?\s*vin|chasis|vin)[:\s]+(.+)"),
-        "codigo": match_field(r"c(?:o|\u00f3)digo[:\s]+(.+)"),
-        "transporte": match_field(r"transporte[:\s]+(.+)"),
-        "rtn": rtn_val,
+        "motor": field("motor"),
+        "vin": field("vin"),
+        "codigo": field("codigo"),
+        "transporte": field("transporte"),
+        "rtn": _NON_DIGIT_RE.sub("", field("rtn")),
         "lineas": lines,
     }
+
+
+def parse_dispatch_infos(raw_texts: Iterable[str]) -> List[dict]:
+    """Batch parse_dispatch_info for bulk re-parsing of stored OCR text."""
+    return [parse_dispatch_info(raw) for raw in raw_texts]
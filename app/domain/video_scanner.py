@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from typing import List
+import numpy as np
+from app.core.config import Settings
+from app.core.executors import InferenceExecutors
+from app.domain import image_utils
+from app.domain.models import DetectionResult
+from app.domain.ocr_cascade import OcrCascade
+from app.domain.plate_tracker import AdaptiveSampler, PlateTrack, PlateTracker
+from app.ports.detector_port import PlateDetectorPort
+from app.ports.video_source_port import VideoSourcePort
+
+logger = logging.getLogger(__name__)
+
+
+class VideoPlateScanner:
+    """
+    Recorre un video con muestreo adaptativo, detecta placas en los frames
+    muestreados y hace OCR solo cuando aparece un vehículo nuevo o mejora la
+    confianza de detección. Devuelve un evento deduplicado por vehículo.
+
+    El OCR corre en paralelo con el avance del video, acotado a
+    `ocr_concurrency` lecturas pendientes (si se llena, la lectura de frames espera).
+    """
+    def __init__(
+        self,
+        detector: PlateDetectorPort,
+        cascade: OcrCascade,
+        executors: InferenceExecutors,
+        cfg: Settings,
+    ):
+        self.detector = detector
+        self.cascade = cascade
+        self.executors = executors
+        self.cfg = cfg
+
+    def _sampler(self) -> AdaptiveSampler:
+        return AdaptiveSampler(
+            idle_ms=self.cfg.video_idle_sample_ms,
+            active_ms=self.cfg.video_active_sample_ms,
+            hold_ms=self.cfg.video_active_hold_ms,
+            motion_threshold=self.cfg.video_motion_threshold,
+            max_skip_ms=self.cfg.video_max_skip_ms,
+        )
+
+    def _tracker(self) -> PlateTracker:
+        return PlateTracker(
+            gap_ms=self.cfg.video_track_gap_ms,
+            iou_threshold=self.cfg.video_track_iou,
+            improve_margin=self.cfg.video_ocr_improve_margin,
+            max_ocr_per_track=self.cfg.video_max_ocr_per_track,
+            min_frames=self.cfg.video_min_track_frames,
+        )
+
+    @staticmethod
+    def _next_sample(source: VideoSourcePort, stride: int):
+        skipped = source.skip(stride) if stride else 0
+        return skipped, source.read()
+
+    async def _read_plate(self, sem: asyncio.Semaphore, track: PlateTrack, ts_ms: float,
+                          plate: np.ndarray, det: DetectionResult, stats: dict):
+        try:
+            thr = await self.executors.run("preprocess", image_utils.preprocess_for_ocr, plate)
+            outcome = await self.cascade.run(plate, thr, self.executors)
+            track.add_reading(ts_ms, det.box, det.confidence, outcome.plate_text, outcome.raw_text,
+                              outcome.confidence, outcome.variant)
+        except Exception as exc:
+            logger.warning("video OCR failed at %.0f ms: %s", ts_ms, exc)
+            stats["ocrErrors"] += 1
+        finally:
+            sem.release()
+
+    async def scan(self, source: VideoSourcePort) -> dict:
+        loop = asyncio.get_running_loop()
+        sampler = self._sampler()
+        tracker = self._tracker()
+        sem = asyncio.Semaphore(max(1, self.cfg.video_ocr_concurrency))
+        tasks: List[asyncio.Future] = []
+        stats = {
+            "framesRead": 0,
+            "framesSampled": 0,
+            "detectorCalls": 0,
+            "detections": 0,
+            "ocrCalls": 0,
+            "ocrErrors": 0,
+        }
+        started = time.perf_counter()
+        ts_ms = 0.0
+
+        try:
+            while True:
+                stride = sampler.stride_frames(ts_ms, source.fps) if stats["framesSampled"] else 0
+                # VideoCapture es secuencial: se lee fuera del loop pero de a un frame a la vez
+                skipped, item = await loop.run_in_executor(None, self._next_sample, source, stride)
+                stats["framesRead"] += skipped
+                if item is None:
+                    break
+                _, ts_ms, frame = item
+                stats["framesRead"] += 1
+                stats["framesSampled"] += 1
+
+                if not sampler.should_detect(ts_ms, frame):
+                    continue
+                det = await self.executors.run("detect", self.detector.detect_plate, frame)
+                stats["detectorCalls"] += 1
+                sampler.detector_called(ts_ms, det is not None)
+                if det is None:
+                    tracker.expire(ts_ms)
+                    continue
+                stats["detections"] += 1
+
+                track, needs_ocr = tracker.update(ts_ms, det.box, det.confidence)
+                if not needs_ocr:
+                    continue
+                b = det.box
+                # Copia del recorte: no retener el frame completo mientras espera el OCR
+                plate = image_utils.crop_with_padding(frame, b.x, b.y, b.x + b.w, b.y + b.h, pad=10).copy()
+                if plate.size == 0:
+                    continue
+                await sem.acquire()
+                stats["ocrCalls"] += 1
+                tasks.append(asyncio.ensure_future(self._read_plate(sem, track, ts_ms, plate, det, stats)))
+
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        events = tracker.events()
+        return {
+            "fps": source.fps,
+            "durationMs": round(source.frame_count * 1000.0 / source.fps if source.frame_count else ts_ms, 1),
+            "framesTotal": source.frame_count,
+            **stats,
+            "elapsedMs": round((time.perf_counter() - started) * 1000.0, 1),
+            "events": events,
+        }
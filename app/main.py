@@ -1,12 +1,87 @@
-from fastapi import FastAPI
-from app.api.routers import router
+import asyncio
+import logging
+import time
+import numpy as np
+from fastapi import FastAPI, Request
+from app.api.routers import (
+    router,
+    get_executors,
+    get_detector,
+    get_plate_ocr,
+    get_plate_ocr_block,
+    get_doc_ocr,
+    get_debug_artifacts,
+)
 from app.core.config import settings
+from app.core.readiness import readiness
+from app.core.metrics import REQUESTS_TOTAL, REQUESTS_INFLIGHT, REQUEST_SECONDS
+from app.domain import image_utils
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Plate Detector Service", version="1.0.0")
 
 # Register Routers
 app.include_router(router)
 
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    started = time.perf_counter()
+    REQUESTS_INFLIGHT.inc()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        REQUESTS_INFLIGHT.dec()
+        # Plantilla de la ruta (no la URL) para acotar la cardinalidad
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        REQUESTS_TOTAL.inc(path, str(status))
+        REQUEST_SECONDS.observe(path, value=time.perf_counter() - started)
+
+
+def _warmup():
+    """
+    Carga los adaptadores y ejecuta inferencias de prueba para que el primer
+    request no pague la carga del modelo ni de Tesseract.
+    """
+    try:
+        detector = readiness.load("detector.load", get_detector)
+        dummy = np.zeros((settings.img_size, settings.img_size, 3), dtype=np.uint8)
+        readiness.load("detector.warmup", lambda: detector.detect_plate(dummy))
+
+        plate = np.full((60, 200, 3), 255, dtype=np.uint8)
+        band = np.full((40, 200), 255, dtype=np.uint8)
+        readiness.load("preprocess.warmup", lambda: image_utils.preprocess_for_ocr(plate))
+
+        plate_ocr = readiness.load("plate_ocr.load", get_plate_ocr)
+        readiness.load("plate_ocr.warmup", lambda: plate_ocr.extract_text(band))
+        block_ocr = readiness.load("plate_ocr_block.load", get_plate_ocr_block)
+        readiness.load("plate_ocr_block.warmup", lambda: block_ocr.extract_text(band))
+        doc_ocr = readiness.load("doc_ocr.load", get_doc_ocr)
+        readiness.load("doc_ocr.warmup", lambda: doc_ocr.extract_text(band))
+    except Exception:
+        logger.exception("warmup failed, service stays unready")
+        return
+    readiness.mark_ready()
+
+
 @app.on_event("startup")
-def startup_event():
-    pass
+async def startup_event():
+    readiness.reset()
+    # Crea los pools de inferencia antes de recibir tráfico
+    get_executors()
+    get_debug_artifacts()
+    if settings.warmup:
+        # En segundo plano: /health responde mientras /ready sigue en 503
+        asyncio.get_running_loop().run_in_executor(None, _warmup)
+    else:
+        readiness.mark_ready()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    get_executors().shutdown(wait=False)
+    get_executors.cache_clear()
@@ -0,0 +1,11 @@
+from typing import Dict, Protocol
+import numpy as np
+
+
+class DebugArtifactPort(Protocol):
+    def capture(self, uid: str, images: Dict[str, np.ndarray], meta: dict, failed: bool = False) -> bool:
+        """Encola imágenes de diagnóstico; devuelve False si se descartan (muestreo o cola llena)."""
+        ...
+
+    def stats(self) -> dict:
+        ...
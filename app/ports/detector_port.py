@@ -1,4 +1,4 @@
-from typing import Protocol, Optional
+from typing import List, Protocol, Optional
 import numpy as np
 from app.domain.models import DetectionResult
 
@@ -6,3 +6,10 @@ from app.domain.models import DetectionResult
 class PlateDetectorPort(Protocol):
     def detect_plate(self, img_bgr: np.ndarray) -> Optional[DetectionResult]:
         ...
+
+    def detect_plate_batch(self, imgs_bgr: List[np.ndarray]) -> List[Optional[DetectionResult]]:
+        ...
+
+    def detect_plates(self, img_bgr: np.ndarray, min_conf: Optional[float] = None) -> List[DetectionResult]:
+        """Todas las placas con confianza >= min_conf (default settings.conf), de mayor a menor confianza."""
+        ...
@@ -1,6 +1,15 @@
-from typing import Protocol
+from typing import List, Protocol, Tuple
 import numpy as np
+from app.domain.models import OcrWord
 
 class OcrPort(Protocol):
     def extract_text(self, img: np.ndarray) -> str:
         ...
+
+    def extract_text_with_confidence(self, img: np.ndarray) -> Tuple[str, float]:
+        """Texto reconocido y confianza media de Tesseract (0-100, -1 si no hay palabras)."""
+        ...
+
+    def extract_words(self, img: np.ndarray) -> List[OcrWord]:
+        """Palabras reconocidas con su caja (coordenadas de `img`) y confianza."""
+        ...
@@ -0,0 +1,13 @@
+from typing import Optional, Protocol
+
+
+class ResultCachePort(Protocol):
+    def get(self, key: str) -> Optional[dict]:
+        """Resultado guardado para `key`, o None si no existe o venció su TTL."""
+        ...
+
+    def put(self, key: str, value: dict):
+        ...
+
+    def stats(self) -> dict:
+        ...
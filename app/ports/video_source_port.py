@@ -0,0 +1,18 @@
+from typing import Optional, Protocol, Tuple
+import numpy as np
+
+
+class VideoSourcePort(Protocol):
+    fps: float
+    frame_count: int
+
+    def skip(self, n: int) -> int:
+        """Avanza `n` frames sin decodificarlos a BGR; devuelve cuántos avanzó."""
+        ...
+
+    def read(self) -> Optional[Tuple[int, float, np.ndarray]]:
+        """Siguiente frame como (índice, timestamp_ms, bgr) o None al final del video."""
+        ...
+
+    def close(self) -> None:
+        ...
@@ -0,0 +1,67 @@
+"""
+Escaneo offline de un video local: mismo pipeline que POST /video/scan.
+
+    python -m app.video_cli grabacion.mp4
+    python -m app.video_cli grabacion.mp4 --json > eventos.json
+
+Los parámetros de muestreo y deduplicación salen de las variables VIDEO_*
+(ver app/core/config.py).
+"""
+import argparse
+import asyncio
+import json
+import sys
+from typing import List, Optional
+
+from app.adapters.video.opencv_video_source import OpenCvVideoSource
+from app.api.routers import get_detector, get_plate_cascade, get_plate_ocr, get_plate_ocr_block
+from app.core.config import settings
+from app.core.executors import InferenceExecutors
+from app.domain.video_scanner import VideoPlateScanner
+
+
+def _fmt_ms(ms: float) -> str:
+    seconds, millis = divmod(int(ms), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{minutes:02d}:{seconds:02d}.{millis:03d}"
+
+
+async def scan(path: str) -> dict:
+    executors = InferenceExecutors.from_settings(settings)
+    cascade = get_plate_cascade(get_plate_ocr(), get_plate_ocr_block())
+    source = OpenCvVideoSource(path)
+    try:
+        return await VideoPlateScanner(get_detector(), cascade, executors, settings).scan(source)
+    finally:
+        source.close()
+        executors.shutdown(wait=False)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="local video file")
+    parser.add_argument("--json", action="store_true", help="print the full result as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        result = asyncio.run(scan(args.path))
+    except ValueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 0
+
+    for ev in result["events"]:
+        best = ev["best"] or {}
+        print(f"{_fmt_ms(ev['firstSeenMs'])} - {_fmt_ms(ev['lastSeenMs'])}  {ev['plateText'] or '(unread)':<10}"
+              f"  det={ev['detConf']:.2f} ocr={best.get('ocrConf', -1):.0f} frames={ev['frames']} ocrCalls={ev['ocrCalls']}")
+    print(f"\n{len(result['events'])} events, {result['framesSampled']}/{result['framesRead']} frames sampled, "
+          f"{result['detectorCalls']} detector calls, {result['ocrCalls']} OCR calls, {result['elapsedMs'] / 1000:.1f} s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
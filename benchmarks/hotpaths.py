@@ -0,0 +1,188 @@
+"""
+Micro-benchmarks offline de los hot paths de imagen y texto.
+
+    python -m benchmarks.hotpaths                       # corre y guarda en benchmarks/results/
+    python -m benchmarks.hotpaths --baseline benchmarks/results/baseline.json
+    python -m benchmarks.hotpaths --only normalize_hn_plate --repeat 10
+
+Por función reporta tiempo por item (mediana, p95), throughput (items/s),
+asignaciones (bytes pico y bloques, vía tracemalloc) y, con --baseline, la
+variación contra una corrida previa. tracemalloc ve los arrays numpy pero no
+los buffers internos de OpenCV.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence
+
+from app.adapters.extraction.regex_id_adapter import RegexIdAdapter
+from app.domain import image_utils, services
+from app.domain.document_normalize import DocumentNormalizer
+from app.domain.plate_preprocess import PLATE_STEPS, PlatePreprocessor
+from benchmarks import synthetic
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+class Case:
+    def __init__(self, name: str, fn: Callable, inputs: Sequence):
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs)
+
+
+def build_cases(n_images: int, n_texts: int, seed: int) -> List[Case]:
+    plates = synthetic.plate_images(n_images, seed=seed)
+    plates_skewed = synthetic.plate_images(n_images, seed=seed + 1, max_skew=9.0)
+    extractor = RegexIdAdapter()
+    fixed_5x = PlatePreprocessor.from_spec(PLATE_STEPS, overrides={"resize": {"target_char_height": 0}})
+    documents = synthetic.document_images(max(1, n_images // 10), seed=seed)
+    # 2x fijo sin tope ni cambio de filtro: equivalente al preprocess_document_for_ocr original
+    fixed_2x = DocumentNormalizer(target_text_height=0, max_megapixels=0, bilateral_max_megapixels=float("inf"))
+
+    def guarded(fn):
+        def run(img):
+            try:
+                return fn(img)
+            except ValueError:
+                return None
+        return run
+
+    return [
+        Case("deskew_plate", image_utils.deskew_plate, plates_skewed),
+        Case("preprocess_for_ocr", guarded(image_utils.preprocess_for_ocr), plates),
+        Case("preprocess_for_ocr[fixed5x]", guarded(fixed_5x.run), plates),
+        Case("preprocess_document_for_ocr", image_utils.preprocess_document_for_ocr, documents),
+        Case("preprocess_document_for_ocr[fixed2x]", fixed_2x, documents),
+        Case("normalize_hn_plate", services.normalize_hn_plate, synthetic.raw_plate_texts(n_texts, seed=seed)),
+        Case("parse_dispatch_info", services.parse_dispatch_info, synthetic.dispatch_texts(n_texts // 10 or 1, seed=seed)),
+        Case("RegexIdAdapter.extract", extractor.extract, synthetic.dni_texts(n_texts // 10 or 1, seed=seed)),
+    ]
+
+
+def _run_once(case: Case) -> float:
+    fn = case.fn
+    started = time.perf_counter()
+    for item in case.inputs:
+        fn(item)
+    return time.perf_counter() - started
+
+
+def _allocations(case: Case) -> Dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+        tracemalloc.reset_peak()
+        for item in case.inputs:
+            case.fn(item)
+        _, peak = tracemalloc.get_traced_memory()
+        after_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        tracemalloc.stop()
+    n = len(case.inputs)
+    return {"peakBytes": peak, "peakBytesPerItem": peak / n, "retainedBlocks": after_blocks - before_blocks}
+
+
+def bench(case: Case, repeat: int, warmup: int = 1) -> dict:
+    for _ in range(warmup):
+        _run_once(case)
+    n = len(case.inputs)
+    per_item = sorted(_run_once(case) / n for _ in range(repeat))
+    median = statistics.median(per_item)
+    p95 = per_item[min(len(per_item) - 1, int(round(0.95 * (len(per_item) - 1))))]
+    return {
+        "items": n,
+        "repeat": repeat,
+        "medianUs": median * 1e6,
+        "p95Us": p95 * 1e6,
+        "minUs": per_item[0] * 1e6,
+        "throughputPerSec": (1.0 / median) if median else float("inf"),
+        **_allocations(case),
+    }
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict]) -> Dict[str, dict]:
+    deltas = {}
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        deltas[name] = {
+            "medianChangePct": (cur["medianUs"] / base["medianUs"] - 1.0) * 100.0 if base["medianUs"] else None,
+            "peakBytesChangePct": (cur["peakBytes"] / base["peakBytes"] - 1.0) * 100.0 if base["peakBytes"] else None,
+        }
+    return deltas
+
+
+def _print_table(results: Dict[str, dict], deltas: Optional[Dict[str, dict]]):
+    header = f"{'function':<26}{'items':>7}{'median µs':>12}{'p95 µs':>12}{'items/s':>12}{'peak KiB':>11}"
+    if deltas is not None:
+        header += f"{'Δ time':>10}{'Δ mem':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        line = (f"{name:<26}{r['items']:>7}{r['medianUs']:>12.1f}{r['p95Us']:>12.1f}"
+                f"{r['throughputPerSec']:>12.0f}{r['peakBytes'] / 1024:>11.1f}")
+        if deltas is not None:
+            d = deltas.get(name)
+            if d and d["medianChangePct"] is not None:
+                mem = f"{d['peakBytesChangePct']:+8.1f}%" if d["peakBytesChangePct"] is not None else f"{'n/a':>9}"
+                line += f"{d['medianChangePct']:>+9.1f}%{mem}"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=40, help="synthetic plate images per image case (documents: 1 per 10)")
+    parser.add_argument("--texts", type=int, default=2000, help="synthetic raw strings for text cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", action="append", help="run only these cases (repeatable)")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--output", help="where to save results (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(args.images, args.texts, args.seed)
+    if args.only:
+        cases = [c for c in cases if c.name in args.only]
+
+    results = {}
+    for case in cases:
+        results[case.name] = bench(case, args.repeat)
+
+    deltas = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            deltas = compare(results, json.load(fh)["results"])
+    _print_table(results, deltas)
+
+    if not args.no_save:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = args.output or os.path.join(RESULTS_DIR, f"{stamp}.json")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        payload = {
+            "createdAt": stamp,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "params": {"images": args.images, "texts": args.texts, "repeat": args.repeat, "seed": args.seed},
+            "results": results,
+            "baseline": args.baseline,
+            "deltas": deltas,
+        }
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, indent=2)
+        print(f"\nsaved {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Harness de carga end-to-end en proceso para la capa de routers.
+
+Levanta la app FastAPI dentro del mismo proceso (httpx + ASGITransport, con
+startup/shutdown), reemplaza `get_detector`, `get_plate_ocr`,
+`get_plate_ocr_block` y `get_doc_ocr` por stubs deterministas con latencia
+configurable (o usa los adaptadores reales con --real) y envía tráfico a
+/ocr, /detect y /dni/extract con distintos niveles de concurrencia.
+
+    python -m benchmarks.load_harness --concurrency 1 8 32 --duration 5
+    python -m benchmarks.load_harness --endpoints /ocr --detect-ms 30 --ocr-ms 60
+    python -m benchmarks.load_harness --real --concurrency 4
+
+Reporta req/s, latencias p50/p95/p99 y el lag del event loop (cuánto se
+retrasa un timer de 10 ms). Un lag alto indica llamadas bloqueantes dentro de
+handlers async.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import httpx
+import numpy as np
+
+from app.core.config import settings
+from app.domain.models import BoundingBox, DetectionResult
+from benchmarks import synthetic
+
+DNI_TEXT = synthetic.dni_texts(1, seed=7)[0]
+
+
+class StubDetector:
+    """Devuelve siempre la misma caja tras `delay_ms` de trabajo simulado (bloqueante)."""
+    def __init__(self, delay_ms: float, box: Tuple[int, int, int, int]):
+        self.delay = delay_ms / 1000.0
+        self.box = box
+
+    def _one(self) -> DetectionResult:
+        x, y, w, h = self.box
+        return DetectionResult(box=BoundingBox(x=x, y=y, w=w, h=h), confidence=0.9)
+
+    def detect_plate(self, img_bgr):
+        time.sleep(self.delay)
+        return self._one()
+
+    def detect_plate_batch(self, imgs_bgr):
+        time.sleep(self.delay)
+        return [self._one() for _ in imgs_bgr]
+
+    def detect_plates(self, img_bgr, min_conf=None):
+        time.sleep(self.delay)
+        return [self._one()]
+
+
+class StubOcr:
+    def __init__(self, delay_ms: float, text: str, confidence: float = 90.0):
+        self.delay = delay_ms / 1000.0
+        self.text = text
+        self.confidence = confidence
+
+    def extract_text(self, img) -> str:
+        time.sleep(self.delay)
+        return self.text
+
+    def extract_text_with_confidence(self, img):
+        time.sleep(self.delay)
+        return self.text, self.confidence
+
+
+def make_frame(seed: int = 0) -> Tuple[bytes, Tuple[int, int, int, int]]:
+    """JPEG of a 1280x720 frame with a synthetic plate, and the plate box."""
+    rng = random.Random(seed)
+    plate = synthetic.plate_image(synthetic.random_plate(rng), rng, skew_deg=2.0, noise_sigma=5.0, height=120)
+    frame = np.full((720, 1280, 3), 90, dtype=np.uint8)
+    y, x = 400, 520
+    h, w = plate.shape[:2]
+    frame[y:y + h, x:x + w] = plate
+    ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    if not ok:
+        raise RuntimeError("could not encode synthetic frame")
+    return buf.tobytes(), (x, y, w, h)
+
+
+def install_stubs(app, detect_ms: float, ocr_ms: float, doc_ocr_ms: float, box):
+    from app.api import routers
+
+    detector = StubDetector(detect_ms, box)
+    plate_ocr = StubOcr(ocr_ms, "ABC 1234")
+    doc_ocr = StubOcr(doc_ocr_ms, DNI_TEXT)
+    app.dependency_overrides[routers.get_detector] = lambda: detector
+    app.dependency_overrides[routers.get_plate_ocr] = lambda: plate_ocr
+    app.dependency_overrides[routers.get_plate_ocr_block] = lambda: plate_ocr
+    app.dependency_overrides[routers.get_doc_ocr] = lambda: doc_ocr
+
+
+async def _loop_lag_monitor(samples: List[float], stop: asyncio.Event, interval: float = 0.01):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+async def run_level(client: httpx.AsyncClient, endpoint: str, payload: bytes, concurrency: int,
+                    duration: float) -> dict:
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    lag: List[float] = []
+    stop = asyncio.Event()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                resp = await client.post(endpoint, files={"file": ("frame.jpg", payload, "image/jpeg")})
+                status = resp.status_code
+            except Exception:
+                status = -1
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    monitor = asyncio.create_task(_loop_lag_monitor(lag, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50Ms": _pct(latencies, 0.50) * 1000,
+        "p95Ms": _pct(latencies, 0.95) * 1000,
+        "p99Ms": _pct(latencies, 0.99) * 1000,
+        "meanMs": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "loopLagP50Ms": _pct(lag, 0.50) * 1000,
+        "loopLagP99Ms": _pct(lag, 0.99) * 1000,
+        "loopLagMaxMs": max(lag) * 1000 if lag else 0.0,
+    }
+
+
+def _print_row(r: dict):
+    statuses = ",".join(f"{k}:{v}" for k, v in r["statuses"].items())
+    print(f"{r['endpoint']:<13}{r['concurrency']:>5}{r['requests']:>8}{r['rps']:>9.1f}"
+          f"{r['p50Ms']:>9.1f}{r['p95Ms']:>9.1f}{r['p99Ms']:>9.1f}"
+          f"{r['loopLagP50Ms']:>9.2f}{r['loopLagP99Ms']:>9.2f}{r['loopLagMaxMs']:>9.2f}  {statuses}")
+
+
+async def main_async(args) -> List[dict]:
+    # Sin warmup ni escritura de artefactos: se mide solo la capa de routers
+    if not args.real:
+        settings.warmup = False
+    settings.debug_capture = "off"
+
+    from app.main import app
+
+    payload, box = make_frame(args.seed)
+    if not args.real:
+        install_stubs(app, args.detect_ms, args.ocr_ms, args.doc_ocr_ms, box)
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://harness", timeout=None) as client:
+            print(f"{'endpoint':<13}{'conc':>5}{'reqs':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+                  f"{'lag p50':>9}{'lag p99':>9}{'lag max':>9}  statuses")
+            for endpoint in args.endpoints:
+                for concurrency in args.concurrency:
+                    row = await run_level(client, endpoint, payload, concurrency, args.duration)
+                    _print_row(row)
+                    results.append(row)
+    app.dependency_overrides.clear()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", nargs="+", default=["/ocr", "/detect", "/dni/extract"])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per endpoint/concurrency level")
+    parser.add_argument("--detect-ms", type=float, default=20.0)
+    parser.add_argument("--ocr-ms", type=float, default=40.0)
+    parser.add_argument("--doc-ocr-ms", type=float, default=150.0)
+    parser.add_argument("--real", action="store_true", help="use the real YOLO/Tesseract adapters")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="save results as JSON")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(main_async(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump({"params": vars(args), "results": results}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Generadores sintéticos deterministas para los benchmarks: imágenes de placas
+estilo Honduras y textos OCR (despacho, DNI) con inclinación, ruido y
+confusiones típicas de Tesseract controladas.
+"""
+import random
+from typing import List, Optional
+import cv2
+import numpy as np
+
+LETTERS = "ABCDEFGHJKLMNPRSTUVWXYZ"
+DIGITS = "0123456789"
+
+# Confusiones OCR típicas (inversas de LETTER_FIX / DIGIT_FIX en services.py)
+LETTER_CONFUSIONS = {"O": "0", "I": "1", "Z": "2", "S": "5", "G": "6", "B": "8", "T": "I"}
+DIGIT_CONFUSIONS = {"0": "O", "1": "I", "2": "Z", "5": "S", "6": "G", "8": "B"}
+
+FIRST_NAMES = ["JUAN CARLOS", "MARIA JOSE", "LUIS ALBERTO", "ANA LUCIA", "JOSE MANUEL", "KARLA PATRICIA"]
+LAST_NAMES = ["LOPEZ MEJIA", "HERNANDEZ CRUZ", "MARTINEZ REYES", "RODRIGUEZ FLORES", "CASTILLO ZELAYA"]
+BRANDS = ["FREIGHTLINER", "INTERNATIONAL", "KENWORTH", "VOLVO", "MACK"]
+COLORS = ["BLANCO", "ROJO", "AZUL", "GRIS", "NEGRO"]
+
+
+def random_plate(rng: random.Random) -> str:
+    return "".join(rng.choice(LETTERS) for _ in range(3)) + "".join(rng.choice(DIGITS) for _ in range(4))
+
+
+def confuse(text: str, rng: random.Random, rate: float) -> str:
+    """Replaces characters with their usual OCR confusion with probability `rate`."""
+    out = []
+    for ch in text:
+        table = LETTER_CONFUSIONS if ch.isalpha() else DIGIT_CONFUSIONS
+        out.append(table[ch] if ch in table and rng.random() < rate else ch)
+    return "".join(out)
+
+
+def plate_image(
+    text: str,
+    rng: random.Random,
+    skew_deg: float = 0.0,
+    noise_sigma: float = 0.0,
+    height: int = 120,
+) -> np.ndarray:
+    """
+    BGR crop of a plate: white background, dark border, "HONDURAS" header and
+    the plate text in the middle band, rotated by `skew_deg` and with gaussian noise.
+    """
+    width = int(height * 2.1)
+    img = np.full((height, width, 3), 235, dtype=np.uint8)
+    cv2.rectangle(img, (2, 2), (width - 3, height - 3), (40, 40, 40), 3)
+    cv2.putText(img, "HONDURAS", (int(width * 0.3), int(height * 0.22)),
+                cv2.FONT_HERSHEY_SIMPLEX, height / 200.0, (120, 60, 20), 2, cv2.LINE_AA)
+    label = f"{text[:3]} {text[3:]}"
+    scale = height / 55.0
+    (tw, th), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_DUPLEX, scale, 3)
+    org = ((width - tw) // 2, int(height * 0.52 + th / 2))
+    cv2.putText(img, label, org, cv2.FONT_HERSHEY_DUPLEX, scale, (15, 15, 15), 3, cv2.LINE_AA)
+    cv2.putText(img, "CENTROAMERICA", (int(width * 0.28), int(height * 0.92)),
+                cv2.FONT_HERSHEY_SIMPLEX, height / 260.0, (90, 90, 90), 1, cv2.LINE_AA)
+
+    if skew_deg:
+        m = cv2.getRotationMatrix2D((width / 2, height / 2), skew_deg, 1.0)
+        img = cv2.warpAffine(img, m, (width, height), borderMode=cv2.BORDER_REPLICATE)
+    if noise_sigma > 0:
+        noise = np.random.default_rng(rng.randrange(1 << 30)).normal(0, noise_sigma, img.shape)
+        img = np.clip(img.astype(np.float32) + noise, 0, 255).astype(np.uint8)
+    return img
+
+
+def plate_images(n: int, seed: int = 0, max_skew: float = 6.0, noise_sigma: float = 8.0,
+                 heights: Optional[List[int]] = None) -> List[np.ndarray]:
+    rng = random.Random(seed)
+    heights = heights or [60, 90, 120, 180]
+    return [
+        plate_image(random_plate(rng), rng, skew_deg=rng.uniform(-max_skew, max_skew),
+                    noise_sigma=noise_sigma, height=rng.choice(heights))
+        for _ in range(n)
+    ]
+
+
+def document_image(rng: random.Random, width: int = 1600, noise_sigma: float = 6.0) -> np.ndarray:
+    """BGR photo of a DNI-like card (3:2 aspect) with labels, name lines and the identity number."""
+    height = int(width * 2 / 3)
+    img = np.full((height, width, 3), 225, dtype=np.uint8)
+    scale = width / 1000.0
+    identity = f"{rng.randint(101, 1819):04d} {rng.randint(1950, 2006)} {rng.randint(0, 99999):05d}"
+    lines = [
+        ("REPUBLICA DE HONDURAS", 1.1),
+        ("Nombre / Forename", 0.6),
+        (rng.choice(FIRST_NAMES), 0.9),
+        ("Apellido / Surname", 0.6),
+        (rng.choice(LAST_NAMES), 0.9),
+        ("Nacionalidad / Nationality HND", 0.6),
+        (identity, 1.0),
+    ]
+    y = int(height * 0.12)
+    for text, size in lines:
+        y += int(height * 0.11)
+        cv2.putText(img, text, (int(width * 0.35), y), cv2.FONT_HERSHEY_SIMPLEX, size * scale,
+                    (30, 30, 30), max(1, int(2 * scale)), cv2.LINE_AA)
+    cv2.rectangle(img, (int(width * 0.05), int(height * 0.2)), (int(width * 0.3), int(height * 0.8)), (140, 140, 140), -1)
+    if noise_sigma > 0:
+        noise = np.random.default_rng(rng.randrange(1 << 30)).normal(0, noise_sigma, img.shape)
+        img = np.clip(img.astype(np.float32) + noise, 0, 255).astype(np.uint8)
+    return img
+
+
+def document_images(n: int, seed: int = 0, widths: Optional[List[int]] = None) -> List[np.ndarray]:
+    """Scans and phone photos: from 1000 px wide up to 12 MP."""
+    rng = random.Random(seed)
+    widths = widths or [1000, 1600, 2400, 4200]
+    return [document_image(rng, width=rng.choice(widths)) for _ in range(n)]
+
+
+def raw_plate_texts(n: int, seed: int = 0, confusion_rate: float = 0.15) -> List[str]:
+    """Raw OCR-like plate strings: confusions, separators and surrounding garbage."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        plate = confuse(random_plate(rng), rng, confusion_rate)
+        sep = rng.choice(["", " ", "-", "  "])
+        text = plate[:3] + sep + plate[3:]
+        if rng.random() < 0.3:
+            text = rng.choice(["|", "'", "HN ", "~"]) + text
+        if rng.random() < 0.3:
+            text = text + rng.choice([" .", "|", " HONDURAS", "\n"])
+        if rng.random() < 0.1:
+            text = text[:1] + text[2:]  # letra perdida
+        out.append(text)
+    return out
+
+
+def dispatch_texts(n: int, seed: int = 0, confusion_rate: float = 0.05) -> List[str]:
+    """OCR'd driver dispatch sheets with the labels parse_dispatch_info looks for."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        plate = random_plate(rng)
+        lines = [
+            "HOJA PARA DESPACHO DE UNIDADES",
+            f"Hora de despacho: {rng.randint(5, 22):02d}:{rng.randint(0, 59):02d}",
+            f"Motorista: {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            f"Licencia: {rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}-{rng.randint(10000, 99999)}",
+            f"Teléfono: {rng.randint(3000, 9999)}-{rng.randint(1000, 9999)}",
+            f"Placa: {confuse(plate, rng, confusion_rate)}",
+            f"Marca: {rng.choice(BRANDS)}",
+            f"Color: {rng.choice(COLORS)}",
+            f"Año: {rng.randint(1995, 2024)}",
+            f"Motor: {rng.randint(10**7, 10**8 - 1)}",
+            f"Chasis / VIN: 1FU{''.join(rng.choice(LETTERS + DIGITS) for _ in range(14))}",
+            f"Código: {rng.randint(100, 999)}",
+            f"Transporte: TRANSPORTES {rng.choice(LAST_NAMES).split()[0]} S.A.",
+            f"RTN: {rng.randint(10**13, 10**14 - 1)}",
+        ]
+        body = lines[2:]
+        rng.shuffle(body)
+        out.append("\n".join(lines[:2] + body))
+    return out
+
+
+def dni_texts(n: int, seed: int = 0, confusion_rate: float = 0.1) -> List[str]:
+    """OCR'd Honduras DNI / licence text with noisy 13-digit identity numbers."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        identity = f"{rng.randint(101, 1819):04d}{rng.randint(1950, 2006)}{rng.randint(0, 99999):05d}"
+        noisy = confuse(identity, rng, confusion_rate)
+        sep = rng.choice(["-", " ", "", " - "])
+        lines = [
+            "REPUBLICA DE HONDURAS",
+            "REGISTRO NACIONAL DE LAS PERSONAS",
+            "DOCUMENTO NACIONAL DE IDENTIFICACION",
+            "Nombre / Forename",
+            rng.choice(FIRST_NAMES),
+            "Apellido / Surname",
+            rng.choice(LAST_NAMES),
+            f"Fecha de Nacimiento / Date of Birth {rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{identity[4:8]}",
+            "Nacionalidad / Nationality HND",
+            f"{noisy[:4]}{sep}{noisy[4:8]}{sep}{noisy[8:]}",
+        ]
+        if rng.random() < 0.3:
+            # Sin etiquetas: fuerza el fallback por puntuación de líneas
+            lines = [ln for ln in lines if "/" not in ln or "Nacimiento" in ln]
+        out.append("\n".join(lines))
+    return out
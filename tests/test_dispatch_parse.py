@@ -0,0 +1,89 @@
+import pytest
+from app.domain.services import DISPATCH_FIELDS, parse_dispatch_info, parse_dispatch_infos
+
+SHEET = "\n".join([
+    "HOJA PARA DESPACHO 14:35",
+    "Motorista: JUAN PEREZ Licencia: 0801-1990-12345",
+    "Placa: PDA 1234 Color: ROJO Marca: VOLVO",
+    "Año: 2015 Motor: D13A123",
+    "Teléfono: 9988-7766",
+])
+
+# (texto OCR, campos esperados); los que no aparecen deben quedar vacíos
+CASES = [
+    # Varias etiquetas en una línea: cada valor llega hasta el final de la línea
+    (SHEET, {
+        "horaDespacho": "14:35",
+        "motorista": "JUAN PEREZ Licencia: 0801-1990-12345",
+        "licencia": "0801-1990-12345",
+        "placa": "PDA 1234 Color: ROJO Marca: VOLVO",
+        "color": "ROJO Marca: VOLVO",
+        "marca": "VOLVO",
+        "anio": 2015,
+        "motor": "D13A123",
+        "telefono": "9988-7766",
+    }),
+    ("Motor: X1 Motorista: Ana Ruiz", {"motor": "X1 Motorista: Ana Ruiz", "motorista": "Ana Ruiz"}),
+    ("Codigo: TX-55 Transporte: Fletes SA RTN: 0801-1990-123456", {
+        "codigo": "TX-55 Transporte: Fletes SA RTN: 0801-1990-123456",
+        "transporte": "Fletes SA RTN: 0801-1990-123456",
+        "rtn": "08011990123456",
+    }),
+    # Primera línea donde aparece la etiqueta
+    ("Placa: AAA1111\nPlaca: BBB2222", {"placa": "AAA1111"}),
+    ("Placa: PDA, 1234", {"placa": "PDA 1234"}),
+    # chasis/vin
+    ("Chasis/VIN: 1HGCM82633A004352", {"vin": "1HGCM82633A004352"}),
+    ("Chasis / Vin - 9BW", {"vin": "9BW"}),
+    ("CHASIS: ABC123XYZ", {"vin": "ABC123XYZ"}),
+    ("VIN: 3N1AB7AP5KY", {"vin": "3N1AB7AP5KY"}),
+    # Cabecera "para despacho": se descarta y se usa la primera línea que empieza con "motorista"
+    ("Firma del motorista para despacho\nMotorista Carlos Lopez,", {"motorista": "Carlos Lopez"}),
+    # Sin otra línea de motorista el respaldo es la propia cabecera (comportamiento heredado)
+    ("Motorista: para despacho", {"motorista": "para despacho"}),
+    # Teléfono: 8 dígitos, 9 (dígito de país delante) y el resto sin tocar
+    ("Telefono: 99887766", {"telefono": "9988-7766"}),
+    ("Teléfono - 599887766", {"telefono": "9988-7766"}),
+    ("Telefono: 504 9988-7766", {"telefono": "504 9988-7766"}),
+    ("Licensia: 0801 1990 12345 x", {"licencia": "0801199012345"}),
+    ("RIN 08011990123456", {"rtn": "08011990123456"}),
+    ("Ano: 20I5", {}),
+    ("", {}),
+]
+
+# Una muestra por campo: un campo nuevo sin muestra (o que el prefiltro no deje pasar) falla aquí
+FIELD_SAMPLES = {
+    "anio": ("año: 2020", 2020),
+    "telefono": ("telefono: 99887766", "9988-7766"),
+    "motorista": ("motorista: Ana", "Ana"),
+    "licencia": ("licencia: 0801", "0801"),
+    "placa": ("placa: PDA1234", "PDA1234"),
+    "color": ("color: AZUL", "AZUL"),
+    "marca": ("marca: HINO", "HINO"),
+    "motor": ("motor: M1", "M1"),
+    "vin": ("vin: V1", "V1"),
+    "codigo": ("código: C1", "C1"),
+    "transporte": ("transporte: T1", "T1"),
+    "rtn": ("rtn: 0801", "0801"),
+}
+
+_EMPTY = {"horaDespacho": "", "motorista": "", "licencia": "", "placa": "", "telefono": "", "color": "",
+          "marca": "", "anio": "", "motor": "", "vin": "", "codigo": "", "transporte": "", "rtn": ""}
+
+
+@pytest.mark.parametrize("raw,expected", CASES)
+def test_parse_dispatch_info(raw, expected):
+    info = parse_dispatch_info(raw)
+    info.pop("lineas")
+    assert info == {**_EMPTY, **expected}
+
+
+@pytest.mark.parametrize("name", [name for name, _, _ in DISPATCH_FIELDS])
+def test_every_field_is_lexed(name):
+    line, value = FIELD_SAMPLES[name]
+    assert parse_dispatch_info(line)[name] == value
+
+
+def test_batch_matches_single():
+    raws = [raw for raw, _ in CASES]
+    assert parse_dispatch_infos(raws) == [parse_dispatch_info(raw) for raw in raws]
@@ -0,0 +1,61 @@
+import pytest
+from app.adapters.extraction.regex_id_adapter import DNI_PROFILE, LICENSE_PROFILE, RegexIdAdapter
+
+DNI = "\n".join([
+    "REPUBLICA DE HONDURAS",
+    "REGISTRO NACIONAL DE LAS PERSONAS",
+    "Nombre / Forename",
+    "JUAN CARLOS",
+    "Apellido / Surname",
+    "PEREZ LOPEZ",
+    "Numero de identificacion",
+    "0801-1990-12345",
+])
+
+LICENSE = "\n".join([
+    "REPUBLICA DE HONDURAS",
+    "LICENCIA DE CONDUCIR",
+    "PEDRO LUIS",
+    "GARCIA FLORES",
+    "0801-1985-00321",
+])
+
+# (texto OCR, identity, identityFormatted, full_name) con el perfil DNI
+DNI_CASES = [
+    (DNI, "0801199012345", "0801199012345", "JUAN CARLOS PEREZ LOPEZ"),
+    # Sin 4-4-5 en una línea: búsqueda sobre el texto unido (con DIGIT_FIX)
+    ("NOMBRE\nJUAN\nAPELLIDO\nPEREZ\n0801\n1990\n12345", "0801199012345", "0801199012345", "JUAN PEREZ"),
+    ("Nombre\nANA MARIA\nApellido\nMEJIA\n08O1 l99O 12345", "0801199012345", "0801199012345", "ANA MARIA MEJIA"),
+    # Solo dígitos: los primeros 13, o 11-12 tal cual
+    ("JUAN\nPEREZ\n08 01 19 90 1 23 45", "0801199012345", "0801199012345", "PEREZ JUAN"),
+    ("JUAN\nPEREZ\n0801 1990 123", "08011990123", "08011990123", "PEREZ JUAN"),
+    ("JUAN\nPEREZ\n12 34", "", "", "PEREZ JUAN"),
+    # Año 4xxx -> 1xxx en identity; identityFormatted conserva la lectura
+    ("Nombre\nLUIS ALBERTO\nApellido\nCASTRO\n0801 4990 12345", "0801199012345", "0801499012345", "LUIS ALBERTO CASTRO"),
+    # Sin etiquetas el DNI toma las líneas con más letras, incluso la cabecera
+    (LICENSE, "0801198500321", "0801198500321", "REPUBLICA DE HONDURAS LICENCIA DE CONDUCIR"),
+]
+
+
+@pytest.mark.parametrize("text,identity,formatted,full_name", DNI_CASES)
+def test_dni_extract(text, identity, formatted, full_name):
+    out = RegexIdAdapter(DNI_PROFILE).extract(text)
+    assert (out["identity"], out["identityFormatted"], out["full_name"]) == (identity, formatted, full_name)
+
+
+@pytest.mark.parametrize("text,full_name", [
+    # La cabecera "REPUBLICA DE HONDURAS / LICENCIA DE CONDUCIR" ya no gana el fallback de nombre
+    (LICENSE, "GARCIA FLORES PEDRO LUIS"),
+    ("REPUBLICA DE HONDURAS\nLICENCIA DE CONDUCIR\nJOSE ANTONIO MARTINEZ\n0801 1985 00321\nCATEGORIA B VENCE 2030",
+     "JOSE ANTONIO MARTINEZ"),
+    # Con etiquetas manda la etiqueta, igual que en el DNI
+    (DNI, "JUAN CARLOS PEREZ LOPEZ"),
+])
+def test_license_skips_headers(text, full_name):
+    out = RegexIdAdapter(LICENSE_PROFILE).extract(text)
+    assert out["full_name"] == full_name
+    assert out["identity"] == RegexIdAdapter(DNI_PROFILE).extract(text)["identity"]
+
+
+def test_default_profile_is_dni():
+    assert RegexIdAdapter().extract(LICENSE) == RegexIdAdapter(DNI_PROFILE).extract(LICENSE)
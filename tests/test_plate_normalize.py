@@ -0,0 +1,69 @@
+import pytest
+from app.domain.services import normalize_hn_plate, read_hn_plate, read_hn_plates
+
+# Mismo resultado que el normalizador anterior (primera ventana que encajaba)
+UNCHANGED = [
+    ("ABC1234", "ABC 1234"),
+    ("abc 1234", "ABC 1234"),
+    ("HND ABC-1234", "ABC 1234"),
+    ("HONDURAS PCX 5521 CENTROAMERICA", "PCX 5521"),
+    ("ABC1234DEF5678", "ABC 1234"),
+    ("12ABC12345", "ABC 1234"),
+    ("ABCD12345", "BCD 1234"),
+    ("A8C 1234", "ABC 1234"),
+    ("ABC I234", "ABC 1234"),
+    ("PDA 12O4", "PDA 1204"),
+    ("5GB 8OO1", "SGB 8001"),
+    ("HAB12S4", "HAB 1254"),
+    ("1BC1234", "TBC 1234"),
+    ("1AB12345", "TAB 1234"),
+    ("IBC1234", "IBC 1234"),
+    ("T13368", "TCI 3368"),
+    ("TC1 3368", "TCI 3368"),
+    ("AB1234", "ABI 1234"),
+    ("AB 1 2345", "ABI 2345"),
+    ("", ""),
+    ("   ", ""),
+    ("AAA", ""),
+    ("ABC123", ""),
+    ("1234567", ""),
+]
+
+# Diferencias intencionales: (raw, antes, ahora)
+CHANGED = [
+    # La primera posición de una lectura de 6 caracteres debe poder ser letra
+    ("713368", "7CI 3368", ""),
+    ("916863", "9CI 6863", ""),
+    ("9168  63", "9CI 6863", ""),
+    # Gana la ventana con menos correcciones, no la primera que encaja
+    ("A8C12S4 XYZ12S4", "ABC 1254", "XYZ 1254"),
+    ("5BC1Z34 PCX12O4", "SBC 1234", "PCX 1204"),
+    ("88812345 ABC12S4", "BBB 1234", "ABC 1254"),
+    ("S8C 12S4 HAB 1Z34", "SBC 1254", "HAB 1234"),
+]
+
+
+@pytest.mark.parametrize("raw,expected", UNCHANGED)
+def test_normalize_unchanged(raw, expected):
+    assert normalize_hn_plate(raw) == expected
+
+
+@pytest.mark.parametrize("raw,before,expected", CHANGED)
+def test_normalize_intentional_changes(raw, before, expected):
+    assert normalize_hn_plate(raw) == expected != before
+
+
+@pytest.mark.parametrize("raw,score,corrections,start", [
+    ("ABC1234", 1.0, 0, 0),
+    ("XX ABC 1234", 1.0, 0, 2),
+    ("A8C12S4 XYZ12S4", 0.857, 1, 7),
+    ("T13368", 0.714, 2, -1),
+])
+def test_read_scores(raw, score, corrections, start):
+    reading = read_hn_plate(raw)
+    assert (reading.score, reading.corrections, reading.start) == (score, corrections, start)
+
+
+def test_read_batch_matches_single():
+    raws = [raw for raw, _ in UNCHANGED] + [raw for raw, _, _ in CHANGED] + ["ABC1234"]
+    assert read_hn_plates(raws) == [read_hn_plate(raw) for raw in raws]